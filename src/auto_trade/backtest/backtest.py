@@ -4,7 +4,7 @@
 from datetime import datetime, timedelta
 
 from auto_trade.core.client import create_api_client
-from auto_trade.core.config import Config
+from auto_trade.core.config import get_config
 from auto_trade.models.backtest import BacktestConfig
 from auto_trade.services.backtest_service import BacktestService
 from auto_trade.services.market_service import MarketService
@@ -24,7 +24,7 @@ def main():
 
     try:
         # 載入配置
-        config = Config()
+        config = get_config()
 
         # 建立API客戶端
         api_client = create_api_client(
@@ -38,7 +38,9 @@ def main():
         # 建立服務
         market_service = MarketService(api_client)
         strategy_service = StrategyService()
-        backtest_service = BacktestService(market_service, strategy_service)
+        backtest_service = BacktestService(
+            market_service, strategy_service, verbose=True
+        )
 
         # 設定回測參數
         end_date = datetime.now()
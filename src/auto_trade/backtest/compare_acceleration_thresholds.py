@@ -6,10 +6,14 @@
 2. 強死叉（加速度 3.0）- 只有加速度 >= 3.0 的死叉才觸發快速停損
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
 
+import pandas as pd
+
 from auto_trade.core.client import create_api_client
-from auto_trade.core.config import Config
+from auto_trade.core.config import get_config
 from auto_trade.models.backtest import BacktestConfig
 from auto_trade.services.backtest_service import BacktestService
 from auto_trade.services.market_service import MarketService
@@ -24,7 +28,7 @@ def main():
     print("=" * 80)
 
     # 加載配置
-    config = Config()
+    config = get_config()
 
     # 創建 API 客戶端（模擬模式）
     api_client = create_api_client(
@@ -78,157 +82,174 @@ def main():
     print("啟用 MACD 快速停損：是")
     print("加速度門檻：無過濾（所有死叉）\n")
 
-    result1 = backtest_service.run_backtest(config1)
-    backtest_service.save_results(
-        result1, filename="backtest_results_MXF_90days_no_filter.txt"
-    )
-
     # ===== 策略 2: 強死叉（加速度 3.0） =====
     print("\n" + "=" * 80)
     print("📊 策略 2: 快速停損 - 強死叉過濾（加速度 ≥ 3.0）")
     print("-" * 80)
 
-    config2 = BacktestConfig(
-        symbol="MXF",
-        sub_symbol="MXF202511",
-        start_date=start_date,
-        end_date=end_date,
-        initial_capital=1000000,
-        order_quantity=2,
-        timeframe="30m",
-        stop_loss_points=80,
-        start_trailing_stop_points=250,
-        trailing_stop_points=250,
-        take_profit_points=500,
-        trailing_stop_points_rate=0.0095,
-        take_profit_points_rate=0.02,
-        enable_macd_fast_stop=True,
-        min_acceleration_threshold=3.0,  # 強死叉過濾
-    )
+    # 其餘參數與策略 1 相同
+    config2 = replace(config1, min_acceleration_threshold=3.0)  # 強死叉過濾
 
     print("啟用 MACD 快速停損：是")
     print("加速度門檻：3.0（強死叉）\n")
 
-    result2 = backtest_service.run_backtest(config2)
-    backtest_service.save_results(
-        result2, filename="backtest_results_MXF_90days_strong_filter.txt"
+    # 兩組回測彼此獨立，並行執行（K 線與設定未變動時讀取上次的結果緩存）
+    result1, result2 = backtest_service.run_backtests(
+        [config1, config2], use_cache=True
     )
 
-    # ===== 生成比較報告 =====
-    print("\n" + "=" * 80)
-    print("📊 策略比較結果（90 天完整期間）")
-    print("=" * 80)
-
-    # 基本統計
-    print(f"\n{'指標':<20} {'無過濾':<20} {'強死叉(≥3.0)':<20} {'差異':<20}")
-    print("-" * 80)
+    # 結果在背景寫檔，與比較報告的生成同時進行
+    save_pool = ThreadPoolExecutor(max_workers=2)
+    save_futures = [
+        save_pool.submit(
+            backtest_service.save_results,
+            result1,
+            filename="backtest_results_MXF_90days_no_filter.txt",
+        ),
+        save_pool.submit(
+            backtest_service.save_results,
+            result2,
+            filename="backtest_results_MXF_90days_strong_filter.txt",
+        ),
+    ]
+
+    # 報告內容先累積在 lines，最後一次輸出
+    lines: list[str] = []
 
-    print(
-        f"{'總交易次數':<20} {result1.total_trades:<20} {result2.total_trades:<20} {result2.total_trades - result1.total_trades:+d}"
-    )
-    print(
-        f"{'獲利交易':<20} {result1.winning_trades:<20} {result2.winning_trades:<20} {result2.winning_trades - result1.winning_trades:+d}"
-    )
-    print(
-        f"{'虧損交易':<20} {result1.losing_trades:<20} {result2.losing_trades:<20} {result2.losing_trades - result1.losing_trades:+d}"
-    )
-    print(
-        f"{'勝率':<20} {result1.win_rate:<19.2f}% {result2.win_rate:<19.2f}% {result2.win_rate - result1.win_rate:+.2f}%"
-    )
+    # ===== 生成比較報告 =====
+    lines.append("\n" + "=" * 80)
+    lines.append("📊 策略比較結果（90 天完整期間）")
+    lines.append("=" * 80)
 
-    # 盈虧統計
-    print("\n" + "-" * 80)
     pnl_diff = result2.total_pnl_twd - result1.total_pnl_twd
     pnl_pct = (
         (pnl_diff / result1.total_pnl_twd * 100) if result1.total_pnl_twd != 0 else 0
     )
-    print(
-        f"{'總盈虧 (TWD)':<20} {result1.total_pnl_twd:<19,.0f} {result2.total_pnl_twd:<19,.0f} {pnl_diff:+19,.0f} ({pnl_pct:+.2f}%)"
-    )
-
     profit_diff = result2.gross_profit - result1.gross_profit
-    print(
-        f"{'總獲利 (TWD)':<20} {result1.gross_profit:<19,.0f} {result2.gross_profit:<19,.0f} {profit_diff:+19,.0f}"
-    )
-
     loss_diff = result2.gross_loss - result1.gross_loss
     loss_pct = (loss_diff / result1.gross_loss * 100) if result1.gross_loss != 0 else 0
-    print(
-        f"{'總虧損 (TWD)':<20} {result1.gross_loss:<19,.0f} {result2.gross_loss:<19,.0f} {loss_diff:+19,.0f} ({loss_pct:+.2f}%)"
-    )
-
-    # 風險指標
-    print("\n" + "-" * 80)
     dd_diff = result2.max_drawdown - result1.max_drawdown
     dd_pct = (dd_diff / result1.max_drawdown * 100) if result1.max_drawdown != 0 else 0
-    print(
-        f"{'最大回撤':<20} {result1.max_drawdown:<19.2f}% {result2.max_drawdown:<19.2f}% {dd_diff:+.2f}% ({dd_pct:+.2f}%)"
-    )
-
     pf_diff = result2.profit_factor - result1.profit_factor
     pf_pct = (
         (pf_diff / result1.profit_factor * 100) if result1.profit_factor != 0 else 0
     )
-    print(
-        f"{'盈虧比':<20} {result1.profit_factor:<20.2f} {result2.profit_factor:<20.2f} {pf_diff:+.2f} ({pf_pct:+.2f}%)"
-    )
 
-    print(
-        f"{'夏普比率':<20} {result1.sharpe_ratio:<20.2f} {result2.sharpe_ratio:<20.2f} {result2.sharpe_ratio - result1.sharpe_ratio:+.2f}"
-    )
+    # 比較表格（各欄先格式化成字串，再由 DataFrame 統一對齊）
+    blank_row = ("", "", "", "")
+    rows = [
+        # 基本統計
+        (
+            "總交易次數",
+            f"{result1.total_trades}",
+            f"{result2.total_trades}",
+            f"{result2.total_trades - result1.total_trades:+d}",
+        ),
+        (
+            "獲利交易",
+            f"{result1.winning_trades}",
+            f"{result2.winning_trades}",
+            f"{result2.winning_trades - result1.winning_trades:+d}",
+        ),
+        (
+            "虧損交易",
+            f"{result1.losing_trades}",
+            f"{result2.losing_trades}",
+            f"{result2.losing_trades - result1.losing_trades:+d}",
+        ),
+        (
+            "勝率",
+            f"{result1.win_rate:.2f}%",
+            f"{result2.win_rate:.2f}%",
+            f"{result2.win_rate - result1.win_rate:+.2f}%",
+        ),
+        blank_row,
+        # 盈虧統計
+        (
+            "總盈虧 (TWD)",
+            f"{result1.total_pnl_twd:,.0f}",
+            f"{result2.total_pnl_twd:,.0f}",
+            f"{pnl_diff:+,.0f} ({pnl_pct:+.2f}%)",
+        ),
+        (
+            "總獲利 (TWD)",
+            f"{result1.gross_profit:,.0f}",
+            f"{result2.gross_profit:,.0f}",
+            f"{profit_diff:+,.0f}",
+        ),
+        (
+            "總虧損 (TWD)",
+            f"{result1.gross_loss:,.0f}",
+            f"{result2.gross_loss:,.0f}",
+            f"{loss_diff:+,.0f} ({loss_pct:+.2f}%)",
+        ),
+        blank_row,
+        # 風險指標
+        (
+            "最大回撤",
+            f"{result1.max_drawdown:.2f}%",
+            f"{result2.max_drawdown:.2f}%",
+            f"{dd_diff:+.2f}% ({dd_pct:+.2f}%)",
+        ),
+        (
+            "盈虧比",
+            f"{result1.profit_factor:.2f}",
+            f"{result2.profit_factor:.2f}",
+            f"{pf_diff:+.2f} ({pf_pct:+.2f}%)",
+        ),
+        (
+            "夏普比率",
+            f"{result1.sharpe_ratio:.2f}",
+            f"{result2.sharpe_ratio:.2f}",
+            f"{result2.sharpe_ratio - result1.sharpe_ratio:+.2f}",
+        ),
+    ]
+    table = pd.DataFrame(rows, columns=["指標", "無過濾", "強死叉(≥3.0)", "差異"])
+    lines.append("")
+    lines.append(table.to_string(index=False))
 
     # 退出原因統計
-    print("\n" + "=" * 80)
-    print("⚡ 快速停損（FS）效果分析")
-    print("=" * 80)
+    lines.append("\n" + "=" * 80)
+    lines.append("⚡ 快速停損（FS）效果分析")
+    lines.append("=" * 80)
 
     # 策略 1
-    fs_count1 = sum(1 for trade in result1.trades if trade.exit_reason.value == "FS")
-    sl_count1 = sum(1 for trade in result1.trades if trade.exit_reason.value == "SL")
-    print("\n策略 1（無過濾）:")
-    print(f"   FS 次數: {fs_count1}")
+    exits1 = result1.summarize_exits()
+    fs_count1, fs_pnl1 = exits1.get("FS", (0, 0.0))
+    sl_count1, sl_pnl1 = exits1.get("SL", (0, 0.0))
+    lines.append("\n策略 1（無過濾）:")
+    lines.append(f"   FS 次數: {fs_count1}")
     if fs_count1 > 0:
-        fs_pnl1 = sum(
-            trade.pnl_twd for trade in result1.trades if trade.exit_reason.value == "FS"
-        )
-        print(f"   FS 總盈虧: {fs_pnl1:,.0f} TWD")
-        print(f"   FS 平均虧損: {fs_pnl1 / fs_count1:,.0f} TWD")
-    print(f"   SL 次數: {sl_count1}")
+        lines.append(f"   FS 總盈虧: {fs_pnl1:,.0f} TWD")
+        lines.append(f"   FS 平均虧損: {fs_pnl1 / fs_count1:,.0f} TWD")
+    lines.append(f"   SL 次數: {sl_count1}")
     if sl_count1 > 0:
-        sl_pnl1 = sum(
-            trade.pnl_twd for trade in result1.trades if trade.exit_reason.value == "SL"
-        )
-        print(f"   SL 總盈虧: {sl_pnl1:,.0f} TWD")
-        print(f"   SL 平均虧損: {sl_pnl1 / sl_count1:,.0f} TWD")
+        lines.append(f"   SL 總盈虧: {sl_pnl1:,.0f} TWD")
+        lines.append(f"   SL 平均虧損: {sl_pnl1 / sl_count1:,.0f} TWD")
 
     # 策略 2
-    fs_count2 = sum(1 for trade in result2.trades if trade.exit_reason.value == "FS")
-    sl_count2 = sum(1 for trade in result2.trades if trade.exit_reason.value == "SL")
-    print("\n策略 2（強死叉 ≥ 3.0）:")
-    print(f"   FS 次數: {fs_count2}")
+    exits2 = result2.summarize_exits()
+    fs_count2, fs_pnl2 = exits2.get("FS", (0, 0.0))
+    sl_count2, sl_pnl2 = exits2.get("SL", (0, 0.0))
+    lines.append("\n策略 2（強死叉 ≥ 3.0）:")
+    lines.append(f"   FS 次數: {fs_count2}")
     if fs_count2 > 0:
-        fs_pnl2 = sum(
-            trade.pnl_twd for trade in result2.trades if trade.exit_reason.value == "FS"
-        )
-        print(f"   FS 總盈虧: {fs_pnl2:,.0f} TWD")
-        print(f"   FS 平均虧損: {fs_pnl2 / fs_count2:,.0f} TWD")
-    print(f"   SL 次數: {sl_count2}")
+        lines.append(f"   FS 總盈虧: {fs_pnl2:,.0f} TWD")
+        lines.append(f"   FS 平均虧損: {fs_pnl2 / fs_count2:,.0f} TWD")
+    lines.append(f"   SL 次數: {sl_count2}")
     if sl_count2 > 0:
-        sl_pnl2 = sum(
-            trade.pnl_twd for trade in result2.trades if trade.exit_reason.value == "SL"
-        )
-        print(f"   SL 總盈虧: {sl_pnl2:,.0f} TWD")
-        print(f"   SL 平均虧損: {sl_pnl2 / sl_count2:,.0f} TWD")
+        lines.append(f"   SL 總盈虧: {sl_pnl2:,.0f} TWD")
+        lines.append(f"   SL 平均虧損: {sl_pnl2 / sl_count2:,.0f} TWD")
 
     # 差異分析
-    print("\n差異:")
-    print(f"   FS 次數差異: {fs_count2 - fs_count1:+d}")
-    print(f"   SL 次數差異: {sl_count2 - sl_count1:+d}")
+    lines.append("\n差異:")
+    lines.append(f"   FS 次數差異: {fs_count2 - fs_count1:+d}")
+    lines.append(f"   SL 次數差異: {sl_count2 - sl_count1:+d}")
 
     # 結論
-    print("\n" + "=" * 80)
-    print("🏆 結論")
-    print("=" * 80)
+    lines.append("\n" + "=" * 80)
+    lines.append("🏆 結論")
+    lines.append("=" * 80)
 
     if result1.total_pnl_twd > result2.total_pnl_twd:
         winner = "無過濾"
@@ -247,30 +268,37 @@ def main():
             else 0
         )
 
-    print(f"\n✨ 最佳策略：{winner}")
-    print(f"   總盈虧優勢：{advantage:+,.0f} TWD ({advantage_pct:+.2f}%)")
+    lines.append(f"\n✨ 最佳策略：{winner}")
+    lines.append(f"   總盈虧優勢：{advantage:+,.0f} TWD ({advantage_pct:+.2f}%)")
 
     if result1.max_drawdown < result2.max_drawdown:
-        print(
+        lines.append(
             f"   風險控制：無過濾更優（回撤 {result1.max_drawdown:.2f}% vs {result2.max_drawdown:.2f}%）"
         )
     else:
-        print(
+        lines.append(
             f"   風險控制：強死叉更優（回撤 {result2.max_drawdown:.2f}% vs {result1.max_drawdown:.2f}%）"
         )
 
     if result1.profit_factor > result2.profit_factor:
-        print(
+        lines.append(
             f"   盈虧比：無過濾更優（{result1.profit_factor:.2f} vs {result2.profit_factor:.2f}）"
         )
     else:
-        print(
+        lines.append(
             f"   盈虧比：強死叉更優（{result2.profit_factor:.2f} vs {result1.profit_factor:.2f}）"
         )
 
-    print("\n" + "=" * 80)
-    print("✅ 比較完成！")
-    print("=" * 80)
+    lines.append("\n" + "=" * 80)
+    lines.append("✅ 比較完成！")
+    lines.append("=" * 80)
+
+    # 等待結果檔寫入完成
+    for future in save_futures:
+        future.result()
+    save_pool.shutdown()
+
+    print("\n".join(lines))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """比較不同策略的回測結果"""
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timedelta
 
+import pandas as pd
+
 from auto_trade.core.client import create_api_client
-from auto_trade.core.config import Config
+from auto_trade.core.config import get_config
 from auto_trade.models.backtest import BacktestConfig
 from auto_trade.services.backtest_service import BacktestService
 from auto_trade.services.market_service import MarketService
@@ -26,7 +30,7 @@ def run_comparison():
 
     try:
         # 載入配置
-        config = Config()
+        config = get_config()
 
         # 建立API客戶端
         api_client = create_api_client(
@@ -76,31 +80,14 @@ def run_comparison():
         print(f"初始資金: {capital:,.0f}")
         print()
 
-        result1 = backtest_service.run_backtest(config1)
-        print()
-
         # ===== 策略 2: MACD 快速停損策略 =====
         print("=" * 80)
         print("📊 策略 2: MACD 快速停損策略")
         print("-" * 80)
 
-        config2 = BacktestConfig(
-            symbol=symbol,
-            sub_symbol=sub_symbol,
-            start_date=start_date,
-            end_date=end_date,
-            initial_capital=capital,
-            order_quantity=2,
-            stop_loss_points=80,
-            start_trailing_stop_points=250,
-            trailing_stop_points=250,
-            trailing_stop_points_rate=0.0095,
-            take_profit_points=600,
-            take_profit_points_rate=0.02,
-            timeframe="30m",
-            max_positions=1,
-            enable_trailing_stop=True,
-            enable_take_profit=True,
+        # 其餘參數與策略 1 相同
+        config2 = replace(
+            config1,
             enable_macd_fast_stop=True,  # 啟用快速停損
             min_acceleration_threshold=0.0,  # 無過濾（所有死叉）
         )
@@ -108,31 +95,13 @@ def run_comparison():
         print("MACD 快速停損: 啟用（無過濾，所有死叉）")
         print()
 
-        result2 = backtest_service.run_backtest(config2)
-        print()
-
         # ===== 策略 3: MACD 快速停損策略（強死叉） =====
         print("=" * 80)
         print("📊 策略 3: MACD 快速停損策略（強死叉 ≥ 3.0）")
         print("-" * 80)
 
-        config3 = BacktestConfig(
-            symbol=symbol,
-            sub_symbol=sub_symbol,
-            start_date=start_date,
-            end_date=end_date,
-            initial_capital=capital,
-            order_quantity=2,
-            stop_loss_points=80,
-            start_trailing_stop_points=250,
-            trailing_stop_points=250,
-            trailing_stop_points_rate=0.0095,
-            take_profit_points=600,
-            take_profit_points_rate=0.02,
-            timeframe="30m",
-            max_positions=1,
-            enable_trailing_stop=True,
-            enable_take_profit=True,
+        config3 = replace(
+            config1,
             enable_macd_fast_stop=True,  # 啟用快速停損
             min_acceleration_threshold=3.0,  # 強死叉過濾
         )
@@ -140,74 +109,62 @@ def run_comparison():
         print("MACD 快速停損: 啟用（強死叉，加速度 ≥ 3.0）")
         print()
 
-        result3 = backtest_service.run_backtest(config3)
-        print()
-
-        # ===== 生成比較報告 =====
-        print("=" * 80)
-        print("📈 三策略比較結果（90天）")
-        print("=" * 80)
-        print()
-
-        # 計算統計
-        result1.calculate_statistics()
-        result2.calculate_statistics()
-        result3.calculate_statistics()
-
-        # 比較表格
-        print(f"{'指標':<20} {'原始策略':<20} {'無過濾FS':<20} {'強死叉FS':<20}")
-        print("-" * 85)
-
-        # 基本統計
-        print(
-            f"{'交易次數':<20} {result1.total_trades:<20} {result2.total_trades:<20} {result3.total_trades:<20}"
-        )
-        print(
-            f"{'勝率':<20} {result1.win_rate:<19.2f}% {result2.win_rate:<19.2f}% {result3.win_rate:<19.2f}%"
-        )
-        print(
-            f"{'獲利次數':<20} {result1.winning_trades:<20} {result2.winning_trades:<20} {result3.winning_trades:<20}"
+        # 三組回測只有快速停損設定不同，共用 K 線與 MACD 一次算完
+        # （K 線與設定未變動時直接讀取上次的回測結果緩存）
+        result1, result2, result3 = backtest_service.run_backtest_multi(
+            [config1, config2, config3], use_cache=True
         )
-        print(
-            f"{'虧損次數':<20} {result1.losing_trades:<20} {result2.losing_trades:<20} {result3.losing_trades:<20}"
-        )
-
         print()
 
-        # 盈虧統計
-        print(
-            f"{'總盈虧 (TWD)':<20} {result1.total_pnl_twd:<19,.0f} {result2.total_pnl_twd:<19,.0f} {result3.total_pnl_twd:<19,.0f}"
-        )
-        print(
-            f"{'總獲利 (TWD)':<20} {result1.gross_profit:<19,.0f} {result2.gross_profit:<19,.0f} {result3.gross_profit:<19,.0f}"
-        )
-        print(
-            f"{'總虧損 (TWD)':<20} {result1.gross_loss:<19,.0f} {result2.gross_loss:<19,.0f} {result3.gross_loss:<19,.0f}"
+        # 詳細報告在背景寫檔，與比較報告的生成同時進行
+        save_pool = ThreadPoolExecutor(max_workers=2)
+        save_future1 = save_pool.submit(
+            backtest_service.save_results, result1, suffix="_original"
         )
-        print(
-            f"{'盈虧比':<20} {result1.profit_factor:<19.2f} {result2.profit_factor:<19.2f} {result3.profit_factor:<19.2f}"
+        save_future2 = save_pool.submit(
+            backtest_service.save_results, result2, suffix="_fast_stop"
         )
 
-        print()
+        # 報告內容先累積在 lines，最後一次輸出
+        lines: list[str] = []
 
-        # 風險指標
-        print(
-            f"{'最大回撤 (%)':<20} {result1.max_drawdown:<19.2f} {result2.max_drawdown:<19.2f} {result3.max_drawdown:<19.2f}"
-        )
-        print(
-            f"{'夏普比率':<20} {result1.sharpe_ratio:<19.2f} {result2.sharpe_ratio:<19.2f} {result3.sharpe_ratio:<19.2f}"
-        )
-        print(
-            f"{'持倉時間(小時)':<20} {result1.avg_trade_duration_hours:<19.1f} {result2.avg_trade_duration_hours:<19.1f} {result3.avg_trade_duration_hours:<19.1f}"
-        )
+        # ===== 生成比較報告 =====
+        lines.append("=" * 80)
+        lines.append("📈 三策略比較結果（90天）")
+        lines.append("=" * 80)
+        lines.append("")
+
+        # 比較表格（各欄先格式化成字串，再由 DataFrame 統一對齊）
+        results = (result1, result2, result3)
+        blank_row = ("", "", "", "")
+        rows = [
+            # 基本統計
+            ("交易次數", *(f"{r.total_trades}" for r in results)),
+            ("勝率", *(f"{r.win_rate:.2f}%" for r in results)),
+            ("獲利次數", *(f"{r.winning_trades}" for r in results)),
+            ("虧損次數", *(f"{r.losing_trades}" for r in results)),
+            blank_row,
+            # 盈虧統計
+            ("總盈虧 (TWD)", *(f"{r.total_pnl_twd:,.0f}" for r in results)),
+            ("總獲利 (TWD)", *(f"{r.gross_profit:,.0f}" for r in results)),
+            ("總虧損 (TWD)", *(f"{r.gross_loss:,.0f}" for r in results)),
+            ("盈虧比", *(f"{r.profit_factor:.2f}" for r in results)),
+            blank_row,
+            # 風險指標
+            ("最大回撤 (%)", *(f"{r.max_drawdown:.2f}" for r in results)),
+            ("夏普比率", *(f"{r.sharpe_ratio:.2f}" for r in results)),
+            ("持倉時間(小時)", *(f"{r.avg_trade_duration_hours:.1f}" for r in results)),
+        ]
+        table = pd.DataFrame(rows, columns=["指標", "原始策略", "無過濾FS", "強死叉FS"])
+        lines.append(table.to_string(index=False))
 
-        print()
-        print("=" * 85)
+        lines.append("")
+        lines.append("=" * 85)
 
         # 相對於原始策略的改善
-        print()
-        print("📊 相對於原始策略的改善:")
-        print()
+        lines.append("")
+        lines.append("📊 相對於原始策略的改善:")
+        lines.append("")
 
         # 無過濾 vs 原始
         pnl_diff_2 = result2.total_pnl_twd - result1.total_pnl_twd
@@ -222,11 +179,11 @@ def run_comparison():
         )
         dd_diff_2 = result2.max_drawdown - result1.max_drawdown
 
-        print("📌 無過濾快速停損 vs 原始策略:")
-        print(f"   總盈虧：{pnl_diff_2:+,.0f} TWD ({pnl_pct_2:+.2f}%)")
-        print(f"   總虧損：{loss_diff_2:+,.0f} TWD ({loss_pct_2:+.2f}%)")
-        print(f"   最大回撤：{dd_diff_2:+.2f}%")
-        print(f"   盈虧比：{result2.profit_factor - result1.profit_factor:+.2f}")
+        lines.append("📌 無過濾快速停損 vs 原始策略:")
+        lines.append(f"   總盈虧：{pnl_diff_2:+,.0f} TWD ({pnl_pct_2:+.2f}%)")
+        lines.append(f"   總虧損：{loss_diff_2:+,.0f} TWD ({loss_pct_2:+.2f}%)")
+        lines.append(f"   最大回撤：{dd_diff_2:+.2f}%")
+        lines.append(f"   盈虧比：{result2.profit_factor - result1.profit_factor:+.2f}")
 
         # 強死叉 vs 原始
         pnl_diff_3 = result3.total_pnl_twd - result1.total_pnl_twd
@@ -241,65 +198,49 @@ def run_comparison():
         )
         dd_diff_3 = result3.max_drawdown - result1.max_drawdown
 
-        print()
-        print("📌 強死叉快速停損 vs 原始策略:")
-        print(f"   總盈虧：{pnl_diff_3:+,.0f} TWD ({pnl_pct_3:+.2f}%)")
-        print(f"   總虧損：{loss_diff_3:+,.0f} TWD ({loss_pct_3:+.2f}%)")
-        print(f"   最大回撤：{dd_diff_3:+.2f}%")
-        print(f"   盈虧比：{result3.profit_factor - result1.profit_factor:+.2f}")
+        lines.append("")
+        lines.append("📌 強死叉快速停損 vs 原始策略:")
+        lines.append(f"   總盈虧：{pnl_diff_3:+,.0f} TWD ({pnl_pct_3:+.2f}%)")
+        lines.append(f"   總虧損：{loss_diff_3:+,.0f} TWD ({loss_pct_3:+.2f}%)")
+        lines.append(f"   最大回撤：{dd_diff_3:+.2f}%")
+        lines.append(f"   盈虧比：{result3.profit_factor - result1.profit_factor:+.2f}")
 
         # FS效果分析
-        print()
-        print("=" * 85)
-        print("⚡ 快速停損（FS）效果分析:")
-        print()
+        lines.append("")
+        lines.append("=" * 85)
+        lines.append("⚡ 快速停損（FS）效果分析:")
+        lines.append("")
 
         # 策略 2
-        fs_count2 = sum(
-            1 for trade in result2.trades if trade.exit_reason.value == "FS"
-        )
-        sl_count2 = sum(
-            1 for trade in result2.trades if trade.exit_reason.value == "SL"
-        )
-        print("無過濾FS:")
-        print(f"   FS 次數: {fs_count2}")
+        exits2 = result2.summarize_exits()
+        fs_count2, fs_pnl2 = exits2.get("FS", (0, 0.0))
+        sl_count2 = exits2.get("SL", (0, 0.0))[0]
+        lines.append("無過濾FS:")
+        lines.append(f"   FS 次數: {fs_count2}")
         if fs_count2 > 0:
-            fs_pnl2 = sum(
-                trade.pnl_twd
-                for trade in result2.trades
-                if trade.exit_reason.value == "FS"
-            )
-            print(f"   FS 總盈虧: {fs_pnl2:,.0f} TWD")
-            print(f"   FS 平均虧損: {fs_pnl2 / fs_count2:,.0f} TWD")
-        print(f"   SL 次數: {sl_count2}")
+            lines.append(f"   FS 總盈虧: {fs_pnl2:,.0f} TWD")
+            lines.append(f"   FS 平均虧損: {fs_pnl2 / fs_count2:,.0f} TWD")
+        lines.append(f"   SL 次數: {sl_count2}")
 
         # 策略 3
-        fs_count3 = sum(
-            1 for trade in result3.trades if trade.exit_reason.value == "FS"
-        )
-        sl_count3 = sum(
-            1 for trade in result3.trades if trade.exit_reason.value == "SL"
-        )
-        print()
-        print("強死叉FS (≥3.0):")
-        print(f"   FS 次數: {fs_count3}")
+        exits3 = result3.summarize_exits()
+        fs_count3, fs_pnl3 = exits3.get("FS", (0, 0.0))
+        sl_count3 = exits3.get("SL", (0, 0.0))[0]
+        lines.append("")
+        lines.append("強死叉FS (≥3.0):")
+        lines.append(f"   FS 次數: {fs_count3}")
         if fs_count3 > 0:
-            fs_pnl3 = sum(
-                trade.pnl_twd
-                for trade in result3.trades
-                if trade.exit_reason.value == "FS"
-            )
-            print(f"   FS 總盈虧: {fs_pnl3:,.0f} TWD")
-            print(f"   FS 平均虧損: {fs_pnl3 / fs_count3:,.0f} TWD")
-        print(f"   SL 次數: {sl_count3}")
+            lines.append(f"   FS 總盈虧: {fs_pnl3:,.0f} TWD")
+            lines.append(f"   FS 平均虧損: {fs_pnl3 / fs_count3:,.0f} TWD")
+        lines.append(f"   SL 次數: {sl_count3}")
 
-        print()
-        print("=" * 85)
+        lines.append("")
+        lines.append("=" * 85)
 
         # 結論
-        print()
-        print("🏆 結論:")
-        print()
+        lines.append("")
+        lines.append("🏆 結論:")
+        lines.append("")
 
         # 找出最佳策略
         results_list = [
@@ -309,7 +250,7 @@ def run_comparison():
         ]
         best_strategy = max(results_list, key=lambda x: x[1])
 
-        print(f"✨ 總盈虧最高：{best_strategy[0]} ({best_strategy[1]:,.0f} TWD)")
+        lines.append(f"✨ 總盈虧最高：{best_strategy[0]} ({best_strategy[1]:,.0f} TWD)")
 
         # 風險控制最佳
         dd_results = [
@@ -318,7 +259,7 @@ def run_comparison():
             ("強死叉快速停損", result3.max_drawdown),
         ]
         best_dd = min(dd_results, key=lambda x: x[1])
-        print(f"✨ 風險控制最佳：{best_dd[0]} (回撤 {best_dd[1]:.2f}%)")
+        lines.append(f"✨ 風險控制最佳：{best_dd[0]} (回撤 {best_dd[1]:.2f}%)")
 
         # 盈虧比最高
         pf_results = [
@@ -327,23 +268,26 @@ def run_comparison():
             ("強死叉快速停損", result3.profit_factor),
         ]
         best_pf = max(pf_results, key=lambda x: x[1])
-        print(f"✨ 盈虧比最高：{best_pf[0]} ({best_pf[1]:.2f})")
+        lines.append(f"✨ 盈虧比最高：{best_pf[0]} ({best_pf[1]:.2f})")
 
-        print()
+        lines.append("")
 
         if result2.max_drawdown < result1.max_drawdown:
-            print(
+            lines.append(
                 f"✅ 快速停損減少了最大回撤: {result1.max_drawdown - result2.max_drawdown:,.0f} TWD"
             )
 
-        print()
-        print("=" * 80)
+        lines.append("")
+        lines.append("=" * 80)
+
+        print("\n".join(lines))
 
         # 保存詳細報告
         print()
         print("💾 保存詳細報告...")
-        file1 = backtest_service.save_results(result1, suffix="_original")
-        file2 = backtest_service.save_results(result2, suffix="_fast_stop")
+        file1 = save_future1.result()
+        file2 = save_future2.result()
+        save_pool.shutdown()
 
         print(f"✅ 原始策略報告: {file1}")
         print(f"✅ 快速停損策略報告: {file2}")
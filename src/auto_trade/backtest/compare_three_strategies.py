@@ -7,15 +7,23 @@
 3. 快速停損 - 強死叉（加速度 ≥ 3.0）
 """
 
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
 
+import numpy as np
+
 from auto_trade.core.client import create_api_client
-from auto_trade.core.config import Config
+from auto_trade.core.config import get_config
 from auto_trade.models.backtest import BacktestConfig
 from auto_trade.services.backtest_service import BacktestService
 from auto_trade.services.market_service import MarketService
 from auto_trade.services.strategy_service import StrategyService
 
+# 比較表每列的格式：指標名稱 + 三個策略的數值
+TABLE_ROW_FORMAT = "{:<20} {:<20} {:<20} {:<20}"
+
 
 def main():
     """比較三種策略的 90 天表現"""
@@ -25,7 +33,7 @@ def main():
     print("=" * 80)
 
     # 加載配置
-    config = Config()
+    config = get_config()
 
     # 創建 API 客戶端（模擬模式）
     api_client = create_api_client(
@@ -77,30 +85,14 @@ def main():
 
     print("啟用 MACD 快速停損：否\n")
 
-    result1 = backtest_service.run_backtest(config1)
-    backtest_service.save_results(
-        result1, filename="backtest_results_MXF_90days_original.txt"
-    )
-
     # ===== 策略 2: 快速停損 - 無過濾（加速度 0.0） =====
     print("\n" + "=" * 80)
     print("📊 策略 2: 快速停損 - 無過濾（所有死叉）")
     print("-" * 80)
 
-    config2 = BacktestConfig(
-        symbol="MXF",
-        sub_symbol="MXF202511",
-        start_date=start_date,
-        end_date=end_date,
-        initial_capital=1000000,
-        order_quantity=2,
-        timeframe="30m",
-        stop_loss_points=80,
-        start_trailing_stop_points=250,
-        trailing_stop_points=250,
-        take_profit_points=500,
-        trailing_stop_points_rate=0.0095,
-        take_profit_points_rate=0.02,
+    # 其餘參數與策略 1 相同
+    config2 = replace(
+        config1,
         enable_macd_fast_stop=True,
         min_acceleration_threshold=0.0,  # 無過濾
     )
@@ -108,30 +100,13 @@ def main():
     print("啟用 MACD 快速停損：是")
     print("加速度門檻：無過濾（所有死叉）\n")
 
-    result2 = backtest_service.run_backtest(config2)
-    backtest_service.save_results(
-        result2, filename="backtest_results_MXF_90days_no_filter.txt"
-    )
-
     # ===== 策略 3: 快速停損 - 強死叉（加速度 3.0） =====
     print("\n" + "=" * 80)
     print("📊 策略 3: 快速停損 - 強死叉（加速度 ≥ 3.0）")
     print("-" * 80)
 
-    config3 = BacktestConfig(
-        symbol="MXF",
-        sub_symbol="MXF202511",
-        start_date=start_date,
-        end_date=end_date,
-        initial_capital=1000000,
-        order_quantity=2,
-        timeframe="30m",
-        stop_loss_points=80,
-        start_trailing_stop_points=250,
-        trailing_stop_points=250,
-        take_profit_points=500,
-        trailing_stop_points_rate=0.0095,
-        take_profit_points_rate=0.02,
+    config3 = replace(
+        config1,
         enable_macd_fast_stop=True,
         min_acceleration_threshold=3.0,  # 強死叉過濾
     )
@@ -139,59 +114,56 @@ def main():
     print("啟用 MACD 快速停損：是")
     print("加速度門檻：3.0（強死叉）\n")
 
-    result3 = backtest_service.run_backtest(config3)
-    backtest_service.save_results(
-        result3, filename="backtest_results_MXF_90days_strong_filter.txt"
+    # 三組回測彼此獨立，以多程序並行執行（K 線與設定未變動時讀取上次的結果緩存）
+    result1, result2, result3 = backtest_service.run_backtests(
+        [config1, config2, config3], use_cache=True
     )
 
+    # 結果在背景依序寫檔，與比較報告的生成同時進行
+    save_pool = ThreadPoolExecutor(max_workers=1)
+    save_futures = [
+        save_pool.submit(backtest_service.save_results, result, filename=filename)
+        for result, filename in (
+            (result1, "backtest_results_MXF_90days_original.txt"),
+            (result2, "backtest_results_MXF_90days_no_filter.txt"),
+            (result3, "backtest_results_MXF_90days_strong_filter.txt"),
+        )
+    ]
+
     # ===== 生成比較報告 =====
     print("\n" + "=" * 80)
     print("📊 三策略比較結果（90 天完整期間）")
     print("=" * 80)
 
-    # 基本統計
-    print(f"\n{'指標':<20} {'原始策略':<20} {'無過濾FS':<20} {'強死叉FS':<20}")
-    print("-" * 80)
-
-    print(
-        f"{'總交易次數':<20} {result1.total_trades:<20} {result2.total_trades:<20} {result3.total_trades:<20}"
-    )
-    print(
-        f"{'獲利交易':<20} {result1.winning_trades:<20} {result2.winning_trades:<20} {result3.winning_trades:<20}"
-    )
-    print(
-        f"{'虧損交易':<20} {result1.losing_trades:<20} {result2.losing_trades:<20} {result3.losing_trades:<20}"
-    )
-    print(
-        f"{'勝率':<20} {result1.win_rate:<19.2f}% {result2.win_rate:<19.2f}% {result3.win_rate:<19.2f}%"
-    )
-
-    # 盈虧統計
-    print("\n" + "-" * 80)
-    print(
-        f"{'總盈虧 (TWD)':<20} {result1.total_pnl_twd:<19,.0f} {result2.total_pnl_twd:<19,.0f} {result3.total_pnl_twd:<19,.0f}"
-    )
-    print(
-        f"{'總獲利 (TWD)':<20} {result1.gross_profit:<19,.0f} {result2.gross_profit:<19,.0f} {result3.gross_profit:<19,.0f}"
-    )
-    print(
-        f"{'總虧損 (TWD)':<20} {result1.gross_loss:<19,.0f} {result2.gross_loss:<19,.0f} {result3.gross_loss:<19,.0f}"
-    )
-
-    # 風險指標
-    print("\n" + "-" * 80)
-    print(
-        f"{'最大回撤':<20} {result1.max_drawdown:<19.2f}% {result2.max_drawdown:<19.2f}% {result3.max_drawdown:<19.2f}%"
-    )
-    print(
-        f"{'盈虧比':<20} {result1.profit_factor:<20.2f} {result2.profit_factor:<20.2f} {result3.profit_factor:<20.2f}"
-    )
-    print(
-        f"{'夏普比率':<20} {result1.sharpe_ratio:<20.2f} {result2.sharpe_ratio:<20.2f} {result3.sharpe_ratio:<20.2f}"
-    )
-    print(
-        f"{'平均持倉(小時)':<20} {result1.avg_trade_duration_hours:<20.1f} {result2.avg_trade_duration_hours:<20.1f} {result3.avg_trade_duration_hours:<20.1f}"
-    )
+    # 比較表先組成完整字串，一次輸出
+    strategy_results = (result1, result2, result3)
+
+    def row(label: str, attr: str, spec: str, unit: str = "") -> str:
+        values = (f"{getattr(r, attr):{spec}}{unit}" for r in strategy_results)
+        return TABLE_ROW_FORMAT.format(label, *values)
+
+    section_sep = "\n" + "-" * 80
+    table = [
+        "\n" + TABLE_ROW_FORMAT.format("指標", "原始策略", "無過濾FS", "強死叉FS"),
+        "-" * 80,
+        # 基本統計
+        row("總交易次數", "total_trades", "d"),
+        row("獲利交易", "winning_trades", "d"),
+        row("虧損交易", "losing_trades", "d"),
+        row("勝率", "win_rate", ".2f", "%"),
+        # 盈虧統計
+        section_sep,
+        row("總盈虧 (TWD)", "total_pnl_twd", ",.0f"),
+        row("總獲利 (TWD)", "gross_profit", ",.0f"),
+        row("總虧損 (TWD)", "gross_loss", ",.0f"),
+        # 風險指標
+        section_sep,
+        row("最大回撤", "max_drawdown", ".2f", "%"),
+        row("盈虧比", "profit_factor", ".2f"),
+        row("夏普比率", "sharpe_ratio", ".2f"),
+        row("平均持倉(小時)", "avg_trade_duration_hours", ".1f"),
+    ]
+    sys.stdout.write("\n".join(table) + "\n")
 
     # 相對於原始策略的改善
     print("\n" + "=" * 80)
@@ -246,40 +218,30 @@ def main():
     print("=" * 80)
 
     # 策略 2
-    fs_count2 = sum(1 for trade in result2.trades if trade.exit_reason.value == "FS")
-    sl_count2 = sum(1 for trade in result2.trades if trade.exit_reason.value == "SL")
+    exits2 = result2.summarize_exits()
+    fs_count2, fs_pnl2 = exits2.get("FS", (0, 0.0))
+    sl_count2, sl_pnl2 = exits2.get("SL", (0, 0.0))
     print("\n策略 2（無過濾）:")
     print(f"   FS 次數: {fs_count2}")
     if fs_count2 > 0:
-        fs_pnl2 = sum(
-            trade.pnl_twd for trade in result2.trades if trade.exit_reason.value == "FS"
-        )
         print(f"   FS 總盈虧: {fs_pnl2:,.0f} TWD")
         print(f"   FS 平均虧損: {fs_pnl2 / fs_count2:,.0f} TWD")
     print(f"   SL 次數: {sl_count2}")
     if sl_count2 > 0:
-        sl_pnl2 = sum(
-            trade.pnl_twd for trade in result2.trades if trade.exit_reason.value == "SL"
-        )
         print(f"   SL 總盈虧: {sl_pnl2:,.0f} TWD")
         print(f"   SL 平均虧損: {sl_pnl2 / sl_count2:,.0f} TWD")
 
     # 策略 3
-    fs_count3 = sum(1 for trade in result3.trades if trade.exit_reason.value == "FS")
-    sl_count3 = sum(1 for trade in result3.trades if trade.exit_reason.value == "SL")
+    exits3 = result3.summarize_exits()
+    fs_count3, fs_pnl3 = exits3.get("FS", (0, 0.0))
+    sl_count3, sl_pnl3 = exits3.get("SL", (0, 0.0))
     print("\n策略 3（強死叉 ≥ 3.0）:")
     print(f"   FS 次數: {fs_count3}")
     if fs_count3 > 0:
-        fs_pnl3 = sum(
-            trade.pnl_twd for trade in result3.trades if trade.exit_reason.value == "FS"
-        )
         print(f"   FS 總盈虧: {fs_pnl3:,.0f} TWD")
         print(f"   FS 平均虧損: {fs_pnl3 / fs_count3:,.0f} TWD")
     print(f"   SL 次數: {sl_count3}")
     if sl_count3 > 0:
-        sl_pnl3 = sum(
-            trade.pnl_twd for trade in result3.trades if trade.exit_reason.value == "SL"
-        )
         print(f"   SL 總盈虧: {sl_pnl3:,.0f} TWD")
         print(f"   SL 平均虧損: {sl_pnl3 / sl_count3:,.0f} TWD")
 
@@ -288,42 +250,35 @@ def main():
     print("🏆 結論與建議")
     print("=" * 80)
 
-    # 找出最佳策略
-    results = [
-        ("原始策略", result1.total_pnl_twd),
-        ("無過濾快速停損", result2.total_pnl_twd),
-        ("強死叉快速停損", result3.total_pnl_twd),
-    ]
-    best_strategy = max(results, key=lambda x: x[1])
+    # 各策略指標疊成陣列：欄位依序為 總盈虧、最大回撤、盈虧比、勝率
+    names = ["原始策略", "無過濾快速停損", "強死叉快速停損"]
+    metrics = np.array(
+        [
+            [r.total_pnl_twd, r.max_drawdown, r.profit_factor, r.win_rate]
+            for r in strategy_results
+        ]
+    )
+    pnl, drawdown, profit_factor, win_rate = metrics.T
 
-    print(f"\n✨ 總盈虧最高：{best_strategy[0]} ({best_strategy[1]:,.0f} TWD)")
+    best = pnl.argmax()
+    print(f"\n✨ 總盈虧最高：{names[best]} ({pnl[best]:,.0f} TWD)")
 
     # 風險控制
-    dd_results = [
-        ("原始策略", result1.max_drawdown),
-        ("無過濾快速停損", result2.max_drawdown),
-        ("強死叉快速停損", result3.max_drawdown),
-    ]
-    best_dd = min(dd_results, key=lambda x: x[1])
-    print(f"✨ 風險控制最佳：{best_dd[0]} (回撤 {best_dd[1]:.2f}%)")
+    best = drawdown.argmin()
+    print(f"✨ 風險控制最佳：{names[best]} (回撤 {drawdown[best]:.2f}%)")
 
     # 盈虧比
-    pf_results = [
-        ("原始策略", result1.profit_factor),
-        ("無過濾快速停損", result2.profit_factor),
-        ("強死叉快速停損", result3.profit_factor),
-    ]
-    best_pf = max(pf_results, key=lambda x: x[1])
-    print(f"✨ 盈虧比最高：{best_pf[0]} ({best_pf[1]:.2f})")
+    best = profit_factor.argmax()
+    print(f"✨ 盈虧比最高：{names[best]} ({profit_factor[best]:.2f})")
 
     # 勝率
-    wr_results = [
-        ("原始策略", result1.win_rate),
-        ("無過濾快速停損", result2.win_rate),
-        ("強死叉快速停損", result3.win_rate),
-    ]
-    best_wr = max(wr_results, key=lambda x: x[1])
-    print(f"✨ 勝率最高：{best_wr[0]} ({best_wr[1]:.2f}%)")
+    best = win_rate.argmax()
+    print(f"✨ 勝率最高：{names[best]} ({win_rate[best]:.2f}%)")
+
+    # 等待結果檔寫入完成
+    for future in save_futures:
+        future.result()
+    save_pool.shutdown()
 
     print("\n" + "=" * 80)
     print("✅ 比較完成！")
@@ -0,0 +1,226 @@
+"""金叉 / 死叉門檻掃描回測
+
+test_death_cross_strength、test_golden_cross_strength 共用的掃描流程。
+同一程序內執行多組掃描時共用同一個 BacktestService，K 線只取一次。
+
+用法：
+    python -m auto_trade.backtest.sweep death --thresholds 0 3 5
+    python -m auto_trade.backtest.sweep golden --days 90 --thresholds 0 1 2 3 5
+    python -m auto_trade.backtest.sweep death golden --save
+"""
+
+import argparse
+import sys
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from auto_trade.core.client import create_api_client
+from auto_trade.core.config import get_config
+from auto_trade.models.backtest import BacktestConfig, BacktestResult
+from auto_trade.models.position_record import ExitReason
+from auto_trade.services.backtest_service import BacktestService
+from auto_trade.services.market_service import MarketService
+from auto_trade.services.strategy_service import StrategyService
+
+# 掃描種類 -> (對應的 BacktestConfig 欄位, 顯示名稱)
+CROSS_KINDS: dict[str, tuple[str, str]] = {
+    "death": ("min_acceleration_threshold", "強死叉"),
+    "golden": ("min_golden_cross_strength", "強金叉"),
+}
+
+# 預設基礎配置（小台 30 分K，啟用移動停損、獲利了結與 MACD 快速停損）
+DEFAULT_BASE_CONFIG: dict = {
+    "symbol": "MXF",
+    "sub_symbol": "MXF202511",
+    "timeframe": "30m",
+    "initial_capital": 1_000_000,
+    "order_quantity": 2,
+    "stop_loss_points": 80,
+    "start_trailing_stop_points": 250,
+    "trailing_stop_points": 250,
+    "trailing_stop_points_rate": 0.0095,
+    "take_profit_points": 500,
+    "take_profit_points_rate": 0.02,
+    "enable_trailing_stop": True,
+    "enable_take_profit": True,
+    "enable_macd_fast_stop": True,
+}
+
+
+def create_backtest_service() -> BacktestService:
+    """建立回測服務（模擬環境 API 客戶端）"""
+    config = get_config()
+    api_client = create_api_client(
+        config.api_key,
+        config.secret_key,
+        config.ca_cert_path,
+        config.ca_password,
+        simulation=True,
+    )
+    return BacktestService(MarketService(api_client), StrategyService())
+
+
+def run_sweep(
+    cross_kind: str,
+    thresholds: list[float],
+    days: int = 90,
+    end_date: datetime | None = None,
+    base_config_kwargs: dict | None = None,
+    backtest_service: BacktestService | None = None,
+    save_reports: bool = False,
+) -> list[BacktestResult]:
+    """執行一組門檻掃描並印出比較結果
+
+    Args:
+        cross_kind: 掃描種類（"death" = 死叉加速度門檻，"golden" = 金叉強度門檻）
+        thresholds: 要比較的門檻列表
+        days: 回測天數
+        end_date: 回測結束時間（預設為現在；多組掃描傳入同一時間才能共用 K 線）
+        base_config_kwargs: 覆蓋預設基礎配置的參數
+        backtest_service: 共用的回測服務（多組掃描共用時 K 線只取一次）
+        save_reports: 是否保存各門檻的詳細報告
+
+    Returns:
+        與 thresholds 順序相同的回測結果列表
+    """
+    field_name, kind_label = CROSS_KINDS[cross_kind]
+    if backtest_service is None:
+        backtest_service = create_backtest_service()
+
+    end_date = end_date or datetime.now()
+    base_config = BacktestConfig(
+        start_date=end_date - timedelta(days=days),
+        end_date=end_date,
+        **{**DEFAULT_BASE_CONFIG, **(base_config_kwargs or {})},
+    )
+    configs = [
+        replace(base_config, **{field_name: threshold}) for threshold in thresholds
+    ]
+    labels = [
+        f"{threshold:.1f}" if threshold > 0 else "無過濾" for threshold in thresholds
+    ]
+
+    print("=" * 80)
+    print(f"🔬 測試不同{kind_label}門檻的影響")
+    print("=" * 80)
+    print()
+
+    # 各門檻彼此獨立，以多程序並行執行（K 線只取一次，同程序內共用 MACD）
+    results: list[BacktestResult] = backtest_service.run_backtests(configs)
+
+    for label, result in zip(labels, results, strict=True):
+        print(f"\n{'=' * 80}")
+        print(f"📊 測試{kind_label}門檻: {label}")
+        print(f"{'=' * 80}\n")
+
+        # 顯示簡要結果
+        print(f"\n📈 結果摘要（門檻 {label}）:")
+        print(f"   總交易次數: {result.total_trades}")
+        print(f"   獲利交易: {result.winning_trades}")
+        print(f"   虧損交易: {result.losing_trades}")
+        print(f"   勝率: {result.win_rate:.2f}%")
+        print(f"   總盈虧: {result.total_pnl_twd:,.0f} TWD")
+        print(f"   總獲利: {result.gross_profit:,.0f} TWD")
+        print(f"   總虧損: {result.gross_loss:,.0f} TWD")
+        print(f"   最大回撤: {result.max_drawdown:.2f}%")
+        print(f"   盈虧比: {result.profit_factor:.2f}")
+
+        print("   退出原因統計:")
+        for reason, (count, _) in sorted(result.summarize_exits().items()):
+            print(f"      {reason}: {count}")
+
+    # 比較結果
+    print("\n" + "=" * 80)
+    print("📊 不同門檻比較總結")
+    print("=" * 80)
+    table = [
+        f"\n{'門檻':<10} {'交易':<8} {'獲利/虧損':<12} {'勝率':<10} {'總盈虧':<15} {'總獲利':<15} {'總虧損':<15} {'回撤':<10} {'盈虧比':<8}",
+        "-" * 130,
+    ]
+    for label, result in zip(labels, results, strict=True):
+        table.append(
+            f"{label:<10} {result.total_trades:<8} "
+            f"{result.winning_trades}/{result.losing_trades:<10} "
+            f"{result.win_rate:<9.2f}% "
+            f"{result.total_pnl_twd:<14,.0f} "
+            f"{result.gross_profit:<14,.0f} "
+            f"{result.gross_loss:<14,.0f} "
+            f"{result.max_drawdown:<9.2f}% "
+            f"{result.profit_factor:<8.2f}"
+        )
+    sys.stdout.write("\n".join(table) + "\n")
+
+    # 找出最佳門檻
+    pnls = np.fromiter(
+        (result.total_pnl_twd for result in results),
+        dtype=np.float64,
+        count=len(results),
+    )
+    best_index = int(pnls.argmax())
+    best_result = results[best_index]
+
+    print("\n" + "=" * 80)
+    print(f"🏆 最佳門檻: {labels[best_index]}")
+    print(f"   總盈虧: {best_result.total_pnl_twd:,.0f} TWD")
+    print(f"   勝率: {best_result.win_rate:.2f}%")
+    print(f"   最大回撤: {best_result.max_drawdown:.2f}%")
+    print(f"   盈虧比: {best_result.profit_factor:.2f}")
+    print("=" * 80)
+
+    # 分析快速停損（FS）的效果
+    print("\n" + "=" * 80)
+    print("⚡ 快速停損（FS）效果分析")
+    print("=" * 80)
+    for label, result in zip(labels, results, strict=True):
+        fs_count, fs_pnl = result.exit_stats(ExitReason.FAST_STOP)
+        print(f"\n門檻 {label}:")
+        print(f"   FS 次數: {fs_count}")
+        print(f"   FS 總盈虧: {fs_pnl:,.0f} TWD")
+        if fs_count > 0:
+            print(f"   FS 平均虧損: {fs_pnl / fs_count:,.0f} TWD")
+
+    # 保存詳細報告
+    if save_reports:
+        for threshold, result in zip(thresholds, results, strict=True):
+            suffix = f"{cross_kind}_{threshold:.1f}".replace(".", "_")
+            backtest_service.save_results(result, suffix=suffix)
+            print(f"\n✅ 已保存門檻 {threshold} 的詳細報告")
+
+    return results
+
+
+def main():
+    """依命令列參數執行一組或多組門檻掃描"""
+    parser = argparse.ArgumentParser(description="金叉 / 死叉門檻掃描回測")
+    parser.add_argument(
+        "cross_kinds", nargs="+", choices=list(CROSS_KINDS), help="掃描種類"
+    )
+    parser.add_argument("--days", type=int, default=90, help="回測天數")
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=[0.0, 1.0, 2.0, 3.0, 5.0],
+        help="要比較的門檻",
+    )
+    parser.add_argument("--save", action="store_true", help="保存各門檻的詳細報告")
+    args = parser.parse_args()
+
+    # 多組掃描共用回測服務（同一數據範圍的 K 線只取一次）
+    backtest_service = create_backtest_service()
+    end_date = datetime.now()
+    for cross_kind in args.cross_kinds:
+        run_sweep(
+            cross_kind,
+            args.thresholds,
+            days=args.days,
+            end_date=end_date,
+            backtest_service=backtest_service,
+            save_reports=args.save,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,17 @@
 比較加速度門檻：0.0, 1.0, 2.0, 3.0, 4.0, 5.0
 """
 
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from auto_trade.core.client import create_api_client
-from auto_trade.core.config import Config
-from auto_trade.models.backtest import BacktestConfig
+from auto_trade.core.config import get_config
+from auto_trade.models.backtest import BacktestConfig, BacktestResult
+from auto_trade.models.position_record import ExitReason
 from auto_trade.services.backtest_service import BacktestService
 from auto_trade.services.market_service import MarketService
 from auto_trade.services.strategy_service import StrategyService
@@ -23,7 +29,7 @@ def main():
     print("=" * 80)
 
     # 加載配置
-    config = Config()
+    config = get_config()
 
     # 創建 API 客戶端（模擬模式）
     api_client = create_api_client(
@@ -37,6 +43,11 @@ def main():
     # 創建服務
     market_service = MarketService(api_client)
     strategy_service = StrategyService()
+    # 所有門檻共用同一個回測服務，K 線數據只取一次
+    backtest_service = BacktestService(
+        market_service=market_service,
+        strategy_service=strategy_service,
+    )
 
     # 設置回測時間範圍（最近 30 天）
     end_date = datetime.now()
@@ -48,44 +59,46 @@ def main():
 
     # 測試不同的加速度門檻
     thresholds = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
-    results = {}
 
-    for threshold in thresholds:
-        print("=" * 80)
-        print(f"🧪 測試加速度門檻：{threshold}")
-        print("=" * 80)
+    # 基礎回測配置，各門檻只替換加速度參數
+    base_config = BacktestConfig(
+        symbol="MXF",
+        sub_symbol="MXFR1",  # 小台指近月合約
+        start_date=start_date,
+        end_date=end_date,
+        initial_capital=1000000,
+        order_quantity=2,
+        timeframe="30m",
+        stop_loss_points=80,
+        start_trailing_stop_points=250,
+        trailing_stop_points=250,
+        take_profit_points=500,
+        trailing_stop_points_rate=0.0095,
+        take_profit_points_rate=0.02,
+        enable_macd_fast_stop=True,  # 啟用 MACD 快速停損
+    )
 
-        # 創建回測配置
-        config_backtest = BacktestConfig(
-            symbol="MXF",
-            sub_symbol="MXFR1",  # 小台指近月合約
-            start_date=start_date,
-            end_date=end_date,
-            initial_capital=1000000,
-            order_quantity=2,
-            timeframe="30m",
-            stop_loss_points=80,
-            start_trailing_stop_points=250,
-            trailing_stop_points=250,
-            take_profit_points=500,
-            trailing_stop_points_rate=0.0095,
-            take_profit_points_rate=0.02,
-            enable_macd_fast_stop=True,  # 啟用 MACD 快速停損
-            min_acceleration_threshold=threshold,  # 加速度門檻
-        )
+    # 各門檻彼此獨立，以多程序並行執行
+    configs = [
+        replace(base_config, min_acceleration_threshold=threshold)
+        for threshold in thresholds
+    ]
+    results: list[BacktestResult] = backtest_service.run_backtests(configs)
 
-        # 創建回測服務並執行
-        backtest_service = BacktestService(
-            market_service=market_service,
-            strategy_service=strategy_service,
-        )
+    # 詳細結果在背景依序寫檔，不阻塞摘要輸出
+    save_pool = ThreadPoolExecutor(max_workers=1)
+    save_futures = []
 
-        result = backtest_service.run_backtest(config_backtest)
-        results[threshold] = result
+    for threshold, result in zip(thresholds, results, strict=True):
+        print("=" * 80)
+        print(f"🧪 測試加速度門檻：{threshold}")
+        print("=" * 80)
 
         # 保存詳細結果
         filename = f"backtest_results_MXF_acceleration_{threshold:.1f}.txt"
-        backtest_service.save_results(result, filename=filename)
+        save_futures.append(
+            save_pool.submit(backtest_service.save_results, result, filename=filename)
+        )
 
         # 顯示簡要結果
         threshold_label = "無過濾" if threshold == 0.0 else f"{threshold:.1f}"
@@ -102,13 +115,10 @@ def main():
         print(f"   平均持倉時間: {result.avg_trade_duration_hours:.1f} 小時")
 
         # 統計不同退出原因的次數
-        exit_reasons = {}
-        for trade in result.trades:
-            reason = trade.exit_reason.value if trade.exit_reason else "Unknown"
-            exit_reasons[reason] = exit_reasons.get(reason, 0) + 1
+        exit_summary = result.summarize_exits()
 
         print("   退出原因統計:")
-        for reason, count in sorted(exit_reasons.items()):
+        for reason, (count, _) in sorted(exit_summary.items()):
             print(f"      {reason}: {count}")
 
         print(f"\n✅ 加速度 {threshold} 回測完成\n")
@@ -117,15 +127,14 @@ def main():
     print("\n" + "=" * 80)
     print("📊 加速度門檻比較結果（最近 30 天盤整期）")
     print("=" * 80)
-    print(
-        f"\n{'門檻':<10} {'交易':<8} {'獲利/虧損':<12} {'勝率':<10} {'總盈虧':<15} {'總獲利':<15} {'總虧損':<15} {'回撤':<10} {'盈虧比':<8}"
-    )
-    print("-" * 130)
+    table = [
+        f"\n{'門檻':<10} {'交易':<8} {'獲利/虧損':<12} {'勝率':<10} {'總盈虧':<15} {'總獲利':<15} {'總虧損':<15} {'回撤':<10} {'盈虧比':<8}",
+        "-" * 130,
+    ]
 
-    for threshold in thresholds:
-        result = results[threshold]
+    for threshold, result in zip(thresholds, results, strict=True):
         threshold_label = "無過濾" if threshold == 0.0 else f"{threshold:.1f}"
-        print(
+        table.append(
             f"{threshold_label:<10} {result.total_trades:<8} "
             f"{result.winning_trades}/{result.losing_trades:<10} "
             f"{result.win_rate:<9.2f}% "
@@ -135,68 +144,58 @@ def main():
             f"{result.max_drawdown:<9.2f}% "
             f"{result.profit_factor:<8.2f}"
         )
+    sys.stdout.write("\n".join(table) + "\n")
 
     # 找出最佳門檻
     print("\n" + "=" * 80)
     print("🏆 最佳門檻分析")
     print("=" * 80)
 
-    best_profit_threshold = max(
-        results.keys(), key=lambda k: results[k].total_pnl_points
-    )
-    best_drawdown_threshold = min(results.keys(), key=lambda k: results[k].max_drawdown)
-    best_winrate_threshold = max(
-        results.keys(),
-        key=lambda k: results[k].winning_trades / results[k].total_trades
-        if results[k].total_trades > 0
-        else 0,
-    )
-    best_profit_factor_threshold = max(
-        results.keys(), key=lambda k: results[k].profit_factor
+    # 各門檻指標疊成陣列：欄位依序為 總點數、最大回撤、勝率、獲利因子
+    # （無交易的門檻 win_rate 維持 0）
+    metrics = np.array(
+        [
+            [r.total_pnl_points, r.max_drawdown, r.win_rate, r.profit_factor]
+            for r in results
+        ]
     )
+    best_profit = int(metrics[:, 0].argmax())
+    best_drawdown = int(metrics[:, 1].argmin())
+    best_winrate = int(metrics[:, 2].argmax())
+    best_profit_factor = int(metrics[:, 3].argmax())
 
     print(
-        f"\n✨ 最高總利潤：門檻 {best_profit_threshold:.1f} ({results[best_profit_threshold].total_pnl_points:.1f} 點)"
+        f"\n✨ 最高總利潤：門檻 {thresholds[best_profit]:.1f} ({results[best_profit].total_pnl_points:.1f} 點)"
     )
     print(
-        f"✨ 最低回撤：門檻 {best_drawdown_threshold:.1f} ({results[best_drawdown_threshold].max_drawdown:,.0f} TWD)"
+        f"✨ 最低回撤：門檻 {thresholds[best_drawdown]:.1f} ({results[best_drawdown].max_drawdown:,.0f} TWD)"
     )
     print(
-        f"✨ 最高勝率：門檻 {best_winrate_threshold:.1f} "
-        f"({results[best_winrate_threshold].winning_trades / results[best_winrate_threshold].total_trades * 100:.2f}%)"
+        f"✨ 最高勝率：門檻 {thresholds[best_winrate]:.1f} "
+        f"({results[best_winrate].winning_trades / results[best_winrate].total_trades * 100:.2f}%)"
     )
     print(
-        f"✨ 最高獲利因子：門檻 {best_profit_factor_threshold:.1f} ({results[best_profit_factor_threshold].profit_factor:.2f})"
+        f"✨ 最高獲利因子：門檻 {thresholds[best_profit_factor]:.1f} ({results[best_profit_factor].profit_factor:.2f})"
     )
 
     # 分析快速停損（FS）的效果
     print("\n" + "=" * 80)
     print("⚡ 快速停損（FS）效果分析")
     print("=" * 80)
-    for threshold in thresholds:
-        result = results[threshold]
-        fs_count = sum(1 for trade in result.trades if trade.exit_reason.value == "FS")
+    for threshold, result in zip(thresholds, results, strict=True):
+        exits = result.summarize_exits()
+        fs_count, fs_pnl = exits.get("FS", (0, 0.0))
         threshold_label = "無過濾" if threshold == 0.0 else f"{threshold:.1f}"
 
         print(f"\n門檻 {threshold_label}:")
         print(f"   FS 次數: {fs_count}")
         if fs_count > 0:
-            fs_pnl = sum(
-                trade.pnl_twd
-                for trade in result.trades
-                if trade.exit_reason.value == "FS"
-            )
             print(f"   FS 總盈虧: {fs_pnl:,.0f} TWD")
             print(f"   FS 平均虧損: {fs_pnl / fs_count:,.0f} TWD")
 
         # 統計 SL 次數和平均虧損
-        sl_count = sum(1 for trade in result.trades if trade.exit_reason.value == "SL")
+        sl_count, sl_pnl = exits.get("SL", (0, 0.0))
         if sl_count > 0:
-            sl_pnl = sum(
-                trade.pnl_twd
-                for trade in result.trades
-                if trade.exit_reason.value == "SL"
-            )
             print(f"   SL 次數: {sl_count}")
             print(f"   SL 總盈虧: {sl_pnl:,.0f} TWD")
             print(f"   SL 平均虧損: {sl_pnl / sl_count:,.0f} TWD")
@@ -206,28 +205,30 @@ def main():
     print("📊 門檻對比分析")
     print("=" * 80)
 
-    base_result = results[0.0]
+    base_result = results[thresholds.index(0.0)]
     print("\n以「無過濾」為基準的比較：")
     print(f"{'門檻':<10} {'總盈虧差異':<20} {'虧損差異':<20} {'FS次數差異':<15}")
     print("-" * 65)
 
-    for threshold in thresholds:
-        result = results[threshold]
+    for threshold, result in zip(thresholds, results, strict=True):
         threshold_label = "無過濾" if threshold == 0.0 else f"{threshold:.1f}"
 
         pnl_diff = result.total_pnl_twd - base_result.total_pnl_twd
         loss_diff = result.gross_loss - base_result.gross_loss
 
-        fs_count = sum(1 for trade in result.trades if trade.exit_reason.value == "FS")
-        base_fs_count = sum(
-            1 for trade in base_result.trades if trade.exit_reason.value == "FS"
-        )
+        fs_count = result.exit_stats(ExitReason.FAST_STOP)[0]
+        base_fs_count = base_result.exit_stats(ExitReason.FAST_STOP)[0]
         fs_diff = fs_count - base_fs_count
 
         print(
             f"{threshold_label:<10} {pnl_diff:>+19,.0f} {loss_diff:>+19,.0f} {fs_diff:>+14}"
         )
 
+    # 等待結果檔寫入完成
+    for future in save_futures:
+        future.result()
+    save_pool.shutdown()
+
     print("\n" + "=" * 80)
     print("✅ 所有回測完成！")
     print("=" * 80)
@@ -1,10 +1,15 @@
 """測試不同強死叉門檻的回測比較（前30天）"""
 
+import sys
+from dataclasses import replace
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from auto_trade.core.client import create_api_client
-from auto_trade.core.config import Config
-from auto_trade.models.backtest import BacktestConfig
+from auto_trade.core.config import get_config
+from auto_trade.models.backtest import BacktestConfig, BacktestResult
+from auto_trade.models.position_record import ExitReason
 from auto_trade.services.backtest_service import BacktestService
 from auto_trade.services.market_service import MarketService
 from auto_trade.services.strategy_service import StrategyService
@@ -14,7 +19,7 @@ def main():
     """執行不同強死叉門檻的回測比較（前30天）"""
 
     # 載入配置
-    config = Config()
+    config = get_config()
 
     # 建立API客戶端
     api_client = create_api_client(
@@ -60,7 +65,16 @@ def main():
         {"threshold": 3.0, "name": "門檻 3.0", "enable_fs": True},
         {"threshold": 5.0, "name": "門檻 5.0", "enable_fs": True},
     ]
-    results = {}
+
+    # 各測試的回測設定（快速停損的死叉過濾以加速度門檻設定）
+    backtest_configs = [
+        replace(
+            base_config,
+            enable_macd_fast_stop=test_config["enable_fs"],
+            min_acceleration_threshold=test_config["threshold"] or 0.0,
+        )
+        for test_config in test_configs
+    ]
 
     print("=" * 80)
     print("🔬 測試不同強死叉門檻的影響（前30天牛市階段）")
@@ -70,59 +84,15 @@ def main():
     )
     print()
 
-    for test_config in test_configs:
-        threshold = test_config["threshold"]
-        name = test_config["name"]
-        enable_fs = test_config["enable_fs"]
+    # 各測試彼此獨立，以多程序並行執行（K 線只取一次，同程序內共用 MACD）
+    names = [tc["name"] for tc in test_configs]
+    results: list[BacktestResult] = backtest_service.run_backtests(backtest_configs)
 
+    for name, result in zip(names, results, strict=True):
         print(f"\n{'=' * 80}")
         print(f"📊 測試: {name}")
         print(f"{'=' * 80}\n")
 
-        # 創建配置副本
-        config_copy = BacktestConfig(
-            symbol=base_config.symbol,
-            sub_symbol=base_config.sub_symbol,
-            timeframe=base_config.timeframe,
-            start_date=base_config.start_date,
-            end_date=base_config.end_date,
-            initial_capital=base_config.initial_capital,
-            order_quantity=base_config.order_quantity,
-            stop_loss_points=base_config.stop_loss_points,
-            start_trailing_stop_points=base_config.start_trailing_stop_points,
-            trailing_stop_points=base_config.trailing_stop_points,
-            trailing_stop_points_rate=base_config.trailing_stop_points_rate,
-            take_profit_points=base_config.take_profit_points,
-            take_profit_points_rate=base_config.take_profit_points_rate,
-            enable_trailing_stop=base_config.enable_trailing_stop,
-            enable_take_profit=base_config.enable_take_profit,
-            enable_macd_fast_stop=enable_fs,
-        )
-
-        # 如果啟用 FS，暫時修改 strategy_service 的 check_death_cross 行為
-        if enable_fs and threshold is not None:
-            original_check_death_cross = strategy_service.check_death_cross
-
-            def check_death_cross_with_threshold(macd_list, min_strength=None):
-                """包裝原始方法，使用測試門檻"""
-                if threshold == 0.0:
-                    # 無門檻，所有死叉都返回 True
-                    return original_check_death_cross(macd_list, min_strength=None)
-                else:
-                    # 使用指定門檻
-                    return original_check_death_cross(macd_list, min_strength=threshold)
-
-            # 替換方法
-            strategy_service.check_death_cross = check_death_cross_with_threshold
-
-        # 運行回測
-        result = backtest_service.run_backtest(config_copy)
-        results[name] = result
-
-        # 恢復原始方法
-        if enable_fs and threshold is not None:
-            strategy_service.check_death_cross = original_check_death_cross
-
         # 顯示簡要結果
         print(f"\n📈 結果摘要（{name}）:")
         print(f"   總交易次數: {result.total_trades}")
@@ -136,27 +106,23 @@ def main():
         print(f"   盈虧比: {result.profit_factor:.2f}")
 
         # 統計不同退出原因的次數
-        exit_reasons = {}
-        for trade in result.trades:
-            reason = trade.exit_reason.value if trade.exit_reason else "Unknown"
-            exit_reasons[reason] = exit_reasons.get(reason, 0) + 1
+        exit_summary = result.summarize_exits()
 
         print("   退出原因統計:")
-        for reason, count in sorted(exit_reasons.items()):
+        for reason, (count, _) in sorted(exit_summary.items()):
             print(f"      {reason}: {count}")
 
     # 比較結果
     print("\n" + "=" * 80)
     print("📊 比較總結（前30天牛市階段）")
     print("=" * 80)
-    print(
-        f"\n{'策略':<20} {'交易':<8} {'獲利/虧損':<12} {'勝率':<10} {'總盈虧':<15} {'總獲利':<15} {'總虧損':<15} {'回撤':<10} {'盈虧比':<8}"
-    )
-    print("-" * 140)
+    table = [
+        f"\n{'策略':<20} {'交易':<8} {'獲利/虧損':<12} {'勝率':<10} {'總盈虧':<15} {'總獲利':<15} {'總虧損':<15} {'回撤':<10} {'盈虧比':<8}",
+        "-" * 140,
+    ]
 
-    for name in [tc["name"] for tc in test_configs]:
-        result = results[name]
-        print(
+    for name, result in zip(names, results, strict=True):
+        table.append(
             f"{name:<20} {result.total_trades:<8} "
             f"{result.winning_trades}/{result.losing_trades:<10} "
             f"{result.win_rate:<9.2f}% "
@@ -166,10 +132,17 @@ def main():
             f"{result.max_drawdown:<9.2f}% "
             f"{result.profit_factor:<8.2f}"
         )
+    sys.stdout.write("\n".join(table) + "\n")
 
     # 找出最佳策略
-    best_name = max(results.keys(), key=lambda n: results[n].total_pnl_twd)
-    best_result = results[best_name]
+    pnls = np.fromiter(
+        (result.total_pnl_twd for result in results),
+        dtype=np.float64,
+        count=len(results),
+    )
+    best_index = int(pnls.argmax())
+    best_name = names[best_index]
+    best_result = results[best_index]
 
     print("\n" + "=" * 80)
     print(f"🏆 最佳策略: {best_name}")
@@ -183,15 +156,9 @@ def main():
     print("\n" + "=" * 80)
     print("⚡ 快速停損（FS）效果分析")
     print("=" * 80)
-    for name in [tc["name"] for tc in test_configs]:
-        result = results[name]
-        fs_count = sum(1 for trade in result.trades if trade.exit_reason.value == "FS")
+    for name, result in zip(names, results, strict=True):
+        fs_count, fs_pnl = result.exit_stats(ExitReason.FAST_STOP)
         if fs_count > 0:
-            fs_pnl = sum(
-                trade.pnl_twd
-                for trade in result.trades
-                if trade.exit_reason.value == "FS"
-            )
             print(f"\n{name}:")
             print(f"   FS 次數: {fs_count}")
             print(f"   FS 總盈虧: {fs_pnl:,.0f} TWD")
@@ -201,9 +168,9 @@ def main():
             print("   無 FS 觸發")
 
     # 比較無過濾 FS vs 原始版本
-    if "無過濾 FS" in results and "原始版本（無 FS）" in results:
-        fs_result = results["無過濾 FS"]
-        orig_result = results["原始版本（無 FS）"]
+    if "無過濾 FS" in names and "原始版本（無 FS）" in names:
+        fs_result = results[names.index("無過濾 FS")]
+        orig_result = results[names.index("原始版本（無 FS）")]
 
         print("\n" + "=" * 80)
         print("📊 無過濾 FS vs 原始版本（無 FS）詳細比較")
@@ -1,10 +1,15 @@
 """測試不同強死叉門檻的回測比較（最近30天盤整期）"""
 
+import sys
+from dataclasses import replace
 from datetime import datetime, timedelta
 
+import numpy as np
+
 from auto_trade.core.client import create_api_client
-from auto_trade.core.config import Config
-from auto_trade.models.backtest import BacktestConfig
+from auto_trade.core.config import get_config
+from auto_trade.models.backtest import BacktestConfig, BacktestResult
+from auto_trade.models.position_record import ExitReason
 from auto_trade.services.backtest_service import BacktestService
 from auto_trade.services.market_service import MarketService
 from auto_trade.services.strategy_service import StrategyService
@@ -14,7 +19,7 @@ def main():
     """執行不同強死叉門檻的回測比較（最近30天盤整期）"""
 
     # 載入配置
-    config = Config()
+    config = get_config()
 
     # 建立API客戶端
     api_client = create_api_client(
@@ -53,9 +58,12 @@ def main():
         enable_macd_fast_stop=True,
     )
 
-    # 測試不同的強死叉門檻
+    # 測試不同的強死叉門檻（以死叉加速度門檻過濾快速停損）
     thresholds = [0.0, 1.0, 2.0, 3.0]
-    results = {}
+    configs = [
+        replace(base_config, min_acceleration_threshold=threshold)
+        for threshold in thresholds
+    ]
 
     print("=" * 80)
     print("🔬 測試不同強死叉門檻的影響（最近30天盤整震盪期）")
@@ -65,7 +73,10 @@ def main():
     )
     print()
 
-    for threshold in thresholds:
+    # 各門檻彼此獨立，以多程序並行執行（K 線只取一次，同程序內共用 MACD）
+    results: list[BacktestResult] = backtest_service.run_backtests(configs)
+
+    for threshold, result in zip(thresholds, results, strict=True):
         print(f"\n{'=' * 80}")
         if threshold == 0.0:
             print(f"📊 測試門檻: {threshold}（無過濾，所有死叉都觸發快速停損）")
@@ -73,28 +84,6 @@ def main():
             print(f"📊 測試門檻: {threshold}")
         print(f"{'=' * 80}\n")
 
-        # 暫時修改 strategy_service 的 check_death_cross 行為
-        original_check_death_cross = strategy_service.check_death_cross
-
-        def check_death_cross_with_threshold(macd_list, min_strength=None):
-            """包裝原始方法，使用測試門檻"""
-            if threshold == 0.0:
-                # 無門檻，所有死叉都返回 True
-                return original_check_death_cross(macd_list, min_strength=None)
-            else:
-                # 使用指定門檻
-                return original_check_death_cross(macd_list, min_strength=threshold)
-
-        # 替換方法
-        strategy_service.check_death_cross = check_death_cross_with_threshold
-
-        # 運行回測
-        result = backtest_service.run_backtest(base_config)
-        results[threshold] = result
-
-        # 恢復原始方法
-        strategy_service.check_death_cross = original_check_death_cross
-
         # 顯示簡要結果
         print(f"\n📈 結果摘要（門檻 {threshold}）:")
         print(f"   總交易次數: {result.total_trades}")
@@ -109,28 +98,24 @@ def main():
         print(f"   平均持倉時間: {result.avg_trade_duration_hours:.1f} 小時")
 
         # 統計不同退出原因的次數
-        exit_reasons = {}
-        for trade in result.trades:
-            reason = trade.exit_reason.value if trade.exit_reason else "Unknown"
-            exit_reasons[reason] = exit_reasons.get(reason, 0) + 1
+        exit_summary = result.summarize_exits()
 
         print("   退出原因統計:")
-        for reason, count in sorted(exit_reasons.items()):
+        for reason, (count, _) in sorted(exit_summary.items()):
             print(f"      {reason}: {count}")
 
     # 比較結果
     print("\n" + "=" * 80)
     print("📊 不同門檻比較總結（盤整震盪期）")
     print("=" * 80)
-    print(
-        f"\n{'門檻':<10} {'交易':<8} {'獲利/虧損':<12} {'勝率':<10} {'總盈虧':<15} {'總獲利':<15} {'總虧損':<15} {'回撤':<10} {'盈虧比':<8}"
-    )
-    print("-" * 130)
+    table = [
+        f"\n{'門檻':<10} {'交易':<8} {'獲利/虧損':<12} {'勝率':<10} {'總盈虧':<15} {'總獲利':<15} {'總虧損':<15} {'回撤':<10} {'盈虧比':<8}",
+        "-" * 130,
+    ]
 
-    for threshold in thresholds:
-        result = results[threshold]
+    for threshold, result in zip(thresholds, results, strict=True):
         threshold_label = f"{threshold:.1f}" if threshold > 0 else "無過濾"
-        print(
+        table.append(
             f"{threshold_label:<10} {result.total_trades:<8} "
             f"{result.winning_trades}/{result.losing_trades:<10} "
             f"{result.win_rate:<9.2f}% "
@@ -140,10 +125,17 @@ def main():
             f"{result.max_drawdown:<9.2f}% "
             f"{result.profit_factor:<8.2f}"
         )
+    sys.stdout.write("\n".join(table) + "\n")
 
     # 找出最佳門檻
-    best_threshold = max(results.keys(), key=lambda t: results[t].total_pnl_twd)
-    best_result = results[best_threshold]
+    pnls = np.fromiter(
+        (result.total_pnl_twd for result in results),
+        dtype=np.float64,
+        count=len(results),
+    )
+    best_index = int(pnls.argmax())
+    best_threshold = thresholds[best_index]
+    best_result = results[best_index]
 
     print("\n" + "=" * 80)
     best_label = "無過濾" if best_threshold == 0.0 else f"{best_threshold}"
@@ -158,30 +150,20 @@ def main():
     print("\n" + "=" * 80)
     print("⚡ 快速停損（FS）效果分析")
     print("=" * 80)
-    for threshold in thresholds:
-        result = results[threshold]
-        fs_count = sum(1 for trade in result.trades if trade.exit_reason.value == "FS")
+    for threshold, result in zip(thresholds, results, strict=True):
+        exits = result.summarize_exits()
+        fs_count, fs_pnl = exits.get("FS", (0, 0.0))
         threshold_label = "無過濾" if threshold == 0.0 else f"{threshold:.1f}"
 
         print(f"\n門檻 {threshold_label}:")
         print(f"   FS 次數: {fs_count}")
         if fs_count > 0:
-            fs_pnl = sum(
-                trade.pnl_twd
-                for trade in result.trades
-                if trade.exit_reason.value == "FS"
-            )
             print(f"   FS 總盈虧: {fs_pnl:,.0f} TWD")
             print(f"   FS 平均虧損: {fs_pnl / fs_count:,.0f} TWD")
 
         # 統計 SL 次數和平均虧損
-        sl_count = sum(1 for trade in result.trades if trade.exit_reason.value == "SL")
+        sl_count, sl_pnl = exits.get("SL", (0, 0.0))
         if sl_count > 0:
-            sl_pnl = sum(
-                trade.pnl_twd
-                for trade in result.trades
-                if trade.exit_reason.value == "SL"
-            )
             print(f"   SL 次數: {sl_count}")
             print(f"   SL 總盈虧: {sl_pnl:,.0f} TWD")
             print(f"   SL 平均虧損: {sl_pnl / sl_count:,.0f} TWD")
@@ -191,22 +173,19 @@ def main():
     print("📊 門檻對比分析")
     print("=" * 80)
 
-    base_result = results[0.0]
+    base_result = results[thresholds.index(0.0)]
     print("\n以「無過濾」為基準的比較：")
     print(f"{'門檻':<10} {'總盈虧差異':<20} {'虧損差異':<20} {'FS次數差異':<15}")
     print("-" * 65)
 
-    for threshold in thresholds:
-        result = results[threshold]
+    for threshold, result in zip(thresholds, results, strict=True):
         threshold_label = "無過濾" if threshold == 0.0 else f"{threshold:.1f}"
 
         pnl_diff = result.total_pnl_twd - base_result.total_pnl_twd
         loss_diff = result.gross_loss - base_result.gross_loss
 
-        fs_count = sum(1 for trade in result.trades if trade.exit_reason.value == "FS")
-        base_fs_count = sum(
-            1 for trade in base_result.trades if trade.exit_reason.value == "FS"
-        )
+        fs_count = result.exit_stats(ExitReason.FAST_STOP)[0]
+        base_fs_count = base_result.exit_stats(ExitReason.FAST_STOP)[0]
         fs_diff = fs_count - base_fs_count
 
         print(
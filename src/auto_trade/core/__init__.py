@@ -1,5 +1,5 @@
 """Core functionality for auto trading system."""
 
-from .client import create_api_client, with_api_client
+from .client import create_api_client, reset_api_client_cache, with_api_client
 
-__all__ = ["create_api_client", "with_api_client"]
+__all__ = ["create_api_client", "reset_api_client_cache", "with_api_client"]
@@ -1,10 +1,28 @@
 """API client management."""
 
+import time
+
 import shioaji as sj
 
+# 已登入的 API 客戶端緩存，同一個 Python 程序內重複建立時直接沿用
+# key: 完整登入憑證與 simulation, value: (建立時間 monotonic, api_client)
+_API_CLIENT_CACHE: dict[tuple, tuple[float, sj.Shioaji]] = {}
+
+# 緩存有效時間（秒）
+API_CLIENT_CACHE_TTL = 3600
+
 
 def create_api_client(api_key, secret_key, ca_path=None, ca_passwd=None, simulation=True):
-    """純函數：建立API客戶端"""
+    """建立API客戶端（同一程序內一小時內重複呼叫會沿用已登入的客戶端）"""
+    cache_key = (api_key, secret_key, ca_path, ca_passwd, simulation)
+    cached = _API_CLIENT_CACHE.pop(cache_key, None)
+    if cached:
+        if time.monotonic() - cached[0] < API_CLIENT_CACHE_TTL:
+            _API_CLIENT_CACHE[cache_key] = cached
+            return cached[1]
+        # 緩存過期：先登出舊客戶端，避免連線與登入 session 殘留
+        _logout_api_client(cached[1])
+
     api = sj.Shioaji(simulation=simulation)
     api.login(api_key=api_key, secret_key=secret_key)
     if ca_path and ca_passwd:
@@ -12,9 +30,26 @@ def create_api_client(api_key, secret_key, ca_path=None, ca_passwd=None, simulat
             ca_path=ca_path,
             ca_passwd=ca_passwd,
         )
+
+    _API_CLIENT_CACHE[cache_key] = (time.monotonic(), api)
     return api
 
 
+def reset_api_client_cache():
+    """清除 API 客戶端緩存並登出，下次呼叫 create_api_client 會重新登入"""
+    for _, api in _API_CLIENT_CACHE.values():
+        _logout_api_client(api)
+    _API_CLIENT_CACHE.clear()
+
+
+def _logout_api_client(api):
+    """登出 API 客戶端，失敗時僅提示不中斷流程"""
+    try:
+        api.logout()
+    except Exception as e:
+        print(f"⚠️  登出 API 客戶端失敗: {e}")
+
+
 def with_api_client(api_func):
     """高階函數：將API客戶端注入到函數中"""
 
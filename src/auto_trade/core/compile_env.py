@@ -0,0 +1,50 @@
+"""將 .env 轉成 Python 模組
+
+部署時執行一次：python -m auto_trade.core.compile_env [.env 路徑]
+產生 auto_trade/core/_env_compiled.py 後，config 載入時直接 import 其中的值，
+不再解析 .env。修改 .env 後需重新執行；刪除產生的檔案即回到讀取 .env。
+產生的檔案含 API 金鑰等敏感資訊，已列入 .gitignore，請勿提交。
+"""
+
+import sys
+from pathlib import Path
+
+from dotenv import dotenv_values, find_dotenv
+
+COMPILED_ENV_FILE = Path(__file__).parent / "_env_compiled.py"
+
+
+def compile_env(env_path: str | None = None) -> Path:
+    """讀取 .env 並寫出 _env_compiled.py
+
+    Args:
+        env_path: .env 路徑（預設從目前目錄往上尋找）
+
+    Returns:
+        產生的模組路徑
+    """
+    env_path = env_path or find_dotenv(usecwd=True)
+    if not env_path:
+        raise FileNotFoundError("找不到 .env 檔案")
+
+    # 只有 key 沒有值的項目 dotenv 會給 None，load_dotenv 同樣不會設定
+    values = {
+        key: value
+        for key, value in dotenv_values(env_path).items()
+        if value is not None
+    }
+    lines = [
+        f'"""由 {Path(env_path).name} 產生（python -m auto_trade.core.compile_env），請勿手動修改"""',
+        "",
+        "ENV: dict[str, str] = {",
+        *(f"    {key!r}: {value!r}," for key, value in values.items()),
+        "}",
+        "",
+    ]
+    COMPILED_ENV_FILE.write_text("\n".join(lines), encoding="utf-8")
+    return COMPILED_ENV_FILE
+
+
+if __name__ == "__main__":
+    path = compile_env(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"✅ 已產生 {path}")
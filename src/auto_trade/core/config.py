@@ -1,67 +1,266 @@
 """Configuration management."""
 
+import hashlib
 import os
+import pickle
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import yaml
 from dotenv import load_dotenv
 
-load_dotenv(override=True)
+from auto_trade.utils import atomic_write
+
+# 優先使用 libyaml 的 C 實作解析器，未編譯 libyaml 時退回純 Python 版本
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+# 由已載入 .env 的程序啟動的子程序會繼承環境變數，以此標記略過重複讀取
+DOTENV_LOADED_ENV = "AUTO_TRADE_DOTENV_LOADED"
+# 重新載入模組時保留原本的狀態
+_DOTENV_LOADED: bool = globals().get("_DOTENV_LOADED", False)
+
+
+def _ensure_dotenv():
+    """讀取 .env（或其編譯後的模組）並覆寫環境變數（每個程序樹只執行一次）"""
+    global _DOTENV_LOADED
+
+    if _DOTENV_LOADED or os.environ.get(DOTENV_LOADED_ENV):
+        _DOTENV_LOADED = True
+        return
+
+    # 部署時若已用 compile_env 產生模組，直接套用其中的值，不再解析 .env
+    try:
+        from auto_trade.core._env_compiled import ENV
+    except ImportError:
+        load_dotenv(override=True)
+    else:
+        os.environ.update(ENV)
+    os.environ[DOTENV_LOADED_ENV] = "1"
+    _DOTENV_LOADED = True
+
+
+# 其他模組在 import 時即讀取環境變數，維持載入模組時就讀取 .env
+_ensure_dotenv()
+
+# 配置資料夾與策略配置檔路徑（import 時解析一次，符號連結也先轉成實際路徑，
+# 讓 YAML 緩存的 key 固定）
+CONFIG_DIR = Path(__file__).resolve().parents[3] / "config"
+STRATEGY_FILE = CONFIG_DIR / "strategy.yaml"
+
+# Config 快照緩存目錄（設定 AUTO_TRADE_CONFIG_CACHE=1 時使用，只保存 YAML 衍生的設定）
+CONFIG_CACHE_DIR = Path.home() / ".cache" / "auto_trade"
+
+# 策略 YAML 中不是策略名稱的頂層欄位
+_RESERVED_CONFIG_KEYS = frozenset({"active_strategy", "symbol"})
+
+# 已解析的 YAML：路徑 -> ((修改時間 ns, 檔案大小), 內容)
+# 檔案未變動時重複建立 Config 不再重新解析；每個路徑只保留最新一份
+_YAML_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+def _load_yaml_cached(path: Path) -> dict:
+    """讀取 YAML（檔案修改時間與大小未變時沿用上次解析結果，呼叫端不可修改內容）"""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = str(path)
+    cached = _YAML_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    # 一次讀入整個檔案再交給解析器，避免逐行讀取的 Python 回呼
+    data = yaml.load(path.read_bytes(), Loader=_SafeLoader)
+
+    _YAML_CACHE[key] = (stamp, data)
+    return data
+
+
+@dataclass(frozen=True, slots=True)
+class EnvSnapshot:
+    """Config 使用的環境變數快照"""
+
+    api_key: str
+    secret_key: str
+    ca_cert_path: str
+    ca_password: str
+    simulation: bool
+    google_credentials_path: str | None
+    google_spreadsheet_name: str | None
+
+
+@lru_cache(maxsize=1)
+def _env_snapshot() -> EnvSnapshot:
+    """讀取環境變數快照（同一程序只讀取一次）"""
+    _ensure_dotenv()
+    return EnvSnapshot(
+        api_key=os.environ.get("API_KEY", "test_key"),
+        secret_key=os.environ.get("SECRET_KEY", "test_secret"),
+        ca_cert_path=os.environ.get("CA_CERT_PATH", "credentials/Sinopac.pfx"),
+        ca_password=os.environ.get("CA_PASSWORD", "test_password"),
+        simulation=os.environ.get("SIMULATION", "true").lower() == "true",
+        google_credentials_path=os.environ.get("GOOGLE_CREDENTIALS_PATH"),
+        google_spreadsheet_name=os.environ.get("GOOGLE_SPREADSHEET_NAME"),
+    )
 
 
 class Config:
     """統一配置管理類別 - 整合環境變數和 YAML 配置"""
 
+    # 環境變數衍生的欄位
+    _ENV_FIELDS = (
+        "api_key",
+        "secret_key",
+        "ca_cert_path",
+        "ca_password",
+        "simulation",
+        "google_credentials_path",
+        "google_spreadsheet_name",
+    )
+    # YAML 衍生的交易設定欄位（load_cached 快照的內容）
+    _TRADING_FIELDS = (
+        "symbol",
+        "sub_symbol",
+        "symbol_name",
+        "order_quantity",
+        "timeframe",
+        "stop_loss_points",
+        "stop_loss_points_rate",
+        "start_trailing_stop_points",
+        "trailing_stop_points",
+        "take_profit_points",
+        "trailing_stop_points_rate",
+        "take_profit_points_rate",
+        "signal_check_interval",
+        "position_check_interval",
+        "strategy_name",
+        "available_strategies",
+    )
+    __slots__ = _ENV_FIELDS + _TRADING_FIELDS + ("_trading_loaded", "_repr_cache")
+
     def __init__(self):
         """初始化配置
 
         配置會從以下來源載入：
         1. 環境變數（.env）- API 金鑰等敏感資訊
         2. YAML 配置檔（config/strategies.yaml）- 交易策略和商品設定
+           （第一次存取交易設定時才讀取，只需要 API 金鑰時不解析 YAML）
         """
         # === 環境配置（從 .env 讀取）===
-        # Shioaji API 設定
-        self.api_key: str = os.environ.get("API_KEY", "test_key")
-        self.secret_key: str = os.environ.get("SECRET_KEY", "test_secret")
-        self.ca_cert_path: str = os.environ.get(
-            "CA_CERT_PATH", "credentials/Sinopac.pfx"
+        self._load_env_config()
+
+        # === 交易策略配置（從 YAML 讀取，延後到第一次存取）===
+        self._trading_loaded = False
+        self._repr_cache: str | None = None
+
+    def __getattr__(self, name: str):
+        """交易設定欄位尚未載入時，先讀取 YAML 再返回"""
+        if name in Config._TRADING_FIELDS and not self._trading_loaded:
+            self._load_trading_config()
+            return getattr(self, name)
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
         )
-        self.ca_password: str = os.environ.get("CA_PASSWORD", "test_password")
-        self.simulation: bool = os.environ.get("SIMULATION", "true").lower() == "true"
+
+    @classmethod
+    def load_cached(cls) -> "Config":
+        """建立 Config，設定 AUTO_TRADE_CONFIG_CACHE=1 時使用磁碟快照
+
+        快照以 strategy.yaml 內容雜湊命名，只保存 YAML 衍生的交易設定；
+        環境變數（含 API 金鑰）每次即時讀取，不寫入磁碟。
+        未啟用時等同 Config()，開發時修改 YAML 立即生效。
+        """
+        if os.environ.get("AUTO_TRADE_CONFIG_CACHE") != "1":
+            return cls()
+
+        config = cls.__new__(cls)
+        config._load_env_config()
+        config._trading_loaded = True
+        config._repr_cache = None
+
+        digest = hashlib.blake2b(STRATEGY_FILE.read_bytes(), digest_size=16).hexdigest()
+        cache_path = CONFIG_CACHE_DIR / f"config.{digest}.pkl"
+        try:
+            trading_config = pickle.loads(cache_path.read_bytes())
+        except Exception:
+            trading_config = None
+        # 欄位與目前版本不同的舊快照視為未命中
+        if trading_config is not None and set(trading_config) != set(
+            cls._TRADING_FIELDS
+        ):
+            trading_config = None
+
+        if trading_config is None:
+            config._load_trading_config()
+            trading_config = {
+                name: getattr(config, name) for name in cls._TRADING_FIELDS
+            }
+            data = pickle.dumps(trading_config, protocol=pickle.HIGHEST_PROTOCOL)
+            try:
+                atomic_write(cache_path, lambda tmp_path: tmp_path.write_bytes(data))
+            except OSError as e:
+                print(f"⚠️  寫入配置快照失敗: {e}")
+        else:
+            for name, value in trading_config.items():
+                setattr(config, name, value)
+
+        return config
+
+    def _load_env_config(self):
+        """載入環境配置（從 .env 讀取，同一程序共用一份快照）"""
+        env = _env_snapshot()
+
+        # Shioaji API 設定
+        self.api_key: str = env.api_key
+        self.secret_key: str = env.secret_key
+        self.ca_cert_path: str = env.ca_cert_path
+        self.ca_password: str = env.ca_password
+        self.simulation: bool = env.simulation
 
         # Google Sheets 設定（可選）
-        self.google_credentials_path: str | None = os.environ.get(
-            "GOOGLE_CREDENTIALS_PATH"
-        )
-        self.google_spreadsheet_name: str | None = os.environ.get(
-            "GOOGLE_SPREADSHEET_NAME"
-        )
+        self.google_credentials_path: str | None = env.google_credentials_path
+        self.google_spreadsheet_name: str | None = env.google_spreadsheet_name
+
+    @staticmethod
+    def invalidate_env_cache():
+        """清除環境變數快照（測試中修改環境變數後呼叫）"""
+        _env_snapshot.cache_clear()
 
-        # === 交易策略配置（從 YAML 讀取）===
-        self._load_trading_config()
+    @classmethod
+    def instance(cls) -> "Config":
+        """取得程序共用的 Config（等同 get_config()）"""
+        return get_config()
+
+    @classmethod
+    def reload(cls) -> "Config":
+        """清除共用 Config、YAML 與環境變數快照，重新載入後返回"""
+        get_config.cache_clear()
+        _YAML_CACHE.clear()
+        _env_snapshot.cache_clear()
+        return get_config()
 
     def _load_trading_config(self):
         """載入交易策略配置"""
-        # 找到 config 資料夾路徑
-        config_dir = Path(__file__).parent.parent.parent.parent / "config"
-        strategies_file = config_dir / "strategy.yaml"
-
-        # 載入完整配置
-        with open(strategies_file, encoding="utf-8") as f:
-            config_data = yaml.safe_load(f)
+        # 載入完整配置（只讀取，不修改內容）
+        config_data = _load_yaml_cached(STRATEGY_FILE)
 
         # 取得啟用的策略名稱
         active_strategy = config_data.get("active_strategy", "default")
 
-        # 取得所有可用的策略（排除 active_strategy 和 symbol）
-        available_strategies = [
-            k for k in config_data if k not in ["active_strategy", "symbol"]
-        ]
+        # 取得所有可用的策略（排除 active_strategy 和 symbol，保留 YAML 中的順序）
+        available_strategies = tuple(
+            k for k in config_data if k not in _RESERVED_CONFIG_KEYS
+        )
 
         # 驗證策略是否存在
-        if active_strategy not in available_strategies:
+        if (
+            active_strategy in _RESERVED_CONFIG_KEYS
+            or active_strategy not in config_data
+        ):
             raise ValueError(
-                f"策略 '{active_strategy}' 不存在。可用策略: {available_strategies}"
+                f"策略 '{active_strategy}' 不存在。可用策略: {list(available_strategies)}"
             )
 
         # 載入啟用的策略配置
@@ -97,7 +296,8 @@ class Config:
 
         # 保存策略名稱和可用策略列表
         self.strategy_name: str = active_strategy
-        self.available_strategies: list[str] = available_strategies
+        self.available_strategies: tuple[str, ...] = available_strategies
+        self._trading_loaded = True
 
     @property
     def is_production(self) -> bool:
@@ -123,7 +323,17 @@ class Config:
         }
 
     def __repr__(self) -> str:
-        """返回配置摘要"""
+        """返回配置摘要（建立後內容不變，只組一次字串）"""
+        if self._repr_cache is None:
+            self._repr_cache = self._build_repr()
+        return self._repr_cache
+
+    def _invalidate_repr(self):
+        """修改設定後呼叫，下次 repr 重新組字串"""
+        self._repr_cache = None
+
+    def _build_repr(self) -> str:
+        """組出配置摘要字串"""
         trailing_stop_display = (
             f"{self.trailing_stop_points_rate * 100}%"
             if self.trailing_stop_points_rate is not None
@@ -151,6 +361,15 @@ class Config:
         )
 
 
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """取得共用的 Config（同一程序內只讀取一次 .env 與 YAML）
+
+    Config 建立後不應再修改；需要最新 YAML 內容時請呼叫 Config.reload()。
+    """
+    return Config.load_cached()
+
+
 if __name__ == "__main__":
     config = Config()
     print(config.api_key)
@@ -1,7 +1,7 @@
 import os
 
 from auto_trade.core.client import create_api_client
-from auto_trade.core.config import Config
+from auto_trade.core.config import get_config
 from auto_trade.services.account_service import AccountService
 from auto_trade.services.line_bot_service import LineBotService
 from auto_trade.services.market_service import MarketService
@@ -14,7 +14,7 @@ def main():
     """主程式入口"""
     # 載入統一配置（環境變數 + 交易策略）
     # 策略選擇在 config/strategies.yaml 的 active_strategy 中設定
-    config = Config()
+    config = get_config()
 
     # 顯示配置摘要
     print(config)
@@ -45,6 +45,7 @@ def main():
             channel_id=os.environ.get("LINE_CHANNEL_ID"),
             channel_secret=os.environ.get("LINE_CHANNEL_SECRET"),
             messaging_api_token=os.environ.get("LINE_MESSAGING_API_TOKEN"),
+            background=True,  # 通知不阻塞交易流程
         )
         print("✅ Line Bot 服務已啟用")
 
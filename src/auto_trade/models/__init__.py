@@ -6,6 +6,7 @@ from .backtest import (
     BacktestPosition,
     BacktestResult,
     BacktestTrade,
+    BacktestTradeArrays,
     PerformanceMetrics,
 )
 from .market import EMAData, EMAList, KBar, KBarList, MACDData, MACDList, Quote
@@ -14,6 +15,7 @@ from .order import (
     FuturesOrderRequest,
     FuturesOrderResult,
     FuturesTrade,
+    OrderEvent,
     OrderStatus,
 )
 from .position_record import ExitReason
@@ -39,6 +41,7 @@ __all__ = [
     "FuturesOrderResult",
     "FuturesTrade",
     "OrderStatus",
+    "OrderEvent",
     "Deal",
     # Strategy models
     "TradingSignal",
@@ -50,5 +53,6 @@ __all__ = [
     "BacktestPosition",
     "BacktestResult",
     "BacktestTrade",
+    "BacktestTradeArrays",
     "PerformanceMetrics",
 ]
@@ -3,9 +3,27 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+
 from auto_trade.models.account import Action
 from auto_trade.models.position_record import ExitReason
 
+# 出場原因整數代碼，索引即代碼（與回測模擬核心 backtest_kernel 的輸出一致）
+EXIT_REASON_ORDER: tuple[ExitReason, ...] = (
+    ExitReason.FAST_STOP,
+    ExitReason.TAKE_PROFIT,
+    ExitReason.TRAILING_STOP,
+    ExitReason.STOP_LOSS,
+    ExitReason.HOLD,
+)
+EXIT_REASON_CODES: dict[ExitReason, int] = {
+    reason: code for code, reason in enumerate(EXIT_REASON_ORDER)
+}
+# 出場原因代碼對應的字串（預先取出，避免逐筆存取 Enum.value）
+EXIT_REASON_VALUES: tuple[str, ...] = tuple(
+    reason.value for reason in EXIT_REASON_ORDER
+)
+
 
 def get_point_value(symbol: str) -> int:
     """根據商品代碼獲取每點價值"""
@@ -19,9 +37,9 @@ def get_point_value(symbol: str) -> int:
     return point_values.get(symbol, 50)  # 預設為50元
 
 
-@dataclass
+@dataclass(slots=True)
 class BacktestTrade:
-    """回測交易記錄"""
+    """回測交易記錄（每筆交易一個實例，以 __slots__ 省去 __dict__）"""
 
     trade_id: str
     symbol: str
@@ -57,6 +75,41 @@ class BacktestTrade:
         return pnl_points, pnl_twd
 
 
+@dataclass
+class BacktestTradeArrays:
+    """回測交易欄位陣列（SoA），供統計與彙總向量化計算"""
+
+    exit_reason_codes: np.ndarray  # int8，對應 EXIT_REASON_ORDER
+    pnl_points: np.ndarray  # float64
+    pnl_twd: np.ndarray  # float64
+    entry_times: np.ndarray  # datetime64[us]
+    exit_times: np.ndarray  # datetime64[us]
+
+    def __len__(self) -> int:
+        return len(self.exit_reason_codes)
+
+    @classmethod
+    def from_trades(cls, trades: list[BacktestTrade]) -> "BacktestTradeArrays":
+        """從已平倉的交易記錄建立欄位陣列"""
+        closed = [trade for trade in trades if trade.exit_price is not None]
+        return cls(
+            exit_reason_codes=np.array(
+                [EXIT_REASON_CODES[trade.exit_reason] for trade in closed],
+                dtype=np.int8,
+            ),
+            pnl_points=np.array(
+                [trade.pnl_points for trade in closed], dtype=np.float64
+            ),
+            pnl_twd=np.array([trade.pnl_twd for trade in closed], dtype=np.float64),
+            entry_times=np.array(
+                [trade.entry_time for trade in closed], dtype="datetime64[us]"
+            ),
+            exit_times=np.array(
+                [trade.exit_time for trade in closed], dtype="datetime64[us]"
+            ),
+        )
+
+
 @dataclass
 class BacktestPosition:
     """回測持倉狀態"""
@@ -91,9 +144,9 @@ class BacktestPosition:
                 self.trailing_stop_price = new_trailing_stop
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BacktestConfig:
-    """回測配置"""
+    """回測配置（不可變，調整參數請使用 dataclasses.replace）"""
 
     # 基本設定
     symbol: str
@@ -117,6 +170,7 @@ class BacktestConfig:
     macd_fast_period: int = 12
     macd_slow_period: int = 26
     macd_signal_period: int = 9
+    min_golden_cross_strength: float = 0.0  # 進場金叉強度門檻（0.0 = 不過濾）
 
     # 回測設定
     max_positions: int = 1  # 最大同時持倉數
@@ -137,6 +191,10 @@ class BacktestResult:
     config: BacktestConfig
     trades: list[BacktestTrade] = field(default_factory=list)
     equity_curve: list[tuple[datetime, float]] = field(default_factory=list)
+    # 交易欄位陣列（與 trades 對應），未提供時由 get_trade_arrays() 依 trades 建立
+    trade_arrays: BacktestTradeArrays | None = field(default=None, repr=False)
+    # 權益數值陣列（與 equity_curve 對應），未提供時由 equity_curve 建立
+    equity_values: np.ndarray | None = field(default=None, repr=False)
 
     # 基本統計
     total_trades: int = 0
@@ -161,43 +219,39 @@ class BacktestResult:
     backtest_duration_days: int = 0
     avg_trade_duration_hours: float = 0.0
 
-    def calculate_statistics(self):
-        """計算統計指標"""
+    # 上次計算統計時的 (交易數, 權益曲線長度)，資料未變動時不重複計算
+    _stats_key: tuple[int, int] | None = field(default=None, init=False, repr=False)
+
+    def calculate_statistics(self, force: bool = False):
+        """計算統計指標（交易與權益曲線未變動時直接沿用上次結果）"""
         if not self.trades:
             return
 
-        # 重置計數器（避免重複調用時累加）
-        self.total_trades = 0
-        self.winning_trades = 0
-        self.losing_trades = 0
-        self.total_pnl_twd = 0.0
-        self.total_pnl_points = 0.0
-        self.profit_factor = 0.0
+        stats_key = (len(self.trades), len(self.equity_curve))
+        if not force and stats_key == self._stats_key:
+            return
 
         self.total_trades = len(self.trades)
 
-        # 計算盈虧
-        profits = []
-        losses = []
-
-        for trade in self.trades:
-            if trade.exit_price is not None:
-                trade.calculate_pnl()
-                if trade.pnl_twd > 0:
-                    profits.append(trade.pnl_twd)
-                    self.winning_trades += 1
-                else:
-                    losses.append(trade.pnl_twd)
-                    self.losing_trades += 1
+        # 以欄位陣列計算盈虧（沒有對應的陣列時先重算各筆盈虧再建立）
+        if self.trade_arrays is None or len(self.trade_arrays) != len(self.trades):
+            for trade in self.trades:
+                if trade.exit_price is not None:
+                    trade.calculate_pnl()
+        arrays = self.get_trade_arrays()
+        pnl_twd = arrays.pnl_twd
+        wins = pnl_twd > 0
 
-                self.total_pnl_twd += trade.pnl_twd
-                self.total_pnl_points += trade.pnl_points
+        self.winning_trades = int(np.count_nonzero(wins))
+        self.losing_trades = len(pnl_twd) - self.winning_trades
+        self.total_pnl_twd = float(pnl_twd.sum())
+        self.total_pnl_points = float(arrays.pnl_points.sum())
 
         self.win_rate = (
             self.winning_trades / self.total_trades if self.total_trades > 0 else 0.0
         )
-        self.gross_profit = sum(profits) if profits else 0.0
-        self.gross_loss = abs(sum(losses)) if losses else 0.0
+        self.gross_profit = float(pnl_twd[wins].sum())
+        self.gross_loss = abs(float(pnl_twd[~wins].sum()))
 
         # 計算盈虧比
         self.profit_factor = (
@@ -216,53 +270,83 @@ class BacktestResult:
         # 計算平均持倉時間
         self._calculate_avg_trade_duration()
 
+        self._stats_key = stats_key
+
+    def invalidate_statistics(self):
+        """交易記錄在原地被修改後呼叫，下次 calculate_statistics 會重新計算"""
+        self._stats_key = None
+        self.trade_arrays = None
+        self.equity_values = None
+
+    def get_trade_arrays(self) -> BacktestTradeArrays:
+        """取得交易欄位陣列（必要時依 trades 重新建立）"""
+        if self.trade_arrays is None or len(self.trade_arrays) != len(self.trades):
+            self.trade_arrays = BacktestTradeArrays.from_trades(self.trades)
+        return self.trade_arrays
+
+    def summarize_exits(self) -> dict[str, tuple[int, float]]:
+        """依出場原因彙總交易次數與盈虧（以欄位陣列 bincount 計算）
+
+        Returns:
+            {出場原因代碼: (次數, 總盈虧 TWD)}，例如 {"FS": (3, -24000.0)}
+        """
+        arrays = self.get_trade_arrays()
+        size = len(EXIT_REASON_ORDER)
+        counts = np.bincount(arrays.exit_reason_codes, minlength=size)
+        pnls = np.bincount(
+            arrays.exit_reason_codes, weights=arrays.pnl_twd, minlength=size
+        )
+
+        return {
+            value: (int(counts[code]), float(pnls[code]))
+            for code, value in enumerate(EXIT_REASON_VALUES)
+            if counts[code] > 0
+        }
+
+    def exit_stats(self, reason: ExitReason) -> tuple[int, float]:
+        """單一出場原因的交易次數與總盈虧（布林遮罩，不建立完整彙總）"""
+        arrays = self.get_trade_arrays()
+        mask = arrays.exit_reason_codes == EXIT_REASON_CODES[reason]
+        return int(mask.sum()), float(arrays.pnl_twd[mask].sum())
+
+    def _equity_values(self) -> np.ndarray:
+        """權益曲線的權益數值陣列（必要時依 equity_curve 重新建立）"""
+        if self.equity_values is None or len(self.equity_values) != len(
+            self.equity_curve
+        ):
+            self.equity_values = np.fromiter(
+                (equity for _, equity in self.equity_curve),
+                dtype=np.float64,
+                count=len(self.equity_curve),
+            )
+        return self.equity_values
+
     def _calculate_max_drawdown(self):
         """計算最大回撤"""
         if not self.equity_curve:
             return
 
-        peak = self.equity_curve[0][1]
-        max_dd = 0.0
-        dd_duration = 0
-        current_dd_duration = 0
-
-        for _, equity in self.equity_curve:
-            if equity > peak:
-                peak = equity
-                current_dd_duration = 0
-            else:
-                drawdown = (peak - equity) / peak
-                if drawdown > max_dd:
-                    max_dd = drawdown
-                current_dd_duration += 1
-                if current_dd_duration > dd_duration:
-                    dd_duration = current_dd_duration
-
-        self.max_drawdown = max_dd
-        self.max_drawdown_duration = dd_duration
+        equity = self._equity_values()
+        peak = np.maximum.accumulate(equity)
 
-    def _calculate_sharpe_ratio(self):
-        """計算夏普比率"""
-        if len(self.equity_curve) < 2:
-            return
+        # 回撤比例（創新高的點為 0）
+        self.max_drawdown = max(float(((peak - equity) / peak).max()), 0.0)
 
-        returns = []
-        for i in range(1, len(self.equity_curve)):
-            prev_equity = self.equity_curve[i - 1][1]
-            curr_equity = self.equity_curve[i][1]
-            if prev_equity > 0:
-                returns.append((curr_equity - prev_equity) / prev_equity)
+        # 回撤持續時間：兩次創新高之間連續未創新高的點數
+        new_high = np.empty(len(equity), dtype=np.bool_)
+        new_high[0] = False
+        new_high[1:] = equity[1:] > peak[:-1]
+        bounds = np.concatenate(([-1], np.flatnonzero(new_high), [len(equity)]))
+        self.max_drawdown_duration = int((np.diff(bounds) - 1).max())
 
-        if not returns:
+    def _calculate_sharpe_ratio(self):
+        """計算夏普比率（單次走訪權益曲線）"""
+        if len(self.equity_curve) < 2:
             return
 
-        import statistics
-
-        mean_return = statistics.mean(returns)
-        std_return = statistics.stdev(returns)
+        from auto_trade.utils.backtest_kernel import equity_sharpe_ratio
 
-        if std_return > 0:
-            self.sharpe_ratio = mean_return / std_return
+        self.sharpe_ratio = float(equity_sharpe_ratio(self._equity_values()))
 
     def _calculate_calmar_ratio(self):
         """計算卡爾瑪比率"""
@@ -271,19 +355,14 @@ class BacktestResult:
             self.calmar_ratio = annual_return / self.max_drawdown
 
     def _calculate_avg_trade_duration(self):
-        """計算平均持倉時間"""
-        durations = []
-        for trade in self.trades:
-            if trade.exit_time:
-                duration = (
-                    trade.exit_time - trade.entry_time
-                ).total_seconds() / 3600  # 小時
-                durations.append(duration)
-
-        if durations:
-            import statistics
-
-            self.avg_trade_duration_hours = statistics.mean(durations)
+        """計算平均持倉時間（以欄位陣列的進出場時間計算）"""
+        arrays = self.get_trade_arrays()
+        if len(arrays) == 0:
+            return
+
+        durations_us = (arrays.exit_times - arrays.entry_times).astype(np.int64)
+        durations_hours = durations_us / 1e6 / 3600
+        self.avg_trade_duration_hours = float(durations_hours.mean())
 
 
 @dataclass
@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+
 
 @dataclass
 class KBar:
@@ -95,21 +97,17 @@ class KBarList:
         """轉換為pandas DataFrame"""
         import pandas as pd
 
-        data = []
-        for kbar in self.kbars:
-            data.append(
-                {
-                    "time": kbar.time,
-                    "open": kbar.open,
-                    "high": kbar.high,
-                    "low": kbar.low,
-                    "close": kbar.close,
-                }
-            )
-
-        df = pd.DataFrame(data)
-        df.set_index("time", inplace=True)
-        return df
+        # 直接以欄位建立，避免先組出每根 K 線的 dict 再複製
+        kbars = self.kbars
+        return pd.DataFrame(
+            {
+                "open": [kbar.open for kbar in kbars],
+                "high": [kbar.high for kbar in kbars],
+                "low": [kbar.low for kbar in kbars],
+                "close": [kbar.close for kbar in kbars],
+            },
+            index=pd.Index([kbar.time for kbar in kbars], name="time"),
+        )
 
     @classmethod
     def from_dataframe(
@@ -204,18 +202,12 @@ class EMAList:
         """轉換為pandas DataFrame"""
         import pandas as pd
 
-        data = []
-        for ema in self.ema_data:
-            data.append(
-                {
-                    "time": ema.time,
-                    "ema_value": ema.ema_value,
-                }
-            )
-
-        df = pd.DataFrame(data)
-        df.set_index("time", inplace=True)
-        return df
+        # 直接以欄位建立，避免先組出每筆資料的 dict 再複製
+        ema_data = self.ema_data
+        return pd.DataFrame(
+            {"ema_value": [ema.ema_value for ema in ema_data]},
+            index=pd.Index([ema.time for ema in ema_data], name="time"),
+        )
 
     @classmethod
     def from_dataframe(
@@ -270,6 +262,10 @@ class MACDList:
     macd_data: list[MACDData] = field(default_factory=list)
     symbol: str = ""
     timeframe: str = "1m"
+    # 欄位陣列 (macd_line, signal_line, histogram)，由 get_columns() 依 macd_data 建立
+    _columns: tuple[np.ndarray, np.ndarray, np.ndarray] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __len__(self) -> int:
         """返回MACD資料數量"""
@@ -299,24 +295,62 @@ class MACDList:
         """取得最舊的MACD資料"""
         return self.macd_data[:count] if count > 0 else []
 
+    def get_columns(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """取得 (macd_line, signal_line, histogram) 欄位陣列（SoA）
+
+        資料筆數變動時才依 macd_data 重新建立，供向量化計算使用
+        """
+        n = len(self.macd_data)
+        if self._columns is None or len(self._columns[0]) != n:
+            self._columns = tuple(
+                np.fromiter(
+                    (getattr(macd, name) for macd in self.macd_data),
+                    dtype=np.float64,
+                    count=n,
+                )
+                for name in ("macd_line", "signal_line", "histogram")
+            )
+        return self._columns
+
     def to_dataframe(self) -> Any:
         """轉換為pandas DataFrame"""
         import pandas as pd
 
-        data = []
-        for macd in self.macd_data:
-            data.append(
-                {
-                    "time": macd.time,
-                    "macd_line": macd.macd_line,
-                    "signal_line": macd.signal_line,
-                    "histogram": macd.histogram,
-                }
-            )
+        # 直接以欄位陣列建立，避免先組出每筆資料的 dict 再複製
+        macd_line, signal_line, histogram = self.get_columns()
+        return pd.DataFrame(
+            {
+                "macd_line": macd_line,
+                "signal_line": signal_line,
+                "histogram": histogram,
+            },
+            index=pd.Index([macd.time for macd in self.macd_data], name="time"),
+        )
 
-        df = pd.DataFrame(data)
-        df.set_index("time", inplace=True)
-        return df
+    @classmethod
+    def from_arrays(
+        cls,
+        times: list[datetime],
+        macd_line: np.ndarray,
+        signal_line: np.ndarray,
+        histogram: np.ndarray,
+        symbol: str = "",
+        timeframe: str = "1m",
+    ) -> "MACDList":
+        """從欄位陣列創建MACDList（同時保留欄位陣列，不需再由物件重建）"""
+        macd_data = [
+            MACDData(time=time, macd_line=macd, signal_line=signal, histogram=hist)
+            for time, macd, signal, hist in zip(
+                times,
+                macd_line.tolist(),
+                signal_line.tolist(),
+                histogram.tolist(),
+                strict=True,
+            )
+        ]
+        macd_list = cls(macd_data=macd_data, symbol=symbol, timeframe=timeframe)
+        macd_list._columns = (macd_line, signal_line, histogram)
+        return macd_list
 
     @classmethod
     def from_dataframe(
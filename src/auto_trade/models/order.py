@@ -54,6 +54,15 @@ class Deal:
     time: datetime  # 成交時間
 
 
+@dataclass
+class OrderEvent:
+    """委託回報模型（由下單回報 callback 產生）"""
+
+    order_id: str  # 委託單ID
+    deal: Deal | None = None  # 成交資訊（成交回報時提供）
+    error: str | None = None  # 失敗或取消原因（委託被拒絕 / 取消時提供）
+
+
 @dataclass
 class OrderStatus:
     """委託狀態模型"""
@@ -114,9 +114,9 @@ class AccountService:
 
 if __name__ == "__main__":
     from auto_trade.core.client import create_api_client
-    from auto_trade.core.config import Config
+    from auto_trade.core.config import get_config
 
-    config = Config()
+    config = get_config()
     api_client = create_api_client(
         config.api_key,
         config.secret_key,
@@ -1,221 +1,308 @@
 """回測服務 - 整合所有回測功能"""
 
+import contextlib
+import hashlib
+import io
 import os
-import uuid
+import pickle
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
+from pathlib import Path
 
-from auto_trade.models import Action, ExitReason, KBarList, MACDList, TradingSignal
+import numpy as np
+
+from auto_trade.models import Action, KBarList
 from auto_trade.models.backtest import (
+    EXIT_REASON_ORDER,
+    EXIT_REASON_VALUES,
     BacktestConfig,
-    BacktestPosition,
     BacktestResult,
     BacktestTrade,
+    BacktestTradeArrays,
+    get_point_value,
 )
 from auto_trade.services.market_service import MarketService
 from auto_trade.services.strategy_service import StrategyService
-from auto_trade.utils import calculate_points
+from auto_trade.utils import atomic_write
+from auto_trade.utils.backtest_kernel import simulate_trades
+
+# 進場後至少需要保留的 K 棒數量（沿用原回測迴圈的 len(kbars) > i + 30 條件）
+MIN_BARS_AFTER_ENTRY = 30
+
+# 回測結果磁碟緩存（以 K 線內容與回測設定雜湊命名）
+RESULTS_CACHE_DIR = Path.home() / ".cache" / "auto_trade" / "backtest"
+# 回測邏輯或結果格式變更時遞增，使舊緩存失效
+RESULTS_CACHE_VERSION = 4
 
 
 class BacktestService:
     """回測服務 - 整合所有回測功能"""
 
     def __init__(
-        self, market_service: MarketService, strategy_service: StrategyService
+        self,
+        market_service: MarketService,
+        strategy_service: StrategyService,
+        verbose: bool = False,
     ):
+        """初始化回測服務
+
+        Args:
+            market_service: 市場數據服務
+            strategy_service: 策略服務
+            verbose: 是否逐筆印出開平倉明細（參數掃描時關閉以減少輸出）
+        """
         self.market_service = market_service
         self.strategy_service = strategy_service
+        self.verbose = verbose
+        # 本程序內已取得的 K 線數據，key 為 _data_key(config)
+        self._kbars_cache: dict[tuple, KBarList] = {}
+
+    def run_backtest(
+        self,
+        config: BacktestConfig,
+        kbars: KBarList | None = None,
+        use_cache: bool = False,
+    ) -> BacktestResult:
+        """執行回測
+
+        Args:
+            config: 回測設定
+            kbars: 已取得的 K 線數據（未提供時依 config 自行獲取）
+            use_cache: 是否使用回測結果磁碟緩存
+        """
+        return self.run_backtest_multi([config], kbars, use_cache=use_cache)[0]
+
+    def run_backtest_multi(
+        self,
+        configs: list[BacktestConfig],
+        kbars: KBarList | None = None,
+        use_cache: bool = False,
+    ) -> list[BacktestResult]:
+        """以同一份 K 線執行多組回測設定，結果順序與 configs 相同
+
+        K 線陣列、MACD、進場信號與死叉 / 金叉判斷只計算一次，
+        參數相同的設定直接共用，只有逐根模擬依各設定分別執行。
+
+        Args:
+            configs: 回測設定列表（商品、區間與時間尺度須相同）
+            kbars: 已取得的 K 線數據（未提供時依設定自行獲取）
+            use_cache: 是否使用回測結果磁碟緩存（K 線與設定相同時直接讀取上次結果）
+        """
+        if not configs:
+            return []
 
-    def run_backtest(self, config: BacktestConfig) -> BacktestResult:
-        """執行回測"""
-        print(f"🚀 開始回測: {config.symbol} ({config.start_date} - {config.end_date})")
+        first = configs[0]
+        if any(self._data_key(config) != self._data_key(first) for config in configs):
+            raise ValueError("同一批回測設定的商品、區間與時間尺度必須相同")
 
-        # 初始化回測結果
-        result = BacktestResult(config=config)
-        result.equity_curve.append((config.start_date, config.initial_capital))
+        print(f"🚀 開始回測: {first.symbol} ({first.start_date} - {first.end_date})")
 
         # 獲取歷史數據
-        kbars = self._get_historical_data(config)
+        if kbars is None:
+            kbars = self._get_historical_data(first)
         if not kbars:
             print("❌ 無法獲取歷史數據")
-            return result
+            return [self._new_result(config) for config in configs]
 
         print(f"📊 獲取到 {len(kbars)} 根K線數據")
 
-        # 如果啟用 MACD 快速停損，計算 MACD 指標
-        macd_list = None
-        if config.enable_macd_fast_stop:
-            macd_list = self.strategy_service.calculate_macd(
-                kbars,
-                config.macd_fast_period,
-                config.macd_slow_period,
-                config.macd_signal_period,
+        if use_cache:
+            return self._run_with_result_cache(
+                configs,
+                [kbars] * len(configs),
+                lambda misses, _: self.run_backtest_multi(misses, kbars),
             )
-            print("📈 計算 MACD 指標完成")
-
-        # 初始化狀態
-        current_position: BacktestPosition | None = None
-        current_equity = config.initial_capital
-        trade_counter = 0
-        is_in_macd_death_cross = False  # 記錄是否處於MACD死叉狀態（持續追蹤）
-
-        # 按時間順序處理每根K線
-        for i, kbar in enumerate(kbars):
-            current_time = kbar.time
-            current_price = kbar.close
-            current_high = kbar.high
-            current_low = kbar.low
-
-            # 回測不限制交易時間，處理所有數據
-
-            # 更新權益曲線
-            result.equity_curve.append((current_time, current_equity))
-
-            # 檢查持倉狀態
-            if current_position:
-                # 檢查是否需要平倉
-                exit_reason, exit_price_override = self._check_exit_conditions(
-                    current_position,
-                    kbar,
-                    current_high,
-                    current_low,
-                    config,
-                    macd_list,
-                    i,
-                    is_in_macd_death_cross,
-                )
 
-                # 如果平倉，重置死叉狀態
-                if exit_reason:
-                    is_in_macd_death_cross = False
-
-                if exit_reason:
-                    # 執行平倉
-                    trade = self._close_position(
-                        current_position,
-                        current_time,
-                        current_high,
-                        current_low,
-                        exit_reason,
-                        config,
-                        exit_price_override,
+        # 轉換為 NumPy 陣列，整段回測只轉換一次
+        # 模擬核心使用 float32 OHLC（期貨價格為整數點，可精確表示）
+        n = len(kbars)
+        ohlc, times = self._kbars_to_arrays(kbars)
+        opens, highs, lows, closes = np.ascontiguousarray(ohlc.T, dtype=np.float32)
+        # 時間同樣只轉換一次，各設定的交易時間陣列直接以索引取出
+        times64 = np.array(times, dtype="datetime64[us]")
+
+        # 一次算完整段 MACD（EMA 為因果計算，第 i 根只用到第 i 根為止的資料）
+        # MACD 以 float64 計算，與實際交易的指標數值一致
+        macd_closes = np.ascontiguousarray(ohlc[:, 3])
+        macd_by_periods = {
+            (12, 26, 9): self.strategy_service.calculate_macd_arrays(macd_closes)[:2]
+        }
+        entry_signals_cache: dict[float, np.ndarray] = {}
+        # 同一組 MACD 週期的死叉加速度與金叉只算一次，各門檻再由加速度篩選
+        crosses_cache: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+        death_crosses_cache: dict[tuple, np.ndarray] = {}
+        no_crosses = np.zeros(n, dtype=np.bool_)
+
+        results = []
+        for config in configs:
+            # 進場信號：預設參數 MACD 的金叉
+            strength_key = config.min_golden_cross_strength
+            if strength_key not in entry_signals_cache:
+                entry_signals_cache[strength_key] = self._generate_entry_signals(
+                    *macd_by_periods[(12, 26, 9)], config
+                )
+            entry_signals = entry_signals_cache[strength_key]
+
+            # 如果啟用 MACD 快速停損，計算死叉 / 金叉狀態
+            death_crosses = golden_crosses = no_crosses
+            if config.enable_macd_fast_stop:
+                fast_stop_periods = (
+                    config.macd_fast_period,
+                    config.macd_slow_period,
+                    config.macd_signal_period,
+                )
+                # 與進場參數相同時直接沿用
+                if fast_stop_periods not in macd_by_periods:
+                    macd_by_periods[fast_stop_periods] = (
+                        self.strategy_service.calculate_macd_arrays(
+                            macd_closes, *fast_stop_periods
+                        )[:2]
                     )
-                    result.trades.append(trade)
-
-                    # 更新權益
-                    current_equity += trade.pnl_twd
-
-                    # 清除持倉
-                    current_position = None
-                    print(
-                        f"📉 平倉: {trade.action.value} @ {trade.exit_price:.1f}, 盈虧: {trade.pnl_twd:.0f}"
+                min_accel = (
+                    config.min_acceleration_threshold
+                    if config.min_acceleration_threshold > 0
+                    else None
+                )
+                if fast_stop_periods not in crosses_cache:
+                    macd_line, signal_line = macd_by_periods[fast_stop_periods]
+                    crosses_cache[fast_stop_periods] = (
+                        self.strategy_service.calculate_death_cross_accelerations(
+                            macd_line, signal_line
+                        ),
+                        self.strategy_service.detect_golden_crosses(
+                            macd_line, signal_line
+                        ),
                     )
-                else:
-                    # 持續追蹤 MACD 死叉狀態
-                    if (
-                        config.enable_macd_fast_stop
-                        and not current_position.trailing_stop_active
-                        and macd_list is not None
-                        and i >= 2  # 需要至少 3 個數據點（使用 [-2] 和 [-3]）
-                    ):
-                        if current_position.action == Action.Buy:
-                            # 創建臨時 MACDList 用於檢測（包含到當前 K 棒）
-                            temp_macd_list = MACDList(
-                                macd_data=macd_list.macd_data[: i + 1],
-                                symbol=macd_list.symbol,
-                                timeframe=macd_list.timeframe,
-                            )
-
-                            # 使用 strategy_service 檢測強死叉（進入死叉狀態）
-                            # 使用 config.min_acceleration_threshold 作為門檻
-                            min_accel = (
-                                config.min_acceleration_threshold
-                                if config.min_acceleration_threshold > 0
-                                else None
-                            )
-                            if (
-                                not is_in_macd_death_cross
-                                and self.strategy_service.check_death_cross(
-                                    temp_macd_list, min_acceleration=min_accel
-                                )
-                            ):
-                                is_in_macd_death_cross = True
-                                current_macd = macd_list[i - 1]  # 使用 [-2] 位置的數據
-                                previous_macd = macd_list[i - 2]  # 使用 [-3] 位置的數據
-                                # 計算加速度
-                                acceleration = abs(
-                                    (current_macd.macd_line - current_macd.signal_line)
-                                    - (
-                                        previous_macd.macd_line
-                                        - previous_macd.signal_line
-                                    )
-                                )
-                                print(
-                                    f"🔴 強死叉確認（加速度 {acceleration:.2f}）- MACD:{current_macd.macd_line:.1f} < Signal:{current_macd.signal_line:.1f}，持續監控快速停損"
-                                )
-
-                            # 使用 strategy_service 檢測金叉（解除死叉狀態）
-                            elif (
-                                is_in_macd_death_cross
-                                and self.strategy_service.check_golden_cross(
-                                    temp_macd_list
-                                )
-                            ):
-                                is_in_macd_death_cross = False
-                                current_macd = macd_list[i - 1]  # 使用 [-2] 位置的數據
-                                print(
-                                    f"✅ MACD 金叉，解除死叉狀態 (MACD:{current_macd.macd_line:.1f} > Signal:{current_macd.signal_line:.1f})"
-                                )
-
-                    # 繼續更新移動停損等
-                    # 更新移動停損 (使用高點)
-                    if (
-                        config.enable_trailing_stop
-                        and current_position.trailing_stop_active
-                    ):
-                        trailing_stop_points = calculate_points(
-                            config.trailing_stop_points,
-                            config.trailing_stop_points_rate,
-                            current_position.entry_price,
+                accelerations, golden_crosses = crosses_cache[fast_stop_periods]
+                death_key = (fast_stop_periods, min_accel)
+                if death_key not in death_crosses_cache:
+                    death_crosses_cache[death_key] = (
+                        self.strategy_service.death_crosses_from_accelerations(
+                            accelerations, min_accel
                         )
-                        if current_position.action == Action.Buy:
-                            current_position.update_trailing_stop(
-                                current_high, trailing_stop_points
-                            )
-                        else:
-                            current_position.update_trailing_stop(
-                                current_low, trailing_stop_points
-                            )
-
-                    # 更新最大獲利/虧損 (使用高點和低點)
-                    if current_position.action == Action.Buy:
-                        profit_points = current_high - current_position.entry_price
-                    else:
-                        profit_points = current_position.entry_price - current_low
-
-                    current_position.max_profit_points = max(
-                        current_position.max_profit_points, profit_points
-                    )
-                    current_position.max_loss_points = min(
-                        current_position.max_loss_points, profit_points
                     )
+                death_crosses = death_crosses_cache[death_key]
+                print("📈 計算 MACD 指標完成")
+
+            trades = simulate_trades(
+                opens,
+                highs,
+                lows,
+                closes,
+                entry_signals,
+                death_crosses,
+                golden_crosses,
+                float(config.stop_loss_points),
+                float(config.take_profit_points),
+                self._rate_or_unset(config.take_profit_points_rate),
+                float(config.start_trailing_stop_points),
+                float(config.trailing_stop_points),
+                self._rate_or_unset(config.trailing_stop_points_rate),
+                config.enable_trailing_stop,
+                config.enable_take_profit,
+                config.enable_macd_fast_stop,
+            )
+            results.append(self._build_result(config, times, times64, *trades))
+
+        return results
+
+    @staticmethod
+    def _kbars_to_arrays(kbars: KBarList) -> tuple[np.ndarray, list[datetime]]:
+        """將 K 線轉為 (n, 4) 的 float64 OHLC 陣列與時間列表（只走訪 K 線物件一次）"""
+        times = []
+        rows = []
+        for kbar in kbars:
+            times.append(kbar.time)
+            rows.append((kbar.open, kbar.high, kbar.low, kbar.close))
+        return np.array(rows, dtype=np.float64).reshape(-1, 4), times
+
+    @staticmethod
+    def _new_result(config: BacktestConfig) -> BacktestResult:
+        """建立只含起始權益的回測結果"""
+        result = BacktestResult(config=config)
+        result.equity_curve.append((config.start_date, config.initial_capital))
+        return result
 
-            # 檢查開倉信號
-            if not current_position and len(kbars) > i + 30:  # 確保有足夠數據計算MACD
-                # 創建包含到當前時間的 KBarList
-                current_kbars = KBarList(
-                    kbars=kbars.kbars[: i + 1],
-                    symbol=kbars.symbol,
-                    timeframe=kbars.timeframe,
+    def _build_result(
+        self,
+        config: BacktestConfig,
+        times: list[datetime],
+        times64: np.ndarray,
+        entry_idx: np.ndarray,
+        exit_idx: np.ndarray,
+        entry_prices: np.ndarray,
+        exit_prices: np.ndarray,
+        reason_codes: np.ndarray,
+    ) -> BacktestResult:
+        """由模擬核心輸出的交易陣列建立回測結果"""
+        result = self._new_result(config)
+        n = len(times)
+
+        # 盈虧以欄位陣列一次計算（與 BacktestTrade.calculate_pnl 相同公式）
+        # 各筆交易共用的設定值先取為區域變數，建立交易記錄時不必重複讀取屬性
+        symbol = config.symbol
+        quantity = config.order_quantity
+        pnl_points = exit_prices - entry_prices
+        pnl_twd = pnl_points * quantity * get_point_value(symbol)
+        result.trade_arrays = BacktestTradeArrays(
+            exit_reason_codes=reason_codes,
+            pnl_points=pnl_points,
+            pnl_twd=pnl_twd,
+            entry_times=times64[entry_idx],
+            exit_times=times64[exit_idx],
+        )
+
+        # 建立交易記錄（模擬核心已預先配置並截斷交易陣列，此處一次建立完整列表）
+        # 交易編號依序遞增，相同設定與 K 線的回測結果完全一致
+        result.trades = [
+            BacktestTrade(
+                trade_id=f"{symbol}-{seq:06d}",
+                symbol=symbol,
+                action=Action.Buy,
+                entry_time=times[entry_i],
+                entry_price=entry_price,
+                exit_time=times[exit_i],
+                exit_price=exit_price,
+                quantity=quantity,
+                exit_reason=EXIT_REASON_ORDER[code],
+                pnl_points=points,
+                pnl_twd=twd,
+            )
+            for seq, entry_i, exit_i, entry_price, exit_price, code, points, twd in zip(
+                range(1, len(entry_idx) + 1),
+                entry_idx.tolist(),
+                exit_idx.tolist(),
+                entry_prices.tolist(),
+                exit_prices.tolist(),
+                reason_codes.tolist(),
+                pnl_points.tolist(),
+                pnl_twd.tolist(),
+                strict=True,
+            )
+        ]
+        if self.verbose and result.trades:
+            print(
+                "\n".join(
+                    f"📈 開倉: {trade.action.value} @ {trade.entry_price:.1f}\n"
+                    f"📉 平倉: {trade.action.value} @ {trade.exit_price:.1f}, "
+                    f"盈虧: {trade.pnl_twd:.0f}"
+                    for trade in result.trades
                 )
-                signal = self._generate_signal(current_kbars, current_price, config)
+            )
 
-                if signal.action != Action.Hold:
-                    # 執行開倉
-                    current_position = self._open_position(
-                        signal, current_time, kbar.open, config, kbars
-                    )
-                    trade_counter += 1
-                    print(f"📈 開倉: {signal.action.value} @ {kbar.open:.1f}")
+        # 更新權益曲線（每根 K 棒記錄處理該根之前的權益，同一根最多一筆平倉）
+        pnl_by_bar = np.zeros(n, dtype=np.float64)
+        pnl_by_bar[exit_idx] = pnl_twd
+        equity = np.empty(n + 1, dtype=np.float64)
+        equity[0] = config.initial_capital
+        equity[1] = config.initial_capital
+        np.cumsum(pnl_by_bar[:-1], out=equity[2:])
+        equity[2:] += config.initial_capital
+        result.equity_curve.extend(zip(times, equity[1:].tolist(), strict=True))
+        # 權益數值直接保留為陣列（含起始權益），統計指標不必再從 tuple 列表轉換
+        result.equity_values = equity
 
         # 計算統計指標
         result.calculate_statistics()
@@ -229,25 +316,216 @@ class BacktestService:
 
         return result
 
-    def _get_historical_data(self, config: BacktestConfig) -> KBarList:
-        """獲取歷史數據"""
+    def run_backtests(
+        self,
+        configs: list[BacktestConfig],
+        max_workers: int | None = None,
+        use_processes: bool = True,
+        use_cache: bool = False,
+    ) -> list[BacktestResult]:
+        """並行執行多組回測設定，結果順序與 configs 相同
+
+        相同商品、區間與時間尺度的設定共用同一份 K 線數據，只獲取一次。
+        預設以多程序執行：同數據範圍的設定依序分批交給各子程序，
+        每批以 run_backtest_multi 共用 MACD 與交叉判斷；
+        子程序的輸出會依 configs 順序統一印出，避免交錯。
+
+        Args:
+            configs: 回測設定列表（彼此獨立）
+            max_workers: 最大併發數（預設為設定數量，多程序時不超過 CPU 核心數）
+            use_processes: 是否使用多程序（False 時在本程序以多執行緒執行）
+            use_cache: 是否使用回測結果磁碟緩存（只執行緩存中沒有的設定）
+        """
+        if not configs:
+            return []
+
+        # 先取得各設定的 K 線（相同數據範圍只取一次），避免各回測重複呼叫 API
+        kbars_list = [self._get_historical_data(config) for config in configs]
+
+        if use_cache:
+            return self._run_with_result_cache(
+                configs,
+                kbars_list,
+                lambda misses, miss_kbars: self._run_backtests_parallel(
+                    misses, miss_kbars, max_workers, use_processes
+                ),
+            )
+        return self._run_backtests_parallel(
+            configs, kbars_list, max_workers, use_processes
+        )
+
+    def _run_backtests_parallel(
+        self,
+        configs: list[BacktestConfig],
+        kbars_list: list[KBarList],
+        max_workers: int | None,
+        use_processes: bool,
+    ) -> list[BacktestResult]:
+        """以多程序或多執行緒執行回測（K 線已預先取得）"""
+        if not use_processes:
+            with ThreadPoolExecutor(max_workers=max_workers or len(configs)) as pool:
+                return list(pool.map(self.run_backtest, configs, kbars_list))
+
+        workers = max_workers or min(len(configs), os.cpu_count() or 1)
+
+        # 同數據範圍的設定切成連續的批次（每個程序一批），批內共用指標計算
+        groups: dict[tuple, list[int]] = {}
+        for i, config in enumerate(configs):
+            groups.setdefault(self._data_key(config), []).append(i)
+        batches = []
+        for indices in groups.values():
+            batch_size = -(-len(indices) // workers)  # 無條件進位
+            batches.extend(
+                indices[start : start + batch_size]
+                for start in range(0, len(indices), batch_size)
+            )
+
+        results: list[BacktestResult | None] = [None] * len(configs)
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+            batch_outputs = pool.map(
+                _run_backtest_worker,
+                [[configs[i] for i in batch] for batch in batches],
+                [kbars_list[batch[0]] for batch in batches],
+                [self.verbose] * len(batches),
+            )
+            for batch, (batch_results, output) in zip(
+                batches, batch_outputs, strict=True
+            ):
+                print(output, end="")
+                for i, result in zip(batch, batch_results, strict=True):
+                    results[i] = result
+        return results
+
+    def _run_with_result_cache(
+        self,
+        configs: list[BacktestConfig],
+        kbars_list: list[KBarList],
+        runner: Callable[[list[BacktestConfig], list[KBarList]], list[BacktestResult]],
+    ) -> list[BacktestResult]:
+        """先讀取回測結果緩存，只以 runner 執行未命中的設定並寫入緩存"""
+        # 同一份數據只計算一次 K 線雜湊
+        kbars_digests: dict[tuple, bytes] = {}
+        cache_paths: list[Path | None] = []
+        for config, kbars in zip(configs, kbars_list, strict=True):
+            if not kbars:
+                cache_paths.append(None)
+                continue
+            data_key = self._data_key(config)
+            if data_key not in kbars_digests:
+                kbars_digests[data_key] = self._kbars_digest(kbars)
+            cache_paths.append(
+                self._get_result_cache_path(config, kbars_digests[data_key])
+            )
+
+        results = [
+            self._load_result_cache(path, config) if path else None
+            for path, config in zip(cache_paths, configs, strict=True)
+        ]
+
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            miss_results = runner(
+                [configs[i] for i in misses], [kbars_list[i] for i in misses]
+            )
+            for i, result in zip(misses, miss_results, strict=True):
+                results[i] = result
+                if cache_paths[i] is not None:
+                    self._save_result_cache(cache_paths[i], result)
+
+        return results
+
+    @staticmethod
+    def _kbars_digest(kbars: KBarList) -> bytes:
+        """計算 K 線時間與 OHLC 內容的雜湊"""
+        ohlc, times = BacktestService._kbars_to_arrays(kbars)
+        digest = hashlib.sha1(np.array(times, dtype="datetime64[us]").tobytes())
+        digest.update(ohlc.tobytes())
+        return digest.digest()
+
+    @staticmethod
+    def _get_result_cache_path(config: BacktestConfig, kbars_digest: bytes) -> Path:
+        """取得回測結果緩存檔案路徑（以 K 線內容與回測設定雜湊命名）
+
+        回測區間由 K 線內容決定，設定中的起訖時間不納入雜湊，
+        避免以 datetime.now() 計算區間時每次都無法命中。
+        """
+        key_config = replace(config, start_date=None, end_date=None)
+        digest = hashlib.sha1(f"{RESULTS_CACHE_VERSION}|{key_config!r}".encode())
+        digest.update(kbars_digest)
+        return RESULTS_CACHE_DIR / f"{digest.hexdigest()}.pkl"
+
+    @staticmethod
+    def _load_result_cache(path: Path, config: BacktestConfig) -> BacktestResult | None:
+        """從磁碟緩存讀取回測結果，不存在或讀取失敗時返回 None"""
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except Exception as e:
+            print(f"⚠️  讀取回測結果緩存失敗: {e}")
+            return None
+
+        # 緩存鍵不含起訖時間，改用本次設定更新與區間相關的欄位
+        result.config = config
+        if result.equity_curve:
+            result.equity_curve[0] = (config.start_date, config.initial_capital)
+        result.backtest_duration_days = (config.end_date - config.start_date).days
+
+        print(f"💾 使用回測結果緩存: {path.name} ({result.total_trades} 筆交易)")
+        return result
+
+    @staticmethod
+    def _save_result_cache(path: Path, result: BacktestResult):
+        """將回測結果寫入磁碟緩存"""
         try:
-            # 計算需要多少天的數據
-            days_diff = (config.end_date - config.start_date).days + 1
+            atomic_write(
+                path,
+                lambda tmp_path: tmp_path.write_bytes(
+                    pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+                ),
+            )
+        except Exception as e:
+            print(f"⚠️  寫入回測結果緩存失敗: {e}")
+
+    @staticmethod
+    def _data_key(config: BacktestConfig) -> tuple:
+        """回測所需數據的識別鍵（商品、區間、時間尺度）"""
+        return (
+            config.symbol,
+            config.sub_symbol,
+            config.start_date,
+            config.end_date,
+            config.timeframe,
+        )
+
+    def _get_historical_data(self, config: BacktestConfig) -> KBarList:
+        """獲取歷史數據（同一程序內相同數據範圍只取一次）"""
+        key = self._data_key(config)
+        cached = self._kbars_cache.get(key)
+        if cached is not None:
+            return cached
 
-            # 直接獲取指定時間尺度的K線數據
-            kbars = self.market_service.get_futures_kbars_with_timeframe(
+        try:
+            # 取得回測區間並重採樣到指定時間尺度的K線
+            # （同一區間與時間尺度重複回測時直接讀取磁碟緩存，不需連線）
+            kbars = self.market_service.get_kbars_cached(
                 symbol=config.symbol,
                 sub_symbol=config.sub_symbol,
                 timeframe=config.timeframe,
-                days=days_diff,
+                start_date=config.start_date,
+                end_date=config.end_date,
             )
-
-            return kbars
         except Exception as e:
             print(f"❌ 獲取歷史數據失敗: {e}")
             return KBarList()
 
+        # 取得失敗（空數據）時不緩存，下次重試
+        if kbars:
+            self._kbars_cache[key] = kbars
+        return kbars
+
     def _is_trading_time(self, time: datetime) -> bool:
         """檢查是否為交易時間"""
         # 台灣期貨交易時間
@@ -260,295 +538,40 @@ class BacktestService:
 
         return hour >= 15 or hour < 5
 
-    def _generate_signal(
-        self, kbars: KBarList, current_price: float, config: BacktestConfig
-    ) -> TradingSignal:
-        """生成交易信號"""
-        try:
-            # 直接使用 KBarList 計算 MACD
-            macd_list = self.strategy_service.calculate_macd(kbars)
-
-            # 取得最新的MACD值
-            latest_macd = macd_list.get_latest(3)  # 取得最新3個數據點
-            if len(latest_macd) < 2:
-                return TradingSignal(
-                    action=Action.Hold,
-                    symbol=config.symbol,
-                    price=current_price,
-                    reason="Insufficient MACD data",
-                )
-
-            current_macd = latest_macd[-2]
-            previous_macd = latest_macd[-3]
-
-            print(f"latest_macd: {latest_macd[-1].macd_line:.1f}")
-            print(f"latest_signal: {latest_macd[-1].signal_line:.1f}")
-            current_signal = current_macd.signal_line
-            previous_signal = previous_macd.signal_line
+    @staticmethod
+    def _rate_or_unset(rate: float | None) -> float:
+        """百分比參數轉為模擬核心使用的數值（-1.0 表示未設定）"""
+        return -1.0 if rate is None else float(rate)
 
-            # MACD金叉策略：MACD < 30 且金叉時買入
-            if (
-                (current_macd.macd_line + current_macd.signal_line) / 2 < 30
-                and previous_macd.macd_line <= previous_signal
-                and current_macd.macd_line > current_signal
-            ):
-                return TradingSignal(
-                    action=Action.Buy,
-                    symbol=config.symbol,
-                    price=current_price,
-                    confidence=0.8,
-                    reason=f"MACD Golden Cross: MACD({current_macd.macd_line:.2f}) > Signal({current_signal:.2f})",
-                    timestamp=datetime.now(),
-                )
-
-            return TradingSignal(
-                action=Action.Hold,
-                symbol=config.symbol,
-                price=current_price,
-                reason="No signal",
-                timestamp=datetime.now(),
-            )
-
-        except Exception as e:
-            print(f"❌ 生成信號失敗: {e}")
-            return TradingSignal(
-                action=Action.Hold,
-                symbol=config.symbol,
-                price=current_price,
-                reason=f"Signal generation error: {e}",
-            )
-
-    def _open_position(
+    def _generate_entry_signals(
         self,
-        signal: TradingSignal,
-        time: datetime,
-        price: float,
+        macd_line: np.ndarray,
+        signal_line: np.ndarray,
         config: BacktestConfig,
-        kbars: KBarList,
-    ) -> BacktestPosition:
-        """開倉"""
-        # 計算停損價格 - 使用前30根KBar的最低點減80點（與實際交易一致）
-        stop_loss_price = self._calculate_stop_loss_from_kbars(
-            signal.action, time, kbars, config.stop_loss_points
-        )
-
-        # 計算獲利價格
-        take_profit_points = calculate_points(
-            config.take_profit_points,
-            config.take_profit_points_rate,
-            price,
-        )
-        if signal.action == Action.Buy:
-            take_profit_price = price + take_profit_points
-        else:  # Sell
-            take_profit_price = price - take_profit_points
-
-        position = BacktestPosition(
-            symbol=config.symbol,
-            action=signal.action,
-            entry_time=time,
-            entry_price=price,
-            quantity=config.order_quantity,
-            stop_loss_price=stop_loss_price,
-            take_profit_price=take_profit_price,
-        )
-
-        return position
-
-    def _calculate_stop_loss_from_kbars(
-        self,
-        action: Action,
-        entry_time: datetime,
-        kbars: KBarList,
-        stop_loss_points: int,
-    ) -> float:
-        """根據前30根KBar計算停損價格（與實際交易邏輯一致）"""
-        # 找到進場前的KBar
-        pre_entry_kbars = [kbar for kbar in kbars if kbar.time <= entry_time]
-
-        if len(pre_entry_kbars) < 30:
-            # 如果歷史數據不足30根，使用進場價格計算（fallback）
-            print(
-                f"⚠️ 歷史KBar不足30根 ({len(pre_entry_kbars)}根)，使用進場價格計算停損"
-            )
-            # 找到當前KBar的價格
-            current_kbar = next(
-                (kbar for kbar in kbars if kbar.time == entry_time), None
-            )
-            if current_kbar:
-                current_price = current_kbar.close
-                if action == Action.Buy:
-                    return current_price - stop_loss_points
-                else:
-                    return current_price + stop_loss_points
-            else:
-                # 如果找不到當前KBar，使用最後一根KBar
-                if pre_entry_kbars:
-                    last_price = pre_entry_kbars[-1].close
-                    if action == Action.Buy:
-                        return last_price - stop_loss_points
-                    else:
-                        return last_price + stop_loss_points
-                else:
-                    raise ValueError("無法計算停損價格：沒有可用的KBar數據")
-
-        # 取前30根KBar的最低點
-        recent_kbars = pre_entry_kbars[-30:]
-        min_price = min(kbar.low for kbar in recent_kbars)
-
-        # 計算停損價格
-        if action == Action.Buy:
-            stop_loss_price = min_price - stop_loss_points
-        else:  # Sell
-            stop_loss_price = min_price + stop_loss_points
-
-        print(
-            f"📊 停損計算: 前30根最低點 {min_price:.1f} ± {stop_loss_points} = {stop_loss_price:.1f}"
-        )
-
-        return stop_loss_price
+    ) -> np.ndarray:
+        """生成每根 K 棒的進場信號
 
-    def _check_exit_conditions(
-        self,
-        position: BacktestPosition,
-        current_kbar,
-        current_high: float,
-        current_low: float,
-        config: BacktestConfig,
-        macd_list=None,
-        current_index: int = 0,
-        is_in_macd_death_cross: bool = False,
-    ) -> tuple[ExitReason | None, float | None]:
-        """檢查平倉條件
+        MACD金叉策略：已確認K線 (MACD + Signal) / 2 < 30 且金叉時買入
 
         Returns:
-            (exit_reason, exit_price_override): 平倉原因和可選的覆蓋出場價格
+            np.ndarray: bool 陣列，True 表示該根 K 棒以開盤價進場
         """
-        # 檢查 MACD 快速停損（處於死叉狀態時持續檢查）
-        if (
-            config.enable_macd_fast_stop
-            and not position.trailing_stop_active
-            and is_in_macd_death_cross
-        ):
-            # 使用開盤價檢查
-            open_price = current_kbar.open
-
-            # 計算虧損
-            if position.action == Action.Buy:
-                loss_points = position.entry_price - open_price
-
-                # 使用 stop_loss_points 作為門檻（與實際交易一致）
-                if loss_points > config.stop_loss_points:
-                    print(
-                        f"⚡ MACD 快速停損觸發: 開盤價 {open_price:.1f}, 虧損 {loss_points:.1f} 點 >= 門檻 {config.stop_loss_points} 點 (處於死叉狀態)"
-                    )
-                    return ExitReason.FAST_STOP, open_price  # 使用開盤價作為出場價
-
-        # 檢查獲利了結 (使用高點檢查)
-        if config.enable_take_profit and (
-            (
-                position.action == Action.Buy
-                and current_high >= position.take_profit_price
-            )
-            or (
-                position.action == Action.Sell
-                and current_low <= position.take_profit_price
-            )
-        ):
-            return ExitReason.TAKE_PROFIT, None
-
-        # 檢查移動停損 (使用低點檢查，優先於一般停損)
-        if (
-            config.enable_trailing_stop
-            and position.trailing_stop_price
-            and (
-                (
-                    position.action == Action.Buy
-                    and current_low <= position.trailing_stop_price
-                )
-                or (
-                    position.action == Action.Sell
-                    and current_high >= position.trailing_stop_price
-                )
-            )
-        ):
-            return ExitReason.TRAILING_STOP, None
-
-        # 檢查一般停損 (使用低點檢查)
-        if (
-            position.action == Action.Buy and current_low <= position.stop_loss_price
-        ) or (
-            position.action == Action.Sell and current_high >= position.stop_loss_price
-        ):
-            return ExitReason.STOP_LOSS, None
-
-        # 檢查是否啟動移動停損 (使用高點檢查)
-        if config.enable_trailing_stop and not position.trailing_stop_active:
-            profit_points = 0
-            if position.action == Action.Buy:
-                profit_points = current_high - position.entry_price
-            else:
-                profit_points = position.entry_price - current_low
-
-            if profit_points >= config.start_trailing_stop_points:
-                position.trailing_stop_active = True
-                trailing_stop_points = calculate_points(
-                    config.trailing_stop_points,
-                    config.trailing_stop_points_rate,
-                    position.entry_price,
-                )
-                if position.action == Action.Buy:
-                    position.update_trailing_stop(current_high, trailing_stop_points)
-                else:
-                    position.update_trailing_stop(current_low, trailing_stop_points)
-
-        return None, None
-
-    def _close_position(
-        self,
-        position: BacktestPosition,
-        time: datetime,
-        current_high: float,
-        current_low: float,
-        exit_reason: ExitReason,
-        config: BacktestConfig,  # noqa: ARG002
-        exit_price_override: float | None = None,
-    ) -> BacktestTrade:
-        """平倉"""
-        # 如果有覆蓋價格（例如快速停損使用開盤價），優先使用
-        if exit_price_override is not None:
-            exit_price = exit_price_override
-        # 否則根據出場原因決定實際成交價格
-        elif exit_reason == ExitReason.TAKE_PROFIT:
-            # 獲利了結：使用目標價格
-            exit_price = position.take_profit_price
-        elif exit_reason == ExitReason.TRAILING_STOP:
-            # 移動停損：使用移動停損價格
-            exit_price = position.trailing_stop_price
-        elif exit_reason == ExitReason.STOP_LOSS:
-            # 一般停損：使用停損價格
-            exit_price = position.stop_loss_price
-        else:
-            # 其他情況：使用收盤價
-            exit_price = (current_high + current_low) / 2
-
-        # 創建交易記錄
-        trade = BacktestTrade(
-            trade_id=str(uuid.uuid4()),
-            symbol=position.symbol,
-            action=position.action,
-            entry_time=position.entry_time,
-            entry_price=position.entry_price,
-            exit_time=time,
-            exit_price=exit_price,
-            quantity=position.quantity,
-            exit_reason=exit_reason,
+        min_strength = (
+            config.min_golden_cross_strength
+            if config.min_golden_cross_strength > 0
+            else None
+        )
+        signals = self.strategy_service.detect_golden_crosses(
+            macd_line, signal_line, min_strength=min_strength
         )
 
-        # 計算盈虧
-        trade.calculate_pnl()
+        # MACD < 30 過濾（以 [i-1] 已確認K線判斷）
+        signals[1:] &= (macd_line[:-1] + signal_line[:-1]) / 2 < 30
 
-        return trade
+        # 沿用原條件：尾端保留至少 30 根 K 棒才開倉
+        signals[max(len(signals) - MIN_BARS_AFTER_ENTRY, 0) :] = False
+
+        return signals
 
     def generate_report(self, result: BacktestResult) -> str:
         """生成回測報告"""
@@ -604,6 +627,10 @@ class BacktestService:
         report.append(f"快速週期: {result.config.macd_fast_period}")
         report.append(f"慢速週期: {result.config.macd_slow_period}")
         report.append(f"信號週期: {result.config.macd_signal_period}")
+        if result.config.min_golden_cross_strength > 0:
+            report.append(
+                f"金叉強度門檻: {result.config.min_golden_cross_strength:.1f}"
+            )
         report.append("")
 
         # MACD 快速停損參數
@@ -688,9 +715,23 @@ class BacktestService:
         if result.trades:
             report.append("📋 交易明細")
             report.append("-" * 30)
-            for i, trade in enumerate(result.trades, 1):
+            # 出場原因由欄位陣列的代碼查表，每筆交易只取一次字串
+            arrays = result.get_trade_arrays()
+            if len(arrays) == len(result.trades):
+                reasons = [
+                    EXIT_REASON_VALUES[code]
+                    for code in arrays.exit_reason_codes.tolist()
+                ]
+            else:
+                reasons = [
+                    trade.exit_reason.value if trade.exit_reason else "Unknown"
+                    for trade in result.trades
+                ]
+            for i, (trade, reason) in enumerate(
+                zip(result.trades, reasons, strict=True), 1
+            ):
                 report.append(
-                    f"{i:2d}. {trade.action.value} {trade.entry_price:.1f} → {trade.exit_price:.1f} | {trade.exit_reason.value} | {trade.pnl_twd:+.0f}"
+                    f"{i:2d}. {trade.action.value} {trade.entry_price:.1f} → {trade.exit_price:.1f} | {reason} | {trade.pnl_twd:+.0f}"
                 )
 
         report.append("=" * 60)
@@ -720,3 +761,20 @@ class BacktestService:
 
         print(f"💾 回測結果已保存到: {filename}")
         return filename
+
+
+def _run_backtest_worker(
+    configs: list[BacktestConfig], kbars: KBarList, verbose: bool = False
+) -> tuple[list[BacktestResult], str]:
+    """子程序中以同一份 K 線執行一批回測
+
+    API 客戶端無法跨程序傳遞，因此由主程序預先取得 K 線後傳入。
+
+    Returns:
+        (回測結果列表, 回測過程的輸出內容)
+    """
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        service = BacktestService(None, StrategyService(), verbose=verbose)
+        results = service.run_backtest_multi(configs, kbars)
+    return results, output.getvalue()
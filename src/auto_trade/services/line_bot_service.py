@@ -1,6 +1,9 @@
 """Line Bot 服務 - 用於發送交易通知和接收命令"""
 
+import atexit
 import os
+import queue
+import threading
 from datetime import datetime
 
 from linebot import LineBotApi, WebhookHandler
@@ -17,17 +20,27 @@ from linebot.models import (
     TextSendMessage,
 )
 
+# 背景發送佇列上限（佇列滿時捨棄通知，交易流程不因通知而阻塞）
+NOTIFY_QUEUE_SIZE = 256
+
 
 class LineBotService:
     """Line Bot 服務類"""
 
-    def __init__(self, channel_id: str, channel_secret: str, messaging_api_token: str):
+    def __init__(
+        self,
+        channel_id: str,
+        channel_secret: str,
+        messaging_api_token: str,
+        background: bool = False,
+    ):
         """初始化 Line Bot 服務
 
         Args:
             channel_id: Line Bot Channel ID
             channel_secret: Line Bot Channel Secret
             messaging_api_token: Line Bot Messaging API Token
+            background: 是否以背景執行緒發送訊息（交易流程不等待 Line API 回應）
         """
         self.channel_id = channel_id
         self.channel_secret = channel_secret
@@ -35,15 +48,64 @@ class LineBotService:
         self.handler = WebhookHandler(channel_secret)
         self.user_id = os.environ.get("LINE_USER_ID")  # 您的 Line User ID
 
+        self._notify_queue: queue.Queue[str] | None = None
+        if background:
+            self._notify_queue = queue.Queue(maxsize=NOTIFY_QUEUE_SIZE)
+            threading.Thread(
+                target=self._notify_worker, name="line-bot-notify", daemon=True
+            ).start()
+            # 程式結束前盡量送出佇列中剩餘的通知
+            atexit.register(self.flush)
+
     def send_message(self, message: str) -> bool:
-        """發送文字訊息
+        """發送文字訊息（背景模式時放入佇列，由背景執行緒發送）
 
         Args:
             message: 要發送的訊息
 
         Returns:
-            bool: 發送是否成功
+            bool: 發送是否成功（背景模式時為是否已放入佇列）
+        """
+        if self._notify_queue is None:
+            return self._push_message(message)
+
+        try:
+            self._notify_queue.put_nowait(message)
+            return True
+        except queue.Full:
+            print("⚠️ Line Bot 通知佇列已滿，捨棄訊息")
+            return False
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """等待背景佇列中的通知發送完畢
+
+        Args:
+            timeout: 最長等待秒數
+
+        Returns:
+            bool: 佇列是否已清空
         """
+        if self._notify_queue is None:
+            return True
+
+        with self._notify_queue.all_tasks_done:
+            return self._notify_queue.all_tasks_done.wait_for(
+                lambda: self._notify_queue.unfinished_tasks == 0, timeout=timeout
+            )
+
+    def _notify_worker(self):
+        """背景執行緒：依序發送佇列中的訊息"""
+        while True:
+            message = self._notify_queue.get()
+            try:
+                self._push_message(message)
+            except Exception as e:
+                print(f"❌ Line Bot 發送失敗: {e}")
+            finally:
+                self._notify_queue.task_done()
+
+    def _push_message(self, message: str) -> bool:
+        """呼叫 Line API 發送文字訊息"""
         try:
             self.line_bot_api.push_message(self.user_id, TextSendMessage(text=message))
             return True
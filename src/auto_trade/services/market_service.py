@@ -1,11 +1,21 @@
 """Market service for managing market data operations."""
 
+import hashlib
+import threading
 import time
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from auto_trade.models import KBar, KBarList, Quote
+from auto_trade.utils import atomic_write
+
+# 歷史 K 線磁碟緩存目錄（回測重複拉取同一區間時使用）
+KBARS_CACHE_DIR = Path.home() / ".cache" / "auto_trade" / "kbars"
+# K 線格式或重採樣邏輯變更時遞增，使舊緩存失效
+KBARS_CACHE_VERSION = 1
 
 # 支援的時間尺度對應表
 TIMEFRAME_MAPPING = {
@@ -38,6 +48,7 @@ class MarketService:
         # value: {
         #     "contract_code": str,         # 合約代碼（如 "MXFK5"）
         #     "latest_quote": tick,         # 最新報價（TickFOPv1 對象）
+        #     "quote": (tick, Quote),       # 由最新報價轉換的 Quote（同一 tick 只轉換一次）
         #     "kbars_1m": KBarList,         # 1 分鐘 K 線數據
         #     "last_api_sync": datetime,    # 上次從 API 同步的時間
         #     "last_tick_update": datetime, # 上次從 tick 更新的時間
@@ -49,6 +60,9 @@ class MarketService:
         # 合約代碼反向映射: contract_code -> (symbol, sub_symbol), 用於 callback 快速查找
         self._contract_mapping: dict[str, tuple[str, str]] = {}
 
+        # 收到新 tick 時設定，交易迴圈以此喚醒而不必固定間隔輪詢報價
+        self._tick_event = threading.Event()
+
     @staticmethod
     def is_trading_time():
         """檢查是否在交易時間"""
@@ -109,6 +123,25 @@ class MarketService:
         # 從 tick 更新 K 線緩存
         self._update_kbar_from_tick(tick)
 
+        # 報價與 K 線都更新後才通知等待中的交易迴圈
+        self._tick_event.set()
+
+    def wait_for_tick(self, timeout: float) -> bool:
+        """等待下一筆已訂閱商品的 tick
+
+        返回前清除事件：等待期間已到達的 tick 會立即返回，
+        之後呼叫端讀取的報價已包含這些 tick。
+
+        Args:
+            timeout: 最長等待秒數
+
+        Returns:
+            bool: 是否收到新 tick（逾時為 False）
+        """
+        received = self._tick_event.wait(timeout)
+        self._tick_event.clear()
+        return received
+
     def _update_kbar_from_tick(self, tick):
         """從 tick 數據實時更新 K 線緩存
 
@@ -191,7 +224,7 @@ class MarketService:
         print(f"🔄 同步 K 線緩存: {symbol}/{sub_symbol} ({days} 天)")
 
         # 從 API 獲取歷史數據
-        kbars_1m = self.get_futures_historical_kbars(symbol, sub_symbol, days)
+        kbars_1m = self.get_futures_recent_kbars(symbol, sub_symbol, days)
 
         if not kbars_1m.kbars or len(kbars_1m.kbars) == 0:
             print("⚠️  同步失敗：API 返回空數據")
@@ -312,51 +345,143 @@ class MarketService:
         Returns:
             Quote 對象或 None（如果尚未訂閱或無數據）
         """
-        try:
-            cache_key = (symbol, sub_symbol)
+        return self.get_realtime_quotes([(symbol, sub_symbol)], use_snapshot=False)[0]
 
-            # 從統一緩存讀取
-            if cache_key not in self._symbol_cache:
-                return None
+    def get_realtime_quotes(
+        self, pairs: list[tuple[str, str]], use_snapshot: bool = True
+    ) -> list[Quote | None]:
+        """批次取得多個商品的即時報價
 
-            cached_data = self._symbol_cache[cache_key]
-            tick = cached_data.get("latest_quote")
+        已訂閱的商品從緩存讀取；其餘商品以一次 snapshots API 呼叫取得，
+        避免逐一查詢造成多次往返。
+
+        Args:
+            pairs: (商品代碼, 子商品代碼) 列表，如 [("MXF", "MXF202511")]
+            use_snapshot: 緩存沒有報價時是否以 snapshots API 補齊
+
+        Returns:
+            與 pairs 順序相同的 Quote 列表（取不到的項目為 None）
+        """
+        quotes: list[Quote | None] = [None] * len(pairs)
+        missing: list[int] = []
 
+        for i, cache_key in enumerate(pairs):
+            cached_data = self._symbol_cache.get(cache_key)
+            tick = cached_data.get("latest_quote") if cached_data else None
             if tick:
-                return Quote(
-                    symbol=tick.code,
-                    price=int(tick.close),
-                    volume=tick.total_volume,
-                    bid_price=None,  # TickFOPv1 沒有 bid/ask 價格
-                    ask_price=None,
-                    timestamp=tick.datetime,
-                )
+                # 持倉時每數秒讀取一次報價，tick 未更新時沿用上次轉換的 Quote
+                converted = cached_data.get("quote")
+                if converted is None or converted[0] is not tick:
+                    try:
+                        converted = (
+                            tick,
+                            Quote(
+                                symbol=tick.code,
+                                price=int(tick.close),
+                                volume=tick.total_volume,
+                                bid_price=None,  # TickFOPv1 沒有 bid/ask 價格
+                                ask_price=None,
+                                timestamp=tick.datetime,
+                            ),
+                        )
+                    except Exception as e:
+                        print(f"⚠️  取得即時報價失敗: {type(e).__name__}: {e}")
+                        continue
+                    cached_data["quote"] = converted
+                quotes[i] = converted[1]
+            else:
+                missing.append(i)
 
-            return None
+        if not missing or not use_snapshot:
+            return quotes
+
+        try:
+            contracts = [
+                self.api_client.Contracts.Futures[pairs[i][0]][pairs[i][1]]
+                for i in missing
+            ]
+            snapshots = self.api_client.snapshots(contracts)
+            snapshot_by_code = {snapshot.code: snapshot for snapshot in snapshots}
 
+            for i, contract in zip(missing, contracts, strict=True):
+                snapshot = snapshot_by_code.get(contract.code)
+                if snapshot is None:
+                    continue
+                quotes[i] = Quote(
+                    symbol=snapshot.code,
+                    price=int(snapshot.close),
+                    volume=snapshot.total_volume,
+                    bid_price=int(snapshot.buy_price),
+                    ask_price=int(snapshot.sell_price),
+                    timestamp=self.convert_timestamp_to_datetime(
+                        snapshot.ts, use_start_time=False
+                    ),
+                )
         except Exception as e:
-            print(f"⚠️  取得即時報價失敗: {type(e).__name__}: {e}")
-            return None
+            print(f"⚠️  批次取得即時報價失敗: {type(e).__name__}: {e}")
+
+        return quotes
+
+    def get_futures_recent_kbars(
+        self, symbol: str, sub_symbol: str, days: int = 30, use_cache: bool = False
+    ) -> KBarList:
+        """取得最近 N 天的期貨歷史K線資料
+
+        Args:
+            symbol: 商品代碼
+            sub_symbol: 子商品代碼
+            days: 取得天數
+            use_cache: 是否使用磁碟緩存
+        """
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        return self.get_futures_historical_kbars(
+            symbol, sub_symbol, start_date, end_date, use_cache=use_cache
+        )
 
     def get_futures_historical_kbars(
-        self, symbol: str, sub_symbol: str, days: int = 30
+        self,
+        symbol: str,
+        sub_symbol: str,
+        start_date: date,
+        end_date: date,
+        use_cache: bool = False,
     ) -> KBarList:
-        """取得期貨歷史K線資料"""
+        """取得指定日期區間的期貨歷史K線資料
+
+        Args:
+            symbol: 商品代碼
+            sub_symbol: 子商品代碼
+            start_date: 起始日期（含）
+            end_date: 結束日期（含）
+            use_cache: 是否使用磁碟緩存（以商品與起訖日期為 key，供回測重複使用；
+                區間包含今天時數據尚未完整，不讀寫緩存）
+        """
+        start_str = start_date.strftime("%Y-%m-%d")
+        end_str = end_date.strftime("%Y-%m-%d")
+
+        cache_path = None
+        if use_cache and self._is_kbars_cacheable(end_date):
+            cache_path = self._get_kbars_cache_path(
+                symbol, sub_symbol, start_str, end_str
+            )
+            cached = self._load_kbars_cache(cache_path, symbol)
+            if cached is not None:
+                return cached
+
         try:
             contract = self.api_client.Contracts.Futures[symbol][sub_symbol]
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
 
             kbars = self.api_client.kbars(
                 contract=contract,
-                start=start_date.strftime("%Y-%m-%d"),
-                end=end_date.strftime("%Y-%m-%d"),
+                start=start_str,
+                end=end_str,
             )
 
             # 檢查是否有數據
             if not kbars.ts or len(kbars.ts) == 0:
                 print(
-                    f"⚠️  取得 {symbol}/{sub_symbol} 歷史K線資料為空 ({start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')})"
+                    f"⚠️  取得 {symbol}/{sub_symbol} 歷史K線資料為空 ({start_str} ~ {end_str})"
                 )
                 # 返回空的 KBarList
                 return KBarList(kbars=[], symbol=symbol, timeframe="1m")
@@ -365,7 +490,129 @@ class MarketService:
             print(f"❌ 取得歷史K線失敗: {type(e).__name__}: {e}")
             return KBarList(kbars=[], symbol=symbol, timeframe="1m")
 
-        return self._format_kbar_data(kbars, symbol, "1m")
+        kbar_list = self._format_kbar_data(kbars, symbol, "1m")
+
+        if cache_path is not None:
+            self._save_kbars_cache(cache_path, kbar_list)
+
+        return kbar_list
+
+    def get_kbars_cached(
+        self,
+        symbol: str,
+        sub_symbol: str,
+        timeframe: str,
+        start_date: date,
+        end_date: date,
+    ) -> KBarList:
+        """取得指定時間尺度的歷史K線，重採樣結果同樣緩存到磁碟
+
+        以 (商品, 時間尺度, 起訖日期) 為 key，重複回測時不需連線也不需重新重採樣。
+        區間包含今天時數據尚未完整，每次重新取得，不讀寫緩存。
+
+        Args:
+            symbol: 商品代碼
+            sub_symbol: 子商品代碼
+            timeframe: 時間尺度
+            start_date: 起始日期（含）
+            end_date: 結束日期（含）
+        """
+        if timeframe == "1m":
+            return self.get_futures_historical_kbars(
+                symbol, sub_symbol, start_date, end_date, use_cache=True
+            )
+
+        if not self._is_kbars_cacheable(end_date):
+            kbars_1m = self.get_futures_historical_kbars(
+                symbol, sub_symbol, start_date, end_date
+            )
+            return self.resample_kbars(kbars_1m, timeframe)
+
+        cache_path = self._get_kbars_cache_path(
+            symbol,
+            sub_symbol,
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d"),
+            timeframe,
+        )
+        cached = self._load_kbars_cache(cache_path, symbol, timeframe)
+        if cached is not None:
+            return cached
+
+        kbars_1m = self.get_futures_historical_kbars(
+            symbol, sub_symbol, start_date, end_date, use_cache=True
+        )
+        kbar_list = self.resample_kbars(kbars_1m, timeframe)
+        self._save_kbars_cache(cache_path, kbar_list)
+        return kbar_list
+
+    @staticmethod
+    def _is_kbars_cacheable(end_date: date) -> bool:
+        """區間結束於今天之前（數據已完整）才使用 K 線磁碟緩存"""
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+        return end_date < date.today()
+
+    @staticmethod
+    def _get_kbars_cache_path(
+        symbol: str, sub_symbol: str, start: str, end: str, timeframe: str = "1m"
+    ) -> Path:
+        """取得 K 線緩存檔案路徑（以商品、起訖日期與時間尺度雜湊命名）"""
+        raw_key = (
+            f"{KBARS_CACHE_VERSION}|{symbol}|{sub_symbol}|{start}|{end}|{timeframe}"
+        )
+        key = hashlib.sha1(raw_key.encode()).hexdigest()
+        return KBARS_CACHE_DIR / f"{key}.npz"
+
+    @staticmethod
+    def _load_kbars_cache(
+        path: Path, symbol: str, timeframe: str = "1m"
+    ) -> KBarList | None:
+        """從磁碟緩存讀取K線，不存在或讀取失敗時返回 None"""
+        if not path.exists():
+            return None
+
+        try:
+            with np.load(path) as data:
+                times = data["time"].tolist()
+                opens = data["open"].tolist()
+                highs = data["high"].tolist()
+                lows = data["low"].tolist()
+                closes = data["close"].tolist()
+        except Exception as e:
+            print(f"⚠️  讀取K線緩存失敗: {e}")
+            return None
+
+        kbars = [
+            KBar(time=time, open=open, high=high, low=low, close=close)
+            for time, open, high, low, close in zip(
+                times, opens, highs, lows, closes, strict=True
+            )
+        ]
+        print(f"💾 使用K線緩存: {path.name} ({len(kbars)} 根)")
+        return KBarList(kbars=kbars, symbol=symbol, timeframe=timeframe)
+
+    @staticmethod
+    def _save_kbars_cache(path: Path, kbar_list: KBarList):
+        """將K線寫入磁碟緩存"""
+        if not kbar_list.kbars:
+            return
+
+        kbars = kbar_list.kbars
+        try:
+            atomic_write(
+                path,
+                lambda tmp_path: np.savez_compressed(
+                    tmp_path,
+                    time=np.array([kb.time for kb in kbars], dtype="datetime64[us]"),
+                    open=np.array([kb.open for kb in kbars], dtype="float64"),
+                    high=np.array([kb.high for kb in kbars], dtype="float64"),
+                    low=np.array([kb.low for kb in kbars], dtype="float64"),
+                    close=np.array([kb.close for kb in kbars], dtype="float64"),
+                ),
+            )
+        except Exception as e:
+            print(f"⚠️  寫入K線緩存失敗: {e}")
 
     def resample_kbars(self, kbar_list: KBarList, timeframe: str) -> KBarList:
         """
@@ -662,29 +909,45 @@ class MarketService:
     def _format_kbar_data(
         self, kbars, symbol: str = "", timeframe: str = "1m"
     ) -> KBarList:
-        """格式化K線資料"""
-        kbar_list = []
-
-        for ts, open, high, low, close in zip(
-            kbars.ts, kbars.Open, kbars.High, kbars.Low, kbars.Close, strict=False
-        ):
-            if (
-                ts is None
-                or open is None
-                or high is None
-                or low is None
-                or close is None
-            ):
-                continue
-            kbar_list.append(
-                KBar(
-                    time=self.convert_timestamp_to_datetime(ts, use_start_time=True),
-                    open=float(open),
-                    high=float(high),
-                    low=float(low),
-                    close=float(close),
-                )
+        """格式化K線資料
+
+        以 NumPy 陣列一次轉換整欄資料，避免逐筆呼叫 convert_timestamp_to_datetime
+        """
+        if not kbars.ts:
+            return KBarList(kbars=[], symbol=symbol, timeframe=timeframe)
+
+        # 每個欄位只轉換一次；None 會轉成 NaN / <NA>，之後用遮罩一次剔除
+        ts = pd.array(kbars.ts, dtype="Int64")
+        opens = np.asarray(kbars.Open, dtype="float64")
+        highs = np.asarray(kbars.High, dtype="float64")
+        lows = np.asarray(kbars.Low, dtype="float64")
+        closes = np.asarray(kbars.Close, dtype="float64")
+
+        valid = ~(
+            ts.isna()
+            | np.isnan(opens)
+            | np.isnan(highs)
+            | np.isnan(lows)
+            | np.isnan(closes)
+        )
+
+        # 納秒 timestamp 直接視為 datetime64[ns]（UTC+0），減 1 分鐘改為開始時間
+        times = (
+            ts[valid].to_numpy(dtype="int64").view("datetime64[ns]")
+            - np.timedelta64(1, "m")
+        ).astype("datetime64[us]")
+
+        kbar_list = [
+            KBar(time=time, open=open, high=high, low=low, close=close)
+            for time, open, high, low, close in zip(
+                times.tolist(),
+                opens[valid].tolist(),
+                highs[valid].tolist(),
+                lows[valid].tolist(),
+                closes[valid].tolist(),
+                strict=True,
             )
+        ]
 
         return KBarList(kbars=kbar_list, symbol=symbol, timeframe=timeframe)
 
@@ -807,9 +1070,9 @@ class MarketService:
 
 if __name__ == "__main__":
     from auto_trade.core.client import create_api_client
-    from auto_trade.core.config import Config
+    from auto_trade.core.config import get_config
 
-    config = Config()
+    config = get_config()
 
     # 建立API客戶端
     api_client = create_api_client(
@@ -1,5 +1,6 @@
 """Order service for managing futures trading operations."""
 
+import threading
 from datetime import datetime
 
 import shioaji as sj
@@ -9,9 +10,14 @@ from auto_trade.models import (
     Deal,
     FuturesOrderResult,
     FuturesTrade,
+    OrderEvent,
     OrderStatus,
 )
 
+# shioaji OrderState 的期貨委託 / 成交回報值（新舊版列舉名稱不同，值相同）
+FUTURES_ORDER_STATE = "FORDER"
+FUTURES_DEAL_STATE = "FDEAL"
+
 
 class OrderService:
     """期貨下單服務類別"""
@@ -19,6 +25,88 @@ class OrderService:
     def __init__(self, api_client):
         self.api_client = api_client
 
+        # 委託回報（key: 委託單ID），由 shioaji 回報執行緒寫入、下單等待端取出
+        # 回報可能早於 place_order 返回，因此先存起來再由等待端依委託單ID領取；
+        # 等待端返回時清除沒有人等待的回報，避免手動委託或逾時後的回報持續累積
+        self._order_events: dict[str, OrderEvent] = {}
+        self._waiting_order_ids: set[str] = set()
+        self._order_events_cond = threading.Condition()
+        self.api_client.set_order_callback(self._order_callback)
+
+    def _order_callback(self, stat, msg: dict):
+        """shioaji 委託 / 成交回報 callback（只記錄期貨成交與失敗 / 取消）"""
+        state = getattr(stat, "value", stat)
+        if state == FUTURES_DEAL_STATE:
+            event = OrderEvent(
+                order_id=msg.get("trade_id", ""),
+                deal=Deal(
+                    id=str(msg.get("seqno", "")),
+                    code=msg.get("code", ""),
+                    direction=Action.Buy if msg.get("action") == "Buy" else Action.Sell,
+                    quantity=msg.get("quantity", 0),
+                    price=msg.get("price", 0.0),
+                    time=datetime.fromtimestamp(msg["ts"])
+                    if "ts" in msg
+                    else datetime.now(),
+                ),
+            )
+        elif state == FUTURES_ORDER_STATE:
+            operation = msg.get("operation", {})
+            # 委託成功（非取消）時不需要通知，等待成交回報
+            if (
+                operation.get("op_code", "00") == "00"
+                and operation.get("op_type") != "Cancel"
+            ):
+                return
+            event = OrderEvent(
+                order_id=msg.get("order", {}).get("id", ""),
+                error=operation.get("op_msg")
+                or f"{operation.get('op_type', '')} {operation.get('op_code', '')}",
+            )
+        else:
+            return
+
+        with self._order_events_cond:
+            # 成交回報優先：已記錄成交時，後到的取消（如 IOC 未成交部分）或失敗回報
+            # 不可覆蓋，否則會把已成交的委託誤判為被拒絕
+            recorded = self._order_events.get(event.order_id)
+            if (
+                recorded is not None
+                and recorded.deal is not None
+                and event.deal is None
+            ):
+                return
+            self._order_events[event.order_id] = event
+            self._order_events_cond.notify_all()
+
+    def wait_for_order_event(self, order_id: str, timeout: float) -> OrderEvent | None:
+        """
+        等待委託的成交或失敗回報（由回報 callback 喚醒，不輪詢 API）
+
+        Args:
+            order_id: 委託單ID
+            timeout: 最長等待秒數
+
+        Returns:
+            委託回報，逾時則返回 None
+        """
+        with self._order_events_cond:
+            self._waiting_order_ids.add(order_id)
+            try:
+                self._order_events_cond.wait_for(
+                    lambda: order_id in self._order_events, timeout=timeout
+                )
+                return self._order_events.get(order_id)
+            finally:
+                self._waiting_order_ids.discard(order_id)
+                # 只保留仍有人等待的委託回報
+                for key in [
+                    key
+                    for key in self._order_events
+                    if key not in self._waiting_order_ids
+                ]:
+                    del self._order_events[key]
+
     def place_order(
         self,
         symbol: str,
@@ -236,13 +324,13 @@ class OrderService:
             符合條件的委託單列表
         """
         try:
-            trades = self.list_trades()
-
             # 如果指定了order_id，直接返回該交易
             if order_id:
                 trade = self.get_trade_by_id(order_id)
                 return [trade] if trade else []
 
+            trades = self.list_trades()
+
             # 根據symbol和sub_symbol篩選
             filtered_trades = []
             for trade in trades:
@@ -261,9 +349,9 @@ class OrderService:
 
 if __name__ == "__main__":
     from auto_trade.core.client import create_api_client
-    from auto_trade.core.config import Config
+    from auto_trade.core.config import get_config
 
-    config = Config()
+    config = get_config()
     api_client = create_api_client(
         config.api_key,
         config.secret_key,
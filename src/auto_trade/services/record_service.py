@@ -4,7 +4,7 @@ import json
 from datetime import datetime
 from pathlib import Path
 
-from auto_trade.core.config import Config
+from auto_trade.core.config import get_config
 from auto_trade.models import ExitReason
 from auto_trade.models.position_record import BuybackState, PositionRecord
 
@@ -28,7 +28,7 @@ class RecordService:
         self._ensure_file_exists()
 
         # 從 Config 讀取 Google Sheets 設定
-        config = Config()
+        config = get_config()
         google_credentials_file = config.google_credentials_path
         google_spreadsheet_name = config.google_spreadsheet_name
 
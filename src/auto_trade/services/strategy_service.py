@@ -2,6 +2,7 @@
 
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 
 from auto_trade.models import (
@@ -10,11 +11,11 @@ from auto_trade.models import (
     EMAList,
     KBar,
     KBarList,
-    MACDData,
     MACDList,
     StrategyInput,
     TradingSignal,
 )
+from auto_trade.utils import indicator_kernel
 
 
 class StrategyService:
@@ -47,6 +48,27 @@ class StrategyService:
             period=period,
         )
 
+    @staticmethod
+    def calculate_macd_arrays(
+        closes: np.ndarray,
+        fast_period: int = 12,
+        slow_period: int = 26,
+        signal_period: int = 9,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """以收盤價陣列計算 MACD（單一迴圈的編譯核心）
+
+        EMA 計算結果與 calculate_ema 相同 (ewm(span=period))
+
+        Returns:
+            (macd_line, signal_line, histogram) 三個 float64 陣列
+        """
+        return indicator_kernel.macd(
+            np.ascontiguousarray(closes, dtype=np.float64),
+            int(fast_period),
+            int(slow_period),
+            int(signal_period),
+        )
+
     def calculate_macd(
         self,
         kbar_list: KBarList,
@@ -55,43 +77,19 @@ class StrategyService:
         signal_period: int = 9,
     ) -> MACDList:
         """計算MACD指標"""
-        # 計算快線和慢線EMA
-        ema_fast = self.calculate_ema(kbar_list, fast_period)
-        ema_slow = self.calculate_ema(kbar_list, slow_period)
-
-        # 計算MACD線
-        macd_line_values = []
-        for i in range(len(kbar_list)):
-            macd_value = ema_fast[i].ema_value - ema_slow[i].ema_value
-            macd_line_values.append(macd_value)
-
-        # 計算信號線 (MACD線的EMA)
-        macd_series = pd.Series(macd_line_values)
-        signal_line_values = macd_series.ewm(span=signal_period).mean()
-
-        # 計算柱狀圖
-        histogram_values = macd_series - signal_line_values
-
-        # 創建MACD MACDList
-        macd_data = []
-        for i, kbar in enumerate(kbar_list):
-            macd_data.append(
-                MACDData(
-                    time=kbar.time,
-                    macd_line=float(macd_line_values[i])
-                    if not pd.isna(macd_line_values[i])
-                    else 0.0,
-                    signal_line=float(signal_line_values.iloc[i])
-                    if not pd.isna(signal_line_values.iloc[i])
-                    else 0.0,
-                    histogram=float(histogram_values.iloc[i])
-                    if not pd.isna(histogram_values.iloc[i])
-                    else 0.0,
-                )
-            )
+        closes = np.fromiter(
+            (kbar.close for kbar in kbar_list), dtype=np.float64, count=len(kbar_list)
+        )
+        macd_line, signal_line, histogram = self.calculate_macd_arrays(
+            closes, fast_period, slow_period, signal_period
+        )
 
-        return MACDList(
-            macd_data=macd_data,
+        # 創建MACD MACDList（保留欄位陣列供向量化計算）
+        return MACDList.from_arrays(
+            [kbar.time for kbar in kbar_list],
+            macd_line,
+            signal_line,
+            histogram,
             symbol=kbar_list.symbol,
             timeframe=kbar_list.timeframe,
         )
@@ -187,6 +185,90 @@ class StrategyService:
 
         return abs(acceleration) >= min_acceleration
 
+    @staticmethod
+    def detect_golden_crosses(
+        macd_line: np.ndarray,
+        signal_line: np.ndarray,
+        min_strength: float | None = None,
+    ) -> np.ndarray:
+        """向量化版 check_golden_cross
+
+        第 i 個元素等同於對 macd[: i + 1] 呼叫 check_golden_cross
+        （以 [i-1] 與 [i-2] 判斷已確認的金叉）
+
+        Returns:
+            np.ndarray: bool 陣列，長度與輸入相同
+        """
+        crosses = np.zeros(len(macd_line), dtype=np.bool_)
+        if len(macd_line) < 3:
+            return crosses
+
+        current_macd, current_signal = macd_line[1:-1], signal_line[1:-1]
+        previous_macd, previous_signal = macd_line[:-2], signal_line[:-2]
+
+        is_golden_cross = (previous_macd <= previous_signal) & (
+            current_macd > current_signal
+        )
+        if min_strength is not None:
+            is_golden_cross &= np.abs(current_macd - current_signal) >= min_strength
+
+        crosses[2:] = is_golden_cross
+        return crosses
+
+    @staticmethod
+    def detect_cross_codes(
+        macd_line: np.ndarray, signal_line: np.ndarray
+    ) -> np.ndarray:
+        """單次走訪標記每根 K 棒已確認的金叉 / 死叉（編譯核心）
+
+        第 i 個元素等同於對 macd[: i + 1] 呼叫 check_golden_cross / check_death_cross
+
+        Returns:
+            np.ndarray: int8 陣列，1 = 金叉，-1 = 死叉，0 = 無交叉
+        """
+        return indicator_kernel.cross_codes(
+            np.ascontiguousarray(macd_line, dtype=np.float64),
+            np.ascontiguousarray(signal_line, dtype=np.float64),
+        )
+
+    @staticmethod
+    def calculate_death_cross_accelerations(
+        macd_line: np.ndarray, signal_line: np.ndarray
+    ) -> np.ndarray:
+        """計算每根 K 棒已確認死叉的加速度絕對值
+
+        第 i 個元素以 [i-1] 與 [i-2] 判斷，非死叉的位置為 NaN。
+        以 `>= 門檻` 比較即可得到任一門檻的死叉，掃描多個門檻時只需計算一次。
+
+        Returns:
+            np.ndarray: float64 陣列，長度與輸入相同
+        """
+        accelerations = np.full(len(macd_line), np.nan)
+        if len(macd_line) < 3:
+            return accelerations
+
+        current_diff = macd_line[1:-1] - signal_line[1:-1]
+        previous_diff = macd_line[:-2] - signal_line[:-2]
+
+        is_death_cross = (previous_diff >= 0) & (current_diff < 0)
+        accelerations[2:] = np.where(
+            is_death_cross, np.abs(current_diff - previous_diff), np.nan
+        )
+        return accelerations
+
+    @staticmethod
+    def death_crosses_from_accelerations(
+        accelerations: np.ndarray, min_acceleration: float | None = None
+    ) -> np.ndarray:
+        """由死叉加速度陣列篩選出符合門檻的死叉
+
+        Returns:
+            np.ndarray: bool 陣列，長度與輸入相同
+        """
+        if min_acceleration is None:
+            return ~np.isnan(accelerations)
+        return accelerations >= min_acceleration
+
     def check_hammer_kbar(self, kbar: KBar, direction: Action) -> bool:
         """檢查 K 棒型態是否為錘頭 (做多) 或 倒錘頭 (做空)
 
@@ -290,10 +372,10 @@ class StrategyService:
 
 if __name__ == "__main__":
     from auto_trade.core.client import create_api_client
-    from auto_trade.core.config import Config
+    from auto_trade.core.config import get_config
     from auto_trade.services.market_service import MarketService
 
-    config = Config()
+    config = get_config()
 
     # 建立API客戶端
     api_client = create_api_client(
@@ -1,14 +1,19 @@
 """Trading service for managing automated trading operations."""
 
 import time
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
+from itertools import islice
+
+import numpy as np
 
 from auto_trade.models import (
     Action,
     ExitReason,
     FuturePosition,
     FuturesTrade,
-    MACDList,
+    KBar,
+    OrderEvent,
     StrategyInput,
 )
 from auto_trade.models.position_record import BuybackState, PositionRecord
@@ -22,10 +27,14 @@ from auto_trade.utils import (
     calculate_and_wait_to_next_execution,
     calculate_points,
     get_timeframe_delta,
-    wait_seconds,
 )
 
 
+def _kbar_time(kbar: KBar) -> datetime:
+    """bisect 的排序鍵：K 棒時間"""
+    return kbar.time
+
+
 class TradingService:
     """交易服務類別"""
 
@@ -60,6 +69,8 @@ class TradingService:
         self.last_fast_stop_check_kbar_time: datetime | None = (
             None  # 最後檢查快速停損的 K 棒時間
         )
+        # 下一根 K 棒最早出現的時間（之前最新 K 棒不會改變，不必重新取得 K 線）
+        self.next_fast_stop_check_time: datetime | None = None
         self.is_buy_back: bool = False  # 是否為買回單
 
         # 交易參數 (預設值)
@@ -219,10 +230,16 @@ class TradingService:
                 f"歷史數據不足: 需要至少 30 根{self.timeframe}K棒，實際獲得 {len(kbars_30m.kbars) if kbars_30m else 0} 根"
             )
 
+        # K 棒依時間排序，以二分搜尋找出進場時間的位置，不複製整段 K 棒列表
+        kbars = kbars_30m.kbars
+        pre_entry_end = bisect_right(kbars, entry_time, key=_kbar_time)
+        post_entry_start = bisect_left(kbars, entry_time, key=_kbar_time)
+
         # 計算初始停損（進場前30根K棒最低點）
-        pre_entry_kbars = [kbar for kbar in kbars_30m.kbars if kbar.time <= entry_time]
-        if len(pre_entry_kbars) >= 30:
-            min_price = int(min(kbar.low for kbar in pre_entry_kbars[-30:]))
+        if pre_entry_end >= 30:
+            min_price = int(
+                min(kbar.low for kbar in kbars[pre_entry_end - 30 : pre_entry_end])
+            )
             stop_loss_points = calculate_points(
                 self.stop_loss_points, self.stop_loss_points_rate, entry_price
             )
@@ -232,18 +249,18 @@ class TradingService:
             )
         else:
             raise ValueError(
-                f"進場前K棒數據不足: 需要至少 30 根，實際獲得 {len(pre_entry_kbars)} 根"
+                f"進場前K棒數據不足: 需要至少 30 根，實際獲得 {pre_entry_end} 根"
             )
 
-        # 找到進場後的K棒
-        post_entry_kbars = [kbar for kbar in kbars_30m.kbars if kbar.time >= entry_time]
-
-        if not post_entry_kbars:
+        # 進場後的K棒為 kbars[post_entry_start:]
+        if post_entry_start == len(kbars):
             print(f"進場後無K棒數據，使用初始停損: {initial_stop_loss}")
             return initial_stop_loss, False
 
         # 計算進場後最高價格（只支持做多）
-        highest_price = int(max(kbar.high for kbar in post_entry_kbars))
+        highest_price = int(
+            max(kbar.high for kbar in islice(kbars, post_entry_start, None))
+        )
 
         start_trailing_stop_price = (
             self.start_trailing_stop_price
@@ -508,35 +525,27 @@ class TradingService:
                 return
 
             # 使用 strategy_service 計算 MACD
-            macd_list = self.strategy_service.calculate_macd(kbars_30m)
-
-            if len(macd_list.macd_data) < 2:
-                print("⚠️  MACD 數據不足")
-                return
+            closes = np.fromiter(
+                (kbar.close for kbar in kbars_30m.kbars),
+                dtype=np.float64,
+                count=len(kbars_30m.kbars),
+            )
+            macd_line, signal_line, _ = self.strategy_service.calculate_macd_arrays(
+                closes
+            )
 
-            # 遍歷 MACD 數據，找到最後一次死叉和金叉
-            # 使用 strategy_service 的方法來檢測，確保邏輯一致
+            # 一次標記所有 K 棒的死叉 / 金叉，找到最後一次死叉和金叉
+            # 使用 strategy_service 的方法來檢測，確保邏輯一致（死叉無過濾）
+            cross_codes = self.strategy_service.detect_cross_codes(
+                macd_line, signal_line
+            )
             last_death_cross_idx = None
             last_golden_cross_idx = None
-
-            # 需要至少 3 個數據點來檢測交叉（使用 [-2] 和 [-3]）
-            for i in range(2, len(macd_list.macd_data)):
-                # 創建一個臨時的 MACDList 包含到當前位置的數據
-                temp_macd_list = MACDList(
-                    macd_data=macd_list.macd_data[: i + 1],
-                    symbol=macd_list.symbol,
-                    timeframe=macd_list.timeframe,
-                )
-
-                # 使用 strategy_service 檢測死叉（無過濾 - 所有死叉都檢測）
-                if self.strategy_service.check_death_cross(
-                    temp_macd_list, min_acceleration=None
-                ):
+            for i in np.flatnonzero(cross_codes).tolist():
+                if cross_codes[i] < 0:
                     last_death_cross_idx = i
                     print(f"   發現死叉 @ K棒 {i}")
-
-                # 使用 strategy_service 檢測金叉
-                elif self.strategy_service.check_golden_cross(temp_macd_list):
+                else:
                     last_golden_cross_idx = i
                     print(f"   發現金叉 @ K棒 {i}")
 
@@ -548,7 +557,7 @@ class TradingService:
                     or last_golden_cross_idx < last_death_cross_idx
                 ):
                     self.is_in_macd_death_cross = True
-                    kbars_ago = len(macd_list.macd_data) - last_death_cross_idx
+                    kbars_ago = len(macd_line) - last_death_cross_idx
                     print(f"🔴 恢復死叉狀態！最後死叉在 {kbars_ago} 根 K 棒前")
                 else:
                     print("✅ 最後一次死叉後已有金叉，無需恢復死叉狀態")
@@ -581,6 +590,15 @@ class TradingService:
                 self.entry_price,
             )
 
+            # 下一根 K 棒出現前，最新 K 棒必定是上次已檢查過的那根，
+            # 不必每次持倉檢測都重新取得並重採樣 15 天的 K 線
+            if (
+                self.last_fast_stop_check_kbar_time is not None
+                and self.next_fast_stop_check_time is not None
+                and datetime.now() < self.next_fast_stop_check_time
+            ):
+                return False
+
             # 先獲取 K 線數據來檢查是否有新 K 棒
             kbars_30m = self.market_service.get_futures_kbars_with_timeframe(
                 self.symbol, self.sub_symbol, self.timeframe, days=15
@@ -592,6 +610,10 @@ class TradingService:
             # 獲取最新 K 棒的時間
             latest_kbar = kbars_30m.kbars[-1]
             latest_kbar_time = latest_kbar.time
+            # K 棒以開始時間標記，下一根最早在一個時間尺度之後出現
+            self.next_fast_stop_check_time = latest_kbar_time + get_timeframe_delta(
+                self.timeframe
+            )
 
             # 如果是同一根 K 棒，不重複檢查
             if self.last_fast_stop_check_kbar_time == latest_kbar_time:
@@ -886,59 +908,36 @@ class TradingService:
 
             print(f"下單成功: {action.value} {order_type}")
 
-            start_time = datetime.now()
+            # 等待成交 / 失敗回報（由下單回報 callback 通知，不輪詢委託狀態）
             timeout_minutes = 5
-
-            while datetime.now() - start_time < timedelta(minutes=timeout_minutes):
-                trades = self.order_service.check_order_status(
-                    result.order_id,
-                )
-                if trades:
-                    status = trades[0].status.status
-                    # 檢查是否成交
-                    if status in ["Filled", "PartFilled", "Status.Filled"]:
-                        current_trade = trades[0]
-                        print(f"成交確認: {action.value} {order_type}")
-                        time.sleep(2)  # 等待一下讓系統更新
-
-                        # 更新持倉狀態
-                        self.current_position = self._get_current_position(sub_symbol)
-                        print(f"持倉狀態已更新: {action.value}")
-
-                        if current_trade.status.deals:
-                            last_deal = current_trade.status.deals[-1]
-                            fill_price = int(last_deal.price)
-                            print(
-                                f"成交價格: {fill_price} (成交時間: {last_deal.time})"
-                            )
-
-                            return fill_price
-                        else:
-                            print("警告: 未找到成交價格資訊")
-                            return None
-
-                    # 檢查是否被拒絕/取消
-                    elif status in [
-                        "Cancelled",
-                        "Failed",
-                        "Status.Cancelled",
-                        "Status.Failed",
-                    ]:
-                        # 嘗試獲取詳細錯誤訊息
-                        msg = (
-                            getattr(current_trade.trade.status, "msg", "")
-                            if current_trade.trade
-                            else ""
-                        )
-                        error_msg = (
-                            f"訂單被拒絕: {msg}" if msg else f"訂單被拒絕: {status}"
-                        )
-                        print(f"❌ {error_msg}")
-                        if self.line_bot_service:
-                            self.line_bot_service.send_message(f"⚠️ {error_msg}")
-                        return None
-
-                time.sleep(1)
+            event = self.order_service.wait_for_order_event(
+                result.order_id, timeout=timeout_minutes * 60
+            )
+            if event is None or event.deal is None:
+                # 未收到回報（例如斷線期間），或收到的是取消 / 失敗回報時，
+                # 以委託狀態再確認一次，避免漏掉已成交的部分而誤判為被拒絕
+                confirmed = self._order_event_from_status(result.order_id)
+                if confirmed is not None:
+                    event = confirmed
+
+            if event is not None and event.deal is not None:
+                print(f"成交確認: {action.value} {order_type}")
+                time.sleep(2)  # 等待持倉查詢更新（成交價已由回報取得）
+
+                # 更新持倉狀態
+                self.current_position = self._get_current_position(sub_symbol)
+                print(f"持倉狀態已更新: {action.value}")
+
+                fill_price = int(event.deal.price)
+                print(f"成交價格: {fill_price} (成交時間: {event.deal.time})")
+                return fill_price
+
+            if event is not None:
+                error_msg = f"訂單被拒絕: {event.error}"
+                print(f"❌ {error_msg}")
+                if self.line_bot_service:
+                    self.line_bot_service.send_message(f"⚠️ {error_msg}")
+                return None
 
             print(f"等待成交超時: {action.value} {order_type}")
             return None
@@ -947,6 +946,30 @@ class TradingService:
             print(f"下單或等待成交失敗: {str(e)}")
             return None
 
+    def _order_event_from_status(self, order_id: str) -> OrderEvent | None:
+        """查詢委託狀態並轉為委託回報（未成交且未失敗時返回 None）"""
+        trades = self.order_service.check_order_status(order_id)
+        if not trades:
+            return None
+
+        current_trade = trades[0]
+        status = current_trade.status.status
+        if status in ["Filled", "PartFilled", "Status.Filled"]:
+            if not current_trade.status.deals:
+                print("警告: 未找到成交價格資訊")
+                return None
+            return OrderEvent(order_id=order_id, deal=current_trade.status.deals[-1])
+
+        if status in ["Cancelled", "Failed", "Status.Cancelled", "Status.Failed"]:
+            msg = (
+                getattr(current_trade.trade.status, "msg", "")
+                if current_trade.trade
+                else ""
+            )
+            return OrderEvent(order_id=order_id, error=msg or status)
+
+        return None
+
     def _check_pending_buyback_state(self):
         """檢查是否有未完成的買回任務 (程式重啟時使用)"""
         if not self.sub_symbol:
@@ -1218,8 +1241,9 @@ class TradingService:
                     elif current_time.minute % 5 != 0:
                         print_flag = False
 
-                    # 有持倉時，高頻檢測停損
-                    wait_seconds(self.position_check_interval)
+                    # 有持倉時，收到新 tick 即檢測停損（無 tick 時最長等待
+                    # position_check_interval 秒，照常執行 K 棒與移動停損檢查）
+                    self.market_service.wait_for_tick(self.position_check_interval)
 
                 else:
                     print(
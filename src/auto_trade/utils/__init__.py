@@ -1,5 +1,6 @@
 """工具模組"""
 
+from .file_utils import atomic_write
 from .points import calculate_points
 from .time_utils import (
     calculate_and_wait_to_next_execution,
@@ -8,6 +9,7 @@ from .time_utils import (
 )
 
 __all__ = [
+    "atomic_write",
     "calculate_points",
     "calculate_and_wait_to_next_execution",
     "get_timeframe_delta",
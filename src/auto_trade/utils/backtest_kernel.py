@@ -0,0 +1,200 @@
+"""回測核心模擬迴圈
+
+以 NumPy 陣列逐根 K 棒模擬持倉與出場，安裝 numba 時會編譯為機器碼。
+進場信號與 MACD 交叉狀態需事先向量化計算好再傳入。
+
+OHLC 以 float32 傳入以減少記憶體頻寬（期貨價格為整數點，float32 可精確表示），
+價格運算一律先轉為 float64 再進行，避免精度誤差。
+"""
+
+import numpy as np
+
+from auto_trade.utils.jit import njit
+
+# 出場原因代碼（對應 models.backtest.EXIT_REASON_ORDER）
+EXIT_FAST_STOP = 0
+EXIT_TAKE_PROFIT = 1
+EXIT_TRAILING_STOP = 2
+EXIT_STOP_LOSS = 3
+
+# 計算停損時回看的 K 棒數量（與實際交易一致）
+STOP_LOSS_LOOKBACK = 30
+
+# simulate_trades 的型別簽名：指定後於 import 時即編譯並寫入快取，
+# 各程序不必在第一次呼叫時重新 JIT
+SIMULATE_TRADES_SIGNATURE = (
+    "Tuple((int64[:], int64[:], float64[:], float64[:], int8[:]))("
+    "float32[:], float32[:], float32[:], float32[:], "
+    "boolean[:], boolean[:], boolean[:], "
+    "float64, float64, float64, float64, float64, float64, "
+    "boolean, boolean, boolean)"
+)
+
+
+@njit(SIMULATE_TRADES_SIGNATURE, cache=True, fastmath=True)
+def simulate_trades(
+    opens,
+    highs,
+    lows,
+    closes,
+    entry_signals,
+    death_crosses,
+    golden_crosses,
+    stop_loss_points,
+    take_profit_points,
+    take_profit_rate,
+    start_trailing_stop_points,
+    trailing_stop_points,
+    trailing_stop_rate,
+    enable_trailing_stop,
+    enable_take_profit,
+    enable_macd_fast_stop,
+):
+    """逐根 K 棒模擬做多交易
+
+    Args:
+        opens/highs/lows/closes: OHLC 陣列 (float32)
+        entry_signals: 每根 K 棒是否以開盤價進場 (bool)
+        death_crosses: 每根 K 棒是否確認 MACD 死叉 (bool)
+        golden_crosses: 每根 K 棒是否確認 MACD 金叉 (bool)
+        take_profit_rate / trailing_stop_rate: 百分比參數，小於 0 表示未設定
+
+    Returns:
+        (entry_idx, exit_idx, entry_prices, exit_prices, reason_codes)
+    """
+    n = opens.shape[0]
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    entry_prices = np.empty(n, dtype=np.float64)
+    exit_prices = np.empty(n, dtype=np.float64)
+    reason_codes = np.empty(n, dtype=np.int8)
+    count = 0
+
+    in_position = False
+    entry_bar = 0
+    entry_price = 0.0
+    stop_loss_price = 0.0
+    take_profit_price = 0.0
+    trailing_points = 0.0
+    trailing_stop_price = 0.0
+    trailing_active = False
+    in_death_cross = False
+
+    for i in range(n):
+        if in_position:
+            reason = -1
+            exit_price = 0.0
+
+            # 出場檢查順序：快速停損 → 獲利了結 → 移動停損 → 一般停損
+            if (
+                enable_macd_fast_stop
+                and not trailing_active
+                and in_death_cross
+                and entry_price - opens[i] > stop_loss_points
+            ):
+                reason = EXIT_FAST_STOP
+                exit_price = float(opens[i])
+            elif enable_take_profit and highs[i] >= take_profit_price:
+                reason = EXIT_TAKE_PROFIT
+                exit_price = take_profit_price
+            elif (
+                enable_trailing_stop
+                and trailing_active
+                and lows[i] <= trailing_stop_price
+            ):
+                reason = EXIT_TRAILING_STOP
+                exit_price = trailing_stop_price
+            elif lows[i] <= stop_loss_price:
+                reason = EXIT_STOP_LOSS
+                exit_price = stop_loss_price
+            elif (
+                enable_trailing_stop
+                and not trailing_active
+                and highs[i] - entry_price >= start_trailing_stop_points
+            ):
+                # 啟動移動停損
+                trailing_active = True
+                trailing_stop_price = float(highs[i]) - trailing_points
+
+            if reason >= 0:
+                entry_idx[count] = entry_bar
+                exit_idx[count] = i
+                entry_prices[count] = entry_price
+                exit_prices[count] = exit_price
+                reason_codes[count] = reason
+                count += 1
+                in_position = False
+                in_death_cross = False
+            else:
+                # 持續追蹤 MACD 死叉狀態
+                if enable_macd_fast_stop and not trailing_active:
+                    if not in_death_cross and death_crosses[i]:
+                        in_death_cross = True
+                    elif in_death_cross and golden_crosses[i]:
+                        in_death_cross = False
+
+                # 更新移動停損（只上移）
+                if enable_trailing_stop and trailing_active:
+                    new_trailing_stop = float(highs[i]) - trailing_points
+                    if new_trailing_stop > trailing_stop_price:
+                        trailing_stop_price = new_trailing_stop
+
+        # 檢查開倉信號（平倉當根也可重新進場）
+        if not in_position and entry_signals[i]:
+            entry_bar = i
+            entry_price = float(opens[i])
+
+            # 停損：前 30 根 K 棒最低點減停損點數，不足 30 根時以收盤價計算
+            if i + 1 < STOP_LOSS_LOOKBACK:
+                stop_loss_price = float(closes[i]) - stop_loss_points
+            else:
+                stop_loss_price = (
+                    float(lows[i + 1 - STOP_LOSS_LOOKBACK : i + 1].min())
+                    - stop_loss_points
+                )
+
+            if take_profit_rate >= 0.0:
+                take_profit_price = entry_price + int(entry_price * take_profit_rate)
+            else:
+                take_profit_price = entry_price + int(take_profit_points)
+
+            if trailing_stop_rate >= 0.0:
+                trailing_points = float(int(entry_price * trailing_stop_rate))
+            else:
+                trailing_points = float(int(trailing_stop_points))
+
+            trailing_stop_price = 0.0
+            trailing_active = False
+            in_position = True
+
+    return (
+        entry_idx[:count],
+        exit_idx[:count],
+        entry_prices[:count],
+        exit_prices[:count],
+        reason_codes[:count],
+    )
+
+
+@njit("float64(float64[:])", cache=True)
+def equity_sharpe_ratio(equity):
+    """單次走訪權益曲線計算夏普比率（逐根報酬的平均 / 樣本標準差）
+
+    以 Welford 演算法累積平均與變異數，不需建立報酬陣列。
+    前一根權益不大於 0 的報酬略過；有效報酬不足兩筆或標準差為 0 時返回 0.0。
+    """
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for i in range(1, equity.shape[0]):
+        prev_equity = equity[i - 1]
+        if prev_equity > 0.0:
+            ret = (equity[i] - prev_equity) / prev_equity
+            count += 1
+            delta = ret - mean
+            mean += delta / count
+            m2 += delta * (ret - mean)
+
+    if count < 2 or m2 <= 0.0:
+        return 0.0
+    return mean / np.sqrt(m2 / (count - 1))
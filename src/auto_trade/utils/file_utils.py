@@ -0,0 +1,24 @@
+"""檔案相關工具函數"""
+
+import uuid
+from collections.abc import Callable
+from pathlib import Path
+
+
+def atomic_write(path: Path, writer: Callable[[Path], object]) -> None:
+    """先寫入同目錄的暫存檔再替換目標檔，避免多程序同時寫入同一檔案
+
+    寫入或替換失敗時刪除暫存檔並重新拋出例外。
+
+    Args:
+        path: 目標檔案路徑
+        writer: 接收暫存檔路徑並寫入內容的函數
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}{path.suffix}")
+    try:
+        writer(tmp_path)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,84 @@
+"""技術指標計算核心
+
+以單一迴圈計算 EMA / MACD，安裝 numba 時會編譯為機器碼。
+EMA 計算與 pandas ewm(span=period, adjust=True) 的遞迴式逐步一致，結果相同。
+指定型別簽名，import 時即編譯（或讀取快取），子程序不必各自重新 JIT。
+"""
+
+import numpy as np
+
+from auto_trade.utils.jit import njit
+
+
+@njit("float64[:](float64[:], int64)", cache=True)
+def ema_adjusted(values, span):
+    """計算 EMA（等同 pandas Series.ewm(span=span).mean()）
+
+    Args:
+        values: 價格陣列 (float64，不含 NaN)
+        span: EMA 週期
+
+    Returns:
+        與 values 等長的 EMA 陣列
+    """
+    n = values.shape[0]
+    result = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return result
+
+    # 與 pandas 相同：alpha = 1 / (1 + com)，com = (span - 1) / 2
+    com = (span - 1) / 2.0
+    old_wt_factor = 1.0 - 1.0 / (1.0 + com)
+
+    weighted = values[0]
+    old_wt = 1.0
+    result[0] = weighted
+    for i in range(1, n):
+        cur = values[i]
+        old_wt *= old_wt_factor
+        # 數值相同時不重算，避免常數序列累積誤差
+        if weighted != cur:
+            weighted = (old_wt * weighted + cur) / (old_wt + 1.0)
+        old_wt += 1.0
+        result[i] = weighted
+
+    return result
+
+
+@njit(
+    "Tuple((float64[:], float64[:], float64[:]))(float64[:], int64, int64, int64)",
+    cache=True,
+)
+def macd(closes, fast_period, slow_period, signal_period):
+    """計算 MACD
+
+    Returns:
+        (macd_line, signal_line, histogram)
+    """
+    macd_line = ema_adjusted(closes, fast_period) - ema_adjusted(closes, slow_period)
+    signal_line = ema_adjusted(macd_line, signal_period)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+@njit("int8[:](float64[:], float64[:])", cache=True)
+def cross_codes(macd_line, signal_line):
+    """單次走訪計算每根 K 棒已確認的 MACD 交叉
+
+    第 i 個元素以 [i-1]（已確認）與 [i-2]（前一根）判斷，
+    與 check_golden_cross / check_death_cross 對 macd[: i + 1] 的結果一致。
+
+    Returns:
+        int8 陣列：1 = 金叉，-1 = 死叉，0 = 無交叉
+    """
+    n = macd_line.shape[0]
+    codes = np.zeros(n, dtype=np.int8)
+    for i in range(2, n):
+        prev_macd = macd_line[i - 2]
+        prev_signal = signal_line[i - 2]
+        cur_macd = macd_line[i - 1]
+        cur_signal = signal_line[i - 1]
+        if prev_macd >= prev_signal and cur_macd < cur_signal:
+            codes[i] = -1
+        elif prev_macd <= prev_signal and cur_macd > cur_signal:
+            codes[i] = 1
+    return codes
@@ -0,0 +1,53 @@
+"""Numba JIT 相容層
+
+以 numba.njit 編譯數值迴圈（numba 已列於專案依賴）；
+在未安裝 numba 的環境中退回純 Python 執行（結果相同，只是較慢）。
+"""
+
+import os
+from pathlib import Path
+
+# 編譯快取放在固定目錄，多程序回測與套件安裝在唯讀路徑時都能共用同一份快取
+# （需在 import numba 之前設定；已設定環境變數時不覆蓋）
+NUMBA_CACHE_DIR = Path.home() / ".cache" / "auto_trade" / "numba"
+os.environ.setdefault("NUMBA_CACHE_DIR", str(NUMBA_CACHE_DIR))
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 未安裝時的替代裝飾器，直接返回原函數"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+
+        return decorator
+
+
+def warmup() -> None:
+    """預先編譯所有數值核心並寫入快取
+
+    核心皆指定型別簽名，import 即完成編譯；之後各回測腳本與子程序直接讀取快取。
+    可於部署或 CI 時執行：python -m auto_trade.utils.jit
+    """
+    import time
+
+    start = time.perf_counter()
+    from auto_trade.utils import backtest_kernel, indicator_kernel  # noqa: F401
+
+    elapsed = time.perf_counter() - start
+    if NUMBA_AVAILABLE:
+        cache_dir = os.environ["NUMBA_CACHE_DIR"]
+        print(f"⚙️ 數值核心已編譯（{elapsed:.2f}s），快取目錄: {cache_dir}")
+    else:
+        print("⚠️ 未安裝 numba，數值核心以純 Python 執行")
+
+
+if __name__ == "__main__":
+    warmup()